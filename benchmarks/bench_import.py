@@ -0,0 +1,102 @@
+"""
+Import-time benchmark
+=====================
+Measures the cold start of pipeline.py in fresh interpreters: the wall
+time of `import pipeline`, `pipeline.py --help` and `pipeline.py serve
+--help`, next to the time the heavy dependencies would take if they were
+imported eagerly. It
+also checks that importing the module loads none of those dependencies
+and opens no network connections (NLTK data and spaCy models are only
+looked up on first use).
+
+Usage:
+    python benchmarks/bench_import.py --repeats 5
+"""
+
+import argparse
+import importlib.util
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Deferred by pipeline.py until a step needs them
+HEAVY_MODULES = ["pandas", "scipy.sparse", "sklearn", "requests", "bs4", "lxml", "pyarrow", "nltk", "spacy", "textblob"]
+
+# Runs in the child interpreter: fail on any socket connection, import, report loaded heavy modules
+IMPORT_CHECK = """
+import socket, sys
+def refuse(*args, **kwargs):
+    raise RuntimeError("network access during import")
+socket.socket.connect = refuse
+socket.create_connection = refuse
+import pipeline
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def time_command(command, repeats):
+    """Median wall time of a command run repeats times in a fresh process"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def top_imports(n):
+    """The n slowest imports (cumulative) under `python -X importtime -c 'import pipeline'`"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pipeline"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per measurement (median)")
+    arg_parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    args = arg_parser.parse_args()
+
+    check = subprocess.run([sys.executable, "-c", IMPORT_CHECK.format(heavy=HEAVY_MODULES)], cwd=ROOT,
+                           capture_output=True, text=True)
+    if check.returncode:
+        raise SystemExit(f"import pipeline failed:\n{check.stderr}")
+    loaded = [name for name in check.stdout.strip().split(",") if name]
+    if loaded:
+        raise SystemExit(f"import pipeline loaded heavy modules eagerly: {', '.join(loaded)}")
+
+    # Modules not installed here cannot be imported eagerly either; time the rest
+    candidates = [name for name in HEAVY_MODULES if name not in ("textblob", "spacy")]
+    eager = [name for name in candidates if importlib.util.find_spec(name.partition(".")[0]) is not None]
+    skipped = [name for name in candidates if name not in eager]
+    results = [
+        ("python -c pass", time_command([sys.executable, "-c", "pass"], args.repeats)),
+        ("import pipeline", time_command([sys.executable, "-c", "import pipeline"], args.repeats)),
+        ("pipeline.py --help", time_command([sys.executable, "pipeline.py", "--help"], args.repeats)),
+        ("pipeline.py serve --help", time_command([sys.executable, "pipeline.py", "serve", "--help"], args.repeats)),
+    ]
+    if eager:
+        results.append(("eager heavy imports",
+                        time_command([sys.executable, "-c", "import " + ", ".join(eager)], args.repeats)))
+    print(f"No heavy modules or network access at import (median of {args.repeats} fresh interpreters)")
+    for name, seconds in results:
+        print(f"  {name:<28} {seconds * 1000:8.0f} ms")
+    if skipped:
+        print(f"Not installed, left out of the eager imports: {', '.join(skipped)}")
+    print("Slowest imports under `import pipeline` (cumulative):")
+    for microseconds, name in top_imports(args.top):
+        print(f"  {name:<28} {microseconds / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Pipeline benchmark suite
+========================
+Runs every SupremeCourtTopicModeler step on a synthetic FindLaw-like corpus
+at several sizes and records each step's wall time, CPU time, peak RSS and
+documents/sec (the RunProfiler metrics used in run reports).
+
+Steps 1 and 2 crawl a local fixture server, so the whole suite runs offline.
+Crawling is skipped for sizes above --crawl-max-docs; the step 2 output is
+then written straight from the generator and steps 3-5 run as usual.
+
+With --streaming, steps 2 and 3 run as one overlapped pass (stream_cases)
+when both are selected and the corpus is crawled.
+
+With --dedupe, near-duplicate merging (dedupe_cases) runs before step 3
+and is timed as its own stage.
+
+Results are saved as JSON in --results-dir (one file per run, named by time
+and git commit) and compared with the previous run in that directory.
+
+Usage:
+    python benchmarks/bench_pipeline.py                        # 1k, 10k and 100k documents
+    python benchmarks/bench_pipeline.py --sizes 1000 --steps 3,4,5
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline  # noqa: E402
+from fixture_server import start_fixture_server  # noqa: E402
+from synthetic_corpus import SyntheticCorpus  # noqa: E402
+
+STEPS = {
+    1: ("step1_get_case_urls", lambda modeler, args: modeler.step1_get_case_urls()),
+    2: ("step2_extract_case_text", lambda modeler, args: modeler.step2_extract_case_text()),
+    3: ("step3_preprocess_text", lambda modeler, args: modeler.step3_preprocess_text()),
+    4: ("step4_topic_modeling", lambda modeler, args: modeler.step4_topic_modeling(
+        n_topics=args.n_topics, out_of_core=args.out_of_core)),
+    5: ("step5_prepare_visualization_data", lambda modeler, args: modeler.step5_prepare_visualization_data()),
+    23: ("stream_cases", lambda modeler, args: modeler.stream_cases()),
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_size(n_docs: int, args, data_dir: Path) -> list:
+    """Run the selected steps on an n_docs corpus in data_dir and return the stage records"""
+    corpus = SyntheticCorpus(n_docs, words_per_doc=args.words, n_years=args.years, seed=args.seed)
+    server, _ = start_fixture_server(corpus)
+    try:
+        modeler = pipeline.SupremeCourtTopicModeler(
+            data_dir=str(data_dir), start_year=corpus.start_year, end_year=corpus.end_year,
+            root_url=server.root_url, max_workers=args.max_workers, requests_per_second=0,
+            n_jobs=args.n_jobs, tokenizer=args.tokenizer, storage=args.storage, dedupe=args.dedupe)
+
+        steps = sorted(args.steps)
+        crawl = n_docs <= args.crawl_max_docs and steps[0] <= 2
+        if not crawl:
+            # Seed step 2 output directly from the generator
+            steps = [step for step in steps if step > 2]
+            host = server.root_url.split("/court/")[0]
+            modeler.store.write_frames("full_proj_preproc", corpus.iter_frames(host=host))
+        elif steps[0] == 2:
+            modeler.step1_get_case_urls()
+        if crawl and args.streaming and {2, 3} <= set(steps):
+            steps = [23 if step == 2 else step for step in steps if step != 3]
+
+        modeler.profiler = pipeline.RunProfiler(modeler.run_counters, cprofile=args.profile,
+                                                profile_dir=Path(args.results_dir) / "profiles" / str(n_docs))
+        for step in steps:
+            if step == 3 and args.dedupe:
+                modeler.dedupe_cases()
+            STEPS[step][1](modeler, args)
+        return [{"size": n_docs, "crawled": crawl, **stage} for stage in modeler.profiler.stages]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def previous_results(results_dir: Path, current: Path):
+    runs = sorted(path for path in results_dir.glob("*.json") if path != current)
+    if not runs:
+        return None, None
+    with open(runs[-1]) as f:
+        return runs[-1], json.load(f)
+
+
+def print_table(results: list, previous: dict = None):
+    baseline = {}
+    if previous:
+        baseline = {(row["size"], row["stage"]): row for row in previous["results"]}
+    print(f"{'size':>8}  {'stage':<34} {'wall s':>9} {'cpu s':>9} {'docs/s':>10} {'RSS MB':>8}  vs prev")
+    for row in results:
+        before = baseline.get((row["size"], row["stage"]))
+        change = f"{row['wall_seconds'] / before['wall_seconds']:.2f}x" if before and before["wall_seconds"] else ""
+        cpu = row["cpu_seconds"] + row["children_cpu_seconds"]
+        print(f"{row['size']:>8}  {row['stage']:<34} {row['wall_seconds']:>9.2f} {cpu:>9.2f} "
+              f"{row.get('documents_per_second', 0):>10.0f} {row['peak_rss_bytes'] / 1024 ** 2:>8.0f}  {change}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated corpus sizes")
+    arg_parser.add_argument("--steps", default="1,2,3,4,5", help="comma-separated steps to run")
+    arg_parser.add_argument("--words", type=int, default=800, help="approximate words per opinion")
+    arg_parser.add_argument("--years", type=int, default=20, help="number of years the corpus spans")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--crawl-max-docs", type=int, default=10000,
+                            help="largest size for which steps 1-2 crawl the fixture server")
+    arg_parser.add_argument("--n-topics", type=int, default=20)
+    arg_parser.add_argument("--out-of-core", action="store_true", help="run step 4 out of core")
+    arg_parser.add_argument("--dedupe", action="store_true", help="merge near-duplicate cases before step 3")
+    arg_parser.add_argument("--streaming", action="store_true", help="overlap steps 2 and 3 (stream_cases)")
+    arg_parser.add_argument("--storage", default="auto", choices=["auto", "pickle", "parquet"])
+    arg_parser.add_argument("--tokenizer", default="regex", choices=sorted(pipeline.TOKENIZERS) + ["auto"])
+    arg_parser.add_argument("--n-jobs", type=int, default=1)
+    arg_parser.add_argument("--max-workers", type=int, default=8, help="fetch threads for steps 1-2")
+    arg_parser.add_argument("--profile", action="store_true", help="also save cProfile output per step")
+    arg_parser.add_argument("--results-dir", default=str(Path(__file__).resolve().parent / "results"))
+    arg_parser.add_argument("--keep-data", action="store_true", help="keep the per-size data directories")
+    args = arg_parser.parse_args()
+    args.steps = {int(step) for step in args.steps.split(",")}
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results_dir = Path(args.results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    started = datetime.now(timezone.utc)
+    commit = git_commit()
+
+    results = []
+    work_dir = Path(tempfile.mkdtemp(prefix="scotus-bench-"))
+    for n_docs in sizes:
+        print(f"Benchmarking {n_docs} documents...", file=sys.stderr)
+        results.extend(bench_size(n_docs, args, work_dir / str(n_docs)))
+    if not args.keep_data:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output_file = results_dir / f"{started.strftime('%Y%m%dT%H%M%SZ')}_{commit}.json"
+    run = {
+        "started_at": started.isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {key: sorted(value) if isinstance(value, set) else value for key, value in vars(args).items()},
+        "results": results,
+    }
+    with open(output_file, "w") as f:
+        json.dump(run, f, indent=2)
+
+    previous_file, previous = previous_results(results_dir, output_file)
+    print_table(results, previous)
+    print(f"\nSaved to {output_file}" + (f" (compared with {previous_file.name})" if previous_file else ""))
+
+
+if __name__ == "__main__":
+    main()
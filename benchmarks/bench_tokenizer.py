@@ -0,0 +1,87 @@
+"""
+Tokenizer micro-benchmark
+=========================
+Compares the throughput (characters per second) of the original multi-pass
+re.sub cleaner with the fused cleaner used by RegexTokenizer, and checks
+that both produce the same tokens.
+
+Usage:
+    python benchmarks/bench_tokenizer.py --docs 200 --words 20000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline  # noqa: E402
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS  # noqa: E402
+
+SAMPLE_WORDS = (
+    "The Court's judgment is affirmed. We don't agree; I'm persuaded the statute "
+    "doesn't reach petitioner's conduct, and we'll remand. See 42 U.S.C. § 1983 "
+    "(1970); Brown v. Board of Education, 347 U.S. 483, 495 (1954). Mr.\xa0\xa0\xa0\xa0Justice "
+    "HOLMES delivered the opinion.\r\nFourth Amendment search seizure warrant "
+    "commerce clause interstate taxation due process équité"
+).split(" ")
+
+
+def legacy_tokenize(text, stoplist):
+    """The original tokenize_text regex path, kept as the baseline"""
+    if not text or not isinstance(text, str):
+        return []
+    separators = ["\xa0\xa0\xa0\xa0", "\r", "\n", "\t", "n't", "'m", "'ll", '[^a-z ]']
+    clean_text = text.lower()
+    for sep in separators:
+        clean_text = re.sub(sep, " ", clean_text)
+    tokens = clean_text.split()
+    return [tok for tok in tokens if len(tok) > 1 and tok not in stoplist]
+
+
+def make_corpus(n_docs, n_words, seed=0):
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(SAMPLE_WORDS) for _ in range(n_words)) for _ in range(n_docs)]
+
+
+def time_tokenizer(tokenize, corpus, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in corpus:
+            tokenize(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--docs", type=int, default=200, help="number of synthetic documents")
+    arg_parser.add_argument("--words", type=int, default=20000, help="words per document")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="timing repeats (best is reported)")
+    args = arg_parser.parse_args()
+
+    corpus = make_corpus(args.docs, args.words)
+    total_chars = sum(len(text) for text in corpus)
+    stoplist = frozenset(ENGLISH_STOP_WORDS)
+    regex_tokenizer = pipeline.RegexTokenizer(stoplist)
+
+    mismatches = sum(legacy_tokenize(text, stoplist) != regex_tokenizer(text) for text in corpus)
+    if mismatches:
+        raise SystemExit(f"{mismatches} documents tokenized differently by the fused tokenizer")
+
+    results = [
+        ("legacy re.sub loop", time_tokenizer(lambda text: legacy_tokenize(text, stoplist), corpus, args.repeats)),
+        ("RegexTokenizer", time_tokenizer(regex_tokenizer, corpus, args.repeats)),
+    ]
+    baseline = results[0][1]
+    print(f"{args.docs} documents, {total_chars / 1e6:.1f}M characters, outputs identical")
+    for name, seconds in results:
+        print(f"  {name:<20} {total_chars / seconds / 1e6:8.1f} Mchars/s  ({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Local FindLaw fixture server
+============================
+Serves a SyntheticCorpus over HTTP on localhost so steps 1 and 2 can be
+benchmarked offline. Year index pages live at
+/court/us-supreme-court/years/<year> and case pages at
+/us-supreme-court/<year>/<docket>.html. Pages are rendered on request and
+carry an ETag, so conditional requests get 304 Not Modified like the real site.
+
+Usage:
+    python benchmarks/fixture_server.py --docs 1000 --port 8080
+"""
+
+import argparse
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from synthetic_corpus import SyntheticCorpus
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        corpus = self.server.corpus
+        if self.path in self.server.failing_paths:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            kind, key = corpus.lookup(self.path)
+        except (KeyError, ValueError):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        host = f"http://{self.headers.get('Host', '127.0.0.1')}"
+        page = corpus.year_page(key, host=host) if kind == "year" else corpus.case_page(key)
+        body = page.encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2018 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, corpus: SyntheticCorpus, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), FixtureRequestHandler)
+        self.corpus = corpus
+        # Paths answered with 500 Internal Server Error, to simulate an unavailable site
+        self.failing_paths = set()
+
+    @property
+    def root_url(self) -> str:
+        """Value for SupremeCourtTopicModeler(root_url=...)"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/court/us-supreme-court/years/"
+
+
+def start_fixture_server(corpus: SyntheticCorpus, host: str = "127.0.0.1",
+                         port: int = 0) -> Tuple[FixtureServer, threading.Thread]:
+    """Serve corpus from a background thread; call server.shutdown() when done"""
+    server = FixtureServer(corpus, host=host, port=port)
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--docs", type=int, default=1000, help="number of opinions")
+    arg_parser.add_argument("--words", type=int, default=800, help="approximate words per opinion")
+    arg_parser.add_argument("--years", type=int, default=20, help="number of years the cases span")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    args = arg_parser.parse_args()
+
+    corpus = SyntheticCorpus(args.docs, words_per_doc=args.words, n_years=args.years, seed=args.seed)
+    server = FixtureServer(corpus, host=args.host, port=args.port)
+    print(f"Serving {corpus.n_docs} cases ({corpus.start_year}-{corpus.end_year}) at {server.root_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Synthetic FindLaw-like opinion corpus
+=====================================
+Deterministic generator of Supreme Court style opinions for benchmarks.
+Each case is a mixture of one to three legal topics over a shared legal
+vocabulary, with citations, contractions and the usual opinion boilerplate,
+and can be rendered as plain text, as a FindLaw case page, or listed on a
+FindLaw year index page. Nothing is downloaded; the same seed always gives
+the same corpus.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --docs 1000 --words 800 --out corpus.parquet
+"""
+
+import argparse
+import random
+import sys
+from html import escape
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pandas as pd
+
+TOPIC_VOCABULARY = [
+    "search seizure warrant probable cause officer vehicle suppress evidence exclusionary fourth amendment",
+    "commerce interstate regulation congress clause burden state goods carrier tariff",
+    "tax income revenue assessment deduction taxpayer levy exemption property valuation",
+    "union employer labor bargaining employee strike wage board collective arbitration",
+    "speech press publication expression religion establishment assembly obscene first amendment",
+    "jury trial counsel defendant confession testimony witness cross examination sixth amendment",
+    "habeas petition prisoner custody sentence conviction collateral state court federal review",
+    "antitrust monopoly competition price market merger sherman restraint conspiracy trade",
+    "election vote district apportionment ballot candidate voter redistricting equal protection",
+    "tribe indian reservation treaty sovereignty land allotment trust federal tribal",
+    "bankruptcy debtor creditor estate discharge trustee lien petition chapter claim",
+    "patent invention claim infringement copyright trademark license inventor prior art",
+    "water river pollution environmental discharge permit agency wetland navigable emission",
+    "death penalty capital aggravating mitigating execution eighth amendment cruel punishment",
+    "railroad rate carrier shipper freight commission transportation line tariff rail",
+    "contract breach damages performance obligation party agreement consideration remedy",
+    "discrimination race segregation school equal protection civil rights desegregation title",
+    "jurisdiction removal diversity citizenship venue federal question standing remand appeal",
+    "securities investor fraud disclosure exchange broker stock registration insider",
+    "immigration alien deportation citizenship naturalization asylum removal visa border",
+]
+
+GENERAL_VOCABULARY = (
+    "court state law statute opinion judgment decision petitioner respondent appellant appellee "
+    "question case district appeals circuit held holding reversed affirmed remanded argument "
+    "constitution constitutional provision section act congress government authority power right "
+    "rule reason view record proceeding order claim issue fact finding interpretation precedent "
+    "majority dissent justice concurring doctrine principle standard test application analysis"
+).split()
+
+CONNECTIVES = (
+    "the of and to in that a is for be by as not this it with on which was we have but are or "
+    "its at from such any under has were would may if an no there their these must"
+).split()
+
+JUSTICES = ["MARSHALL", "STORY", "TANEY", "HOLMES", "BRANDEIS", "HUGHES", "STONE", "BLACK",
+            "DOUGLAS", "WARREN", "BRENNAN", "WHITE", "REHNQUIST", "STEVENS", "O'CONNOR",
+            "SCALIA", "KENNEDY", "SOUTER", "THOMAS", "GINSBURG", "BREYER"]
+
+PARTIES = ["UNITED STATES", "SMITH", "JONES", "OHIO", "TEXAS", "CALIFORNIA", "NEW YORK", "BROWN",
+           "MILLER", "JOHNSON", "WILLIAMS", "BOARD OF EDUCATION", "NATIONAL LABOR RELATIONS BOARD",
+           "COMMISSIONER", "DAVIS", "WILSON", "RAILROAD CO.", "CITY OF CHICAGO", "FLORIDA", "GARCIA"]
+
+
+class SyntheticCorpus:
+    """
+    A corpus of n_docs synthetic opinions spread evenly over n_years years
+
+    Cases are addressed by index; everything about case i (year, docket,
+    title, topics, text) is derived from (seed, i), so pages can be served
+    lazily without holding the corpus in memory.
+    """
+
+    def __init__(self, n_docs: int, words_per_doc: int = 800, n_years: int = 20,
+                 start_year: int = 1990, seed: int = 0):
+        self.n_docs = n_docs
+        self.words_per_doc = words_per_doc
+        self.n_years = n_years
+        self.start_year = start_year
+        self.seed = seed
+        self.topics = [words.split() for words in TOPIC_VOCABULARY]
+
+    @property
+    def end_year(self) -> int:
+        return self.start_year + self.n_years - 1
+
+    def _rng(self, index: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + index)
+
+    def year_of(self, index: int) -> int:
+        return self.start_year + index * self.n_years // self.n_docs
+
+    def cases_in_year(self, year: int) -> range:
+        first = -(-(year - self.start_year) * self.n_docs // self.n_years)
+        last = -(-(year - self.start_year + 1) * self.n_docs // self.n_years)
+        return range(max(first, 0), min(last, self.n_docs))
+
+    def docket(self, index: int) -> str:
+        return f"{self.year_of(index) % 100:02d}-{index + 1}"
+
+    def case_path(self, index: int) -> str:
+        return f"/us-supreme-court/{self.year_of(index)}/{self.docket(index)}.html"
+
+    def title(self, index: int) -> str:
+        rng = self._rng(index)
+        petitioner, respondent = rng.sample(PARTIES, 2)
+        return f"{petitioner} v. {respondent}"
+
+    def _sentence(self, rng: random.Random, topic_words: List[str]) -> str:
+        words = []
+        for _ in range(rng.randint(12, 30)):
+            draw = rng.random()
+            if draw < 0.35:
+                words.append(rng.choice(CONNECTIVES))
+            elif draw < 0.6:
+                words.append(rng.choice(GENERAL_VOCABULARY))
+            else:
+                # Zipf-like preference for each topic's leading terms
+                words.append(topic_words[min(int(rng.paretovariate(1.2)) - 1, len(topic_words) - 1)])
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words)), rng.choice(["don't", "isn't", "we'll", "I'm", "court's"]))
+        if rng.random() < 0.2:
+            words.append(f"See {rng.randint(1, 580)} U.S. {rng.randint(1, 999)}, {rng.randint(1, 999)} "
+                         f"({rng.randint(1800, 2018)})")
+        sentence = " ".join(words)
+        return sentence[0].upper() + sentence[1:] + "."
+
+    def paragraphs(self, index: int) -> List[str]:
+        """The opinion text of case index as a list of paragraphs"""
+        rng = self._rng(index)
+        n_topics = rng.choice([1, 1, 2, 3])
+        topic_words = [word for topic in rng.sample(self.topics, n_topics) for word in topic]
+        justice = rng.choice(JUSTICES)
+        paragraphs = [f"MR. JUSTICE {justice} delivered the opinion of the Court."]
+        words = 0
+        while words < self.words_per_doc:
+            paragraph = " ".join(self._sentence(rng, topic_words) for _ in range(rng.randint(3, 8)))
+            paragraphs.append(paragraph)
+            words += paragraph.count(" ") + 1
+        paragraphs.append("It is so ordered.")
+        return paragraphs
+
+    def case_text(self, index: int) -> str:
+        return " ".join(self.paragraphs(index))
+
+    def case_page(self, index: int) -> str:
+        """A FindLaw-style case page: navigation, title, opinion div, footer"""
+        body = "\n".join(f"<p>{escape(paragraph)}</p>" for paragraph in self.paragraphs(index))
+        title = escape(self.title(index))
+        return (
+            "<!DOCTYPE html><html><head>"
+            f"<title>{title} | FindLaw</title></head><body>"
+            '<header><nav class="site-nav"><a href="https://www.findlaw.com/">FindLaw</a> '
+            '<a href="/court/us-supreme-court/">Supreme Court</a> <a href="/login">Log in</a></nav></header>'
+            f'<div class="caselaw-header"><h1>{title}</h1>'
+            f"<p>No. {self.docket(index)} | Decided {self.year_of(index)}</p></div>"
+            f'<div class="caselawcontent searchable-content">{body}</div>'
+            '<footer><p>Copyright Thomson Reuters. All rights reserved. Terms of Service. '
+            "Privacy Notice. Cookie settings. Do not sell my personal information.</p></footer>"
+            "</body></html>"
+        )
+
+    def year_page(self, year: int, host: str = "") -> str:
+        """A FindLaw-style year index page linking every case decided that year"""
+        items = "".join(
+            f'<tr><td><a href="{host}{self.case_path(i)}">{escape(self.title(i))}</a></td>'
+            f"<td>{self.docket(i)}</td></tr>"
+            for i in self.cases_in_year(year)
+        )
+        nav = "".join(f'<a href="{host}/court/us-supreme-court/years/{y}">{y}</a> '
+                      for y in range(self.start_year, self.end_year + 1))
+        return (
+            f"<!DOCTYPE html><html><head><title>US Supreme Court Cases {year}</title></head><body>"
+            f'<nav class="site-nav"><a href="https://www.findlaw.com/">FindLaw</a></nav>'
+            f'<div class="years">{nav}</div><table class="cases">{items}</table>'
+            "<footer><a href=\"https://www.findlaw.com/company/\">About</a></footer></body></html>"
+        )
+
+    def iter_frames(self, batch_size: int = 1000, host: str = "http://localhost") -> Iterator[pd.DataFrame]:
+        """Step 2 output (case_url, docket, case_text) in batches, for seeding steps 3-5 directly"""
+        for start in range(0, self.n_docs, batch_size):
+            indices = range(start, min(start + batch_size, self.n_docs))
+            yield pd.DataFrame({
+                "case_url": [host + self.case_path(i) for i in indices],
+                "docket": [self.docket(i) for i in indices],
+                "case_text": [self.case_text(i) for i in indices],
+            })
+
+    def lookup(self, path: str) -> Tuple[str, int]:
+        """Map a request path to ('year', year) or ('case', index); raises KeyError if unknown"""
+        parts = path.strip("/").split("/")
+        if len(parts) == 4 and parts[:3] == ["court", "us-supreme-court", "years"] and parts[3].isdigit():
+            year = int(parts[3])
+            if self.start_year <= year <= self.end_year:
+                return "year", year
+        if len(parts) == 3 and parts[0] == "us-supreme-court" and parts[2].endswith(".html"):
+            index = int(parts[2][:-len(".html")].split("-")[-1]) - 1
+            if 0 <= index < self.n_docs and self.case_path(index) == path:
+                return "case", index
+        raise KeyError(path)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--docs", type=int, default=1000, help="number of opinions")
+    arg_parser.add_argument("--words", type=int, default=800, help="approximate words per opinion")
+    arg_parser.add_argument("--years", type=int, default=20, help="number of years the cases span")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--out", required=True, help="output .parquet, .pickle or .csv file")
+    args = arg_parser.parse_args()
+
+    corpus = SyntheticCorpus(args.docs, words_per_doc=args.words, n_years=args.years, seed=args.seed)
+    df = pd.concat(corpus.iter_frames(), ignore_index=True)
+    out = Path(args.out)
+    if out.suffix == ".parquet":
+        df.to_parquet(out, index=False)
+    elif out.suffix == ".pickle":
+        df.to_pickle(out)
+    else:
+        df.to_csv(out, index=False)
+    print(f"Wrote {len(df)} opinions ({df['case_text'].str.len().sum() / 1e6:.1f}M characters) to {out}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,58 +7,1906 @@ to extract legal topics using NMF topic modeling.
 Based on the original notebook series by [Your Name]
 """
 
+from __future__ import annotations
+
 import os
-import pandas as pd
+import sys
+import argparse
+import queue
+import signal
+import importlib
+import importlib.util
 import numpy as np
 import re
 import glob
+import gzip
 import json
-import requests
-from bs4 import BeautifulSoup
 import pickle
+import sqlite3
 import time
+import zlib
+import hashlib
 from pathlib import Path
 import logging
-from typing import Dict, List, Tuple, Optional
-import operator
+import threading
+import functools
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from itertools import chain, compress
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Tuple, Optional
+from collections import Counter, deque
 
-# NLP and ML imports
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import NMF
-from textblob import TextBlob
 
-# Handle different sklearn versions for stop words
-try:
-    from sklearn.feature_extraction.stop_words import ENGLISH_STOP_WORDS
-except ImportError:
-    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+class _LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+    
+    pandas, scikit-learn, scipy, requests, bs4, lxml and pyarrow take seconds to
+    import together; deferring them keeps `import pipeline`, --help and
+    worker start-up fast until a step actually needs them.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def _module_available(name: str) -> bool:
+    """Whether a top-level module is installed, without importing it"""
+    return importlib.util.find_spec(name) is not None
 
-# Try to import NLTK components (install if needed)
-try:
-    import nltk
-    from nltk.corpus import stopwords, names
-    # Download required NLTK data
-    nltk.download('stopwords', quiet=True)
-    nltk.download('names', quiet=True)
-except ImportError:
-    print("NLTK not installed. Install with: pip install nltk")
-    stopwords = None
-    names = None
 
-# Try to import spaCy (install if needed) 
+pd = _LazyModule("pandas")
+requests = _LazyModule("requests")
+bs4 = _LazyModule("bs4")
+etree = _LazyModule("lxml.etree")
+lxml_html = _LazyModule("lxml.html")
+sparse = _LazyModule("scipy.sparse")
+
+# NLP and ML imports (MiniBatchNMF, scikit-learn >= 1.1, is only needed for out-of-core topic modeling)
+sklearn_text = _LazyModule("sklearn.feature_extraction.text")
+sklearn_decomposition = _LazyModule("sklearn.decomposition")
+
+# pyarrow for columnar storage (optional)
+if _module_available("pyarrow"):
+    pa = _LazyModule("pyarrow")
+    pq = _LazyModule("pyarrow.parquet")
+else:
+    pa = None
+    pq = None
+
+if TYPE_CHECKING:
+    import pandas as pd  # noqa: F811
+    from bs4 import BeautifulSoup
+    from scipy import sparse  # noqa: F811
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+# resource (POSIX only) provides peak RSS and child-process CPU time for run reports
 try:
-    import spacy
-    from spacy.en import English
-    parser = English()
+    import resource
 except ImportError:
-    print("spaCy not installed. Install with: pip install spacy")
-    parser = None
+    resource = None
+
+SPACY_MODEL = "en_core_web_sm"
+
+
+def load_nltk_words(corpus: str, fileid: Optional[str] = None, data_dir: Optional[str] = None,
+                    download: bool = True) -> List[str]:
+    """
+    Words of an NLTK corpus such as stopwords/english, loaded on first use
+    
+    The corpus is looked up locally first: in data_dir if given, then on
+    NLTK's own search path (NLTK_DATA, ~/nltk_data, ...). Only if it is
+    missing there and download is True is it fetched (into data_dir when
+    given). Returns an empty list when NLTK or the corpus is unavailable.
+    """
+    try:
+        import nltk
+    except ImportError:
+        logger.warning("NLTK not installed. Install with: pip install nltk")
+        return []
+    if data_dir and str(data_dir) not in nltk.data.path:
+        nltk.data.path.insert(0, str(data_dir))
+    try:
+        nltk.data.find(f"corpora/{corpus}")
+    except LookupError:
+        if not download or not nltk.download(corpus, download_dir=data_dir, quiet=True, raise_on_error=False):
+            logger.warning(f"NLTK corpus {corpus!r} not found locally"
+                           f"{' and could not be downloaded' if download else ''}; continuing without it")
+            return []
+    return getattr(nltk.corpus, corpus).words(fileid)
+
+
+@functools.lru_cache(maxsize=None)
+def load_spacy_pipeline(model: str = SPACY_MODEL):
+    """
+    Load a spaCy pipeline for lemmatization with the parser and NER disabled
+    
+    Falls back to a blank English pipeline with lookup lemmas (needs
+    spacy-lookups-data) when the trained model is not installed. spaCy is
+    imported on the first call and each pipeline is loaded only once.
+    """
+    try:
+        import spacy
+    except ImportError:
+        logger.warning("spaCy not installed. Install with: pip install spacy")
+        return None
+    try:
+        return spacy.load(model, disable=["parser", "ner"])
+    except OSError:
+        logger.warning(f"spaCy model {model} not found. Install with: python -m spacy download {model}")
+    try:
+        nlp = spacy.blank("en")
+        nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+        nlp.initialize()
+        return nlp
+    except (ValueError, ImportError):
+        logger.warning("spaCy lookup lemmas unavailable. Install with: pip install spacy-lookups-data")
+        return None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# Byte table mapping everything except a-z to a space, used after ASCII-encoding lowercased text
+_LETTERS_ONLY = bytes(c if 97 <= c <= 122 else 32 for c in range(256))
+
+
+def _clean_text(text: str) -> str:
+    """
+    Lowercase text and replace separators and non-letters with spaces
+    
+    Equivalent to running re.sub over the separators "\xa0\xa0\xa0\xa0", "\r",
+    "\n", "\t", "n't", "'m", "'ll" and "[^a-z ]" in turn, but done with
+    str.replace and one bytes.translate pass instead of eight regex passes.
+    """
+    clean_text = text.lower().replace("\xa0\xa0\xa0\xa0", " ")
+    clean_text = clean_text.replace("n't", " ").replace("'m", " ").replace("'ll", " ")
+    # Non-ASCII characters become '?' and are then blanked along with other non-letters
+    return clean_text.encode("ascii", "replace").translate(_LETTERS_ONLY).decode("ascii")
+
+
+# Characters stripped from the last path segment of a case URL to leave its docket number
+_NON_DOCKET = re.compile(r"[^0-9-]")
+
+
+def extract_case_links(page: bytes) -> Dict[str, str]:
+    """
+    Return {case_url: docket} for the case links on a FindLaw year index page
+    
+    Only anchor hrefs matter here, so they are read with a single lxml XPath
+    query instead of building a BeautifulSoup tree of the whole page. Links
+    are returned in page order; year navigation links are skipped.
+    """
+    try:
+        hrefs = lxml_html.fromstring(page).xpath("//a/@href")
+    except (etree.ParserError, ValueError):
+        return {}
+    
+    cases = {}
+    for href in hrefs:
+        if "/us-supreme-court/" not in href or "/years/" in href or href in cases:
+            continue
+        docket = _NON_DOCKET.sub("", href.rstrip('/').split('/')[-1].replace('.html', ''))
+        if docket:
+            cases[href] = docket
+    return cases
+
+
+def _class_test(name: str) -> str:
+    """XPath test equivalent to the CSS class selector .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Opinion containers on case pages, most specific first, as CSS selectors
+# (SoupExtractor) and the equivalent XPath (LxmlExtractor)
+CONTENT_SELECTORS = [
+    ("div.caselawcontent.searchable-content",
+     f"//div[{_class_test('caselawcontent')} and {_class_test('searchable-content')}]"),
+    ("div.caselawcontent", f"//div[{_class_test('caselawcontent')}]"),
+    ("div.searchable-content", f"//div[{_class_test('searchable-content')}]"),
+    ("div[class*='content']", "//div[contains(@class, 'content')]"),
+    ("div[class*='case']", "//div[contains(@class, 'case')]"),
+    ("div[class*='opinion']", "//div[contains(@class, 'opinion')]"),
+    ("div[class*='text']", "//div[contains(@class, 'text')]"),
+]
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_HIDDEN_TEXT_TAGS = frozenset(["script", "style", "template"])
+
+
+def _text_nodes(element) -> Iterator[str]:
+    """Text nodes under an lxml element in document order, as BeautifulSoup's get_text() sees them"""
+    hidden = []
+    for event, node in etree.iterwalk(element, events=("start", "end")):
+        if event == "start":
+            # Comments, processing instructions and script/style bodies are not text
+            hide = bool(hidden and hidden[-1]) or not isinstance(node.tag, str) or node.tag in _HIDDEN_TEXT_TAGS
+            hidden.append(hide)
+            if not hide and node.text:
+                yield node.text
+        else:
+            hidden.pop()
+            if node is not element and node.tail and not (hidden and hidden[-1]):
+                yield node.tail
+
+
+class SoupExtractor:
+    """
+    Opinion text extractor over a full BeautifulSoup tree (the reference backend)
+    
+    The text of the first CONTENT_SELECTORS selector that matches is used,
+    falling back to all substantial <p> paragraphs and then to the whole
+    page. Extractors are callables mapping a page's HTML and URL to text;
+    selector_hits counts which rule produced each page's text. version is
+    recorded with every extracted page and must be bumped whenever a change
+    alters the text extracted, so step 2 re-extracts pages from older runs.
+    """
+    
+    version = 1
+    
+    def __init__(self):
+        self.selector_hits = Counter()
+        self._lock = threading.Lock()
+    
+    def _hit(self, rule: str):
+        with self._lock:
+            self.selector_hits[rule] += 1
+    
+    def __call__(self, page: str, url: str = "") -> str:
+        return self.extract_soup(bs4.BeautifulSoup(page, "lxml"), url)
+    
+    def extract_soup(self, soup: BeautifulSoup, url: str = "") -> str:
+        all_text = []
+        rule = "none"
+        
+        for selector, _ in CONTENT_SELECTORS:
+            content_divs = soup.select(selector)
+            if content_divs:
+                rule = selector
+                for div in content_divs:
+                    text = div.get_text(separator=' ', strip=True)
+                    if text and len(text) > 100:  # Only include substantial text
+                        all_text.append(text)
+                break  # Use first successful selector
+        
+        # Fallback: get all paragraph text if specific selectors fail
+        if not all_text:
+            rule = "paragraphs"
+            for p in soup.find_all('p'):
+                text = p.get_text(strip=True)
+                if len(text) > 50:  # Only substantial paragraphs
+                    all_text.append(text)
+        
+        # Final fallback: get all text but try to clean it
+        if not all_text:
+            rule = "page"
+            body_text = soup.get_text(separator=' ', strip=True)
+            if len(body_text) > 200:
+                all_text.append(body_text)
+        
+        self._hit(rule if all_text else "none")
+        result = ' '.join(all_text)
+        logger.debug(f"Extracted {len(result)} characters from {url}")
+        return result
+
+
+class LxmlExtractor(SoupExtractor):
+    """
+    Opinion text extractor evaluating XPath directly on an lxml tree
+    
+    Gives the same text as SoupExtractor without building a BeautifulSoup
+    tree. The selector that matched is remembered per site layout (host and
+    first path segment) and tried first on the next page of that layout;
+    one boolean XPath over the more specific selectors keeps the result
+    identical to trying them in order.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._layouts: Dict[str, int] = {}
+        self._xpaths = [etree.XPath(xpath) for _, xpath in CONTENT_SELECTORS]
+        self._earlier = [None] + [etree.XPath(f"boolean({' | '.join(xpath for _, xpath in CONTENT_SELECTORS[:i])})")
+                                  for i in range(1, len(CONTENT_SELECTORS))]
+    
+    @staticmethod
+    def _layout(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.netloc}/{parsed.path.lstrip('/').split('/', 1)[0]}"
+    
+    def _content_divs(self, root, layout: str) -> Tuple[Optional[int], list]:
+        remembered = self._layouts.get(layout)
+        if remembered is not None:
+            divs = self._xpaths[remembered](root)
+            if divs and not (remembered and self._earlier[remembered](root)):
+                return remembered, divs
+        for index, xpath in enumerate(self._xpaths):
+            divs = xpath(root)
+            if divs:
+                self._layouts[layout] = index
+                return index, divs
+        return None, []
+    
+    def __call__(self, page: str, url: str = "") -> str:
+        try:
+            root = lxml_html.document_fromstring(page)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be parsed as bytes
+            try:
+                root = lxml_html.document_fromstring(page.encode("utf-8"))
+            except etree.ParserError:
+                root = None
+        except etree.ParserError:
+            root = None
+        if root is None:
+            self._hit("none")
+            return ""
+        
+        all_text = []
+        index, divs = self._content_divs(root, self._layout(url))
+        rule = CONTENT_SELECTORS[index][0] if index is not None else "none"
+        for div in divs:
+            text = ' '.join(filter(None, (string.strip() for string in _text_nodes(div))))
+            if text and len(text) > 100:
+                all_text.append(text)
+        
+        if not all_text:
+            rule = "paragraphs"
+            for p in root.iter('p'):
+                text = ''.join(string.strip() for string in _text_nodes(p))
+                if len(text) > 50:
+                    all_text.append(text)
+        
+        if not all_text:
+            rule = "page"
+            body_text = ' '.join(filter(None, (string.strip() for string in _text_nodes(root))))
+            if len(body_text) > 200:
+                all_text.append(body_text)
+        
+        self._hit(rule if all_text else "none")
+        result = ' '.join(all_text)
+        logger.debug(f"Extracted {len(result)} characters from {url}")
+        return result
+
+
+# Opinion text extractors selectable by name
+EXTRACTORS = {
+    "soup": SoupExtractor,
+    "lxml": LxmlExtractor,
+}
+
+
+def _filter_tokens(tokens, stoplist, min_length: int = 2) -> List[str]:
+    """Apply stoplist and length filtering"""
+    return [tok for tok in tokens if len(tok) >= min_length and tok not in stoplist]
+
+
+class RegexTokenizer:
+    """
+    Tokenizer that cleans text and splits on whitespace, without lemmatization
+    
+    Tokenizers are callables mapping a text to its filtered token list; they
+    must be picklable so they can be shipped to worker processes.
+    """
+    
+    def __init__(self, stoplist, min_length: int = 2):
+        self.stoplist = stoplist
+        self.min_length = min_length
+    
+    def __call__(self, text: str) -> List[str]:
+        if not text or not isinstance(text, str):
+            return []
+        stoplist, min_length = self.stoplist, self.min_length
+        return [tok for tok in _clean_text(text).split() if len(tok) >= min_length and tok not in stoplist]
+
+
+class SpacyTokenizer(RegexTokenizer):
+    """
+    Lemmatizing tokenizer backed by the shared spaCy pipeline (see load_spacy_pipeline)
+    
+    Single texts and batches both go through SpacyLemmatizer, so long
+    opinions are split the same way and give the same tokens either way.
+    """
+    
+    def __call__(self, text: str) -> List[str]:
+        if not text or not isinstance(text, str):
+            return []
+        lemmas = SpacyLemmatizer(load_spacy_pipeline()).lemmatize([_clean_text(text)])[0]
+        return _filter_tokens(lemmas, self.stoplist, self.min_length)
+    
+    def tokenize_batch(self, texts: List[str], n_jobs: int = 1, batch_size: int = 32,
+                       executor: Optional[ProcessPoolExecutor] = None) -> List[List[str]]:
+        """
+        Lemmatize many documents in batches with nlp.pipe
+        
+        executor is a running pool holding this tokenizer (see
+        SupremeCourtTopicModeler._tokenizer_pool): batches are lemmatized in
+        its workers, so one pool serves every call. Without it, n_jobs > 1
+        uses spaCy's own multiprocessing, which starts new processes per call.
+        """
+        if executor is not None:
+            chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+            lemmatize = functools.partial(_tokenize_batch_chunk, batch_size=batch_size)
+            return list(chain.from_iterable(executor.map(lemmatize, chunks)))
+        valid = [bool(text) and isinstance(text, str) for text in texts]
+        cleaned = [_clean_text(text) for text, ok in zip(texts, valid) if ok]
+        lemmatizer = SpacyLemmatizer(load_spacy_pipeline(), batch_size=batch_size, n_process=n_jobs)
+        lemmas = iter(lemmatizer.lemmatize(cleaned))
+        return [_filter_tokens(next(lemmas), self.stoplist, self.min_length) if ok else [] for ok in valid]
+
+
+# Tokenizers selectable by name; "auto" picks spaCy when a pipeline is available
+TOKENIZERS = {
+    "regex": RegexTokenizer,
+    "spacy": SpacyTokenizer,
+}
+
+
+def legal_stoplist(nlp_data_dir: Optional[str] = None, download: bool = True) -> set:
+    """Comprehensive stopwords list for legal text (NLTK stopwords are looked up as in load_nltk_words)"""
+    # Basic stopwords
+    basic_stopwords = set(sklearn_text.ENGLISH_STOP_WORDS)
+    basic_stopwords.update(load_nltk_words('stopwords', 'english', data_dir=nlp_data_dir, download=download))
+    
+    # Legal/court specific stopwords (reduced list - keep more legal terms)
+    legal_stopwords = [
+        'join', 'seek', 'note', 'pd', 'misc', 'assistant', 'whereon', 'dismiss', 'sod', 
+        'vote', 'present', 'entire', 'ante', 'leave', 'concur', 'entire', 'mootness', 
+        'jj', 'amici', 'sup', 'rep', 'stat', 'like', 'rev', 'trans', 'vii', 'erisa', 
+        'usca', 'lead', 'cf', 'cca', 'fsupp', 'afdc', 'amicus', 'ante', 'pd', 'aver', 
+        'may', 'argued', 'argue', 'decide', 'rptr', 'pp', 'fd', 'june', 'july', 
+        'august', 'september', 'october', 'november', 'ca', 'certiorari', 
+        'december', 'january', 'february', 'march', 'april', 'writ', 'footnote', 
+        'member', 'curiam', 'usc', 'file'
+    ]
+    
+    # Only include most common names to avoid being too aggressive
+    common_male_names = ['john', 'james', 'robert', 'michael', 'william', 'david', 'richard', 'thomas']
+    common_female_names = ['mary', 'patricia', 'jennifer', 'linda', 'elizabeth', 'barbara', 'susan', 'jessica']
+    all_names = common_male_names + common_female_names
+    
+    # Reduced state names list (only abbreviations to avoid removing content)
+    state_abbrevs = [
+        'al', 'ak', 'az', 'ar', 'ca', 'co', 'ct', 'de', 'fl', 'ga', 'hi', 'id', 'il', 'in', 
+        'ia', 'ks', 'ky', 'la', 'me', 'md', 'ma', 'mi', 'mn', 'ms', 'mo', 'mt', 'ne', 'nv', 
+        'nh', 'nj', 'nm', 'ny', 'nc', 'nd', 'oh', 'ok', 'or', 'pa', 'ri', 'sc', 'sd', 'tn', 
+        'tx', 'ut', 'vt', 'va', 'wa', 'wv', 'wi', 'wy'
+    ]
+    
+    return basic_stopwords.union(set(legal_stopwords + all_names + state_abbrevs))
+
+
+def make_tokenizer(tokenizer, stoplist, min_length: int = 2):
+    """Resolve a tokenizer setting (a name from TOKENIZERS, "auto" or a callable) to a callable"""
+    if callable(tokenizer):
+        return tokenizer
+    if tokenizer == "auto":
+        tokenizer = "spacy" if load_spacy_pipeline() else "regex"
+    if tokenizer not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer {tokenizer!r}. Choose from {sorted(TOKENIZERS)} or pass a callable.")
+    if tokenizer == "spacy" and not load_spacy_pipeline():
+        raise ValueError("spaCy tokenizer requested but no spaCy pipeline is available.")
+    logger.info(f"Using {tokenizer} tokenizer")
+    return TOKENIZERS[tokenizer](stoplist, min_length=min_length)
+
+
+class SpacyLemmatizer:
+    """
+    Batched lemmatization with nlp.pipe
+    
+    Texts longer than max_length characters are split at whitespace into
+    pieces that are lemmatized separately and stitched back together, so very
+    long opinions never hit spaCy's max_length limit.
+    """
+    
+    def __init__(self, nlp, batch_size: int = 32, n_process: int = 1, max_length: int = 100000):
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.max_length = min(max_length, nlp.max_length)
+    
+    def _split(self, text: str) -> List[str]:
+        """Split text into pieces of at most max_length characters at whitespace"""
+        pieces = []
+        start = 0
+        while len(text) - start > self.max_length:
+            end = text.rfind(" ", start, start + self.max_length)
+            if end <= start:
+                end = start + self.max_length
+            pieces.append(text[start:end])
+            start = end
+        pieces.append(text[start:])
+        return pieces
+    
+    def lemmatize(self, texts: List[str]) -> List[List[str]]:
+        """Return the lemmas of each text, in input order"""
+        def pieces():
+            for i, text in enumerate(texts):
+                for piece in self._split(text):
+                    yield piece, i
+        
+        lemmas = [[] for _ in texts]
+        docs = self.nlp.pipe(pieces(), as_tuples=True, batch_size=self.batch_size, n_process=self.n_process)
+        for doc, i in docs:
+            lemmas[i].extend(tok.lemma_.strip() for tok in doc if tok.lemma_.strip())
+        return lemmas
+
+
+# Per-process state for parallel tokenization, set once by the pool initializer
+_worker_tokenizer = None
+
+
+def _init_tokenize_worker(tokenizer):
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _tokenize_chunk(texts: List[str]) -> List[List[str]]:
+    return [_worker_tokenizer(text) for text in texts]
+
+
+def _tokenize_batch_chunk(texts: List[str], batch_size: int) -> List[List[str]]:
+    return _worker_tokenizer.tokenize_batch(texts, batch_size=batch_size)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to rate limit requests to a single host
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchLedger:
+    """
+    Persistent SQLite ledger of crawl progress
+    
+    Records which year index pages have been scanned (and the case URLs found
+    on them) and, per case_url, the fetch status, HTTP metadata and extracted
+    text, so an interrupted crawl can pick up exactly where it stopped.
+    
+    A fetch status is 'ok', 'error' (transient, retried by the next run) or
+    'permanent_error' (an HTTP 4xx other than 429, only retried on request).
+    Successful fetches record the extractor (name and version) that produced
+    their text.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS year_pages (
+            year INTEGER PRIMARY KEY,
+            year_url TEXT,
+            status TEXT,
+            case_count INTEGER,
+            fetched_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS case_urls (
+            case_url TEXT PRIMARY KEY,
+            docket TEXT,
+            year INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS fetches (
+            case_url TEXT PRIMARY KEY,
+            status TEXT,
+            http_status INTEGER,
+            content_length INTEGER,
+            etag TEXT,
+            last_modified TEXT,
+            attempts INTEGER DEFAULT 0,
+            fetched_at REAL,
+            case_text TEXT,
+            extractor TEXT
+        );
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(fetches)")}
+        if 'extractor' not in columns:
+            # Ledgers from before extractors were recorded
+            self.conn.execute("ALTER TABLE fetches ADD COLUMN extractor TEXT")
+        self.conn.commit()
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+    
+    def completed_years(self) -> Dict[int, int]:
+        """Return {year: case_count} for year pages that were scanned successfully"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT year, case_count FROM year_pages WHERE status = 'ok'").fetchall()
+        return dict(rows)
+    
+    def record_year(self, year: int, year_url: str, status: str, cases: Dict[str, str]):
+        """Store the outcome of scanning one year page together with the cases found on it"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO case_urls (case_url, docket, year) VALUES (?, ?, ?)",
+                [(url, docket, year) for url, docket in cases.items()])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO year_pages (year, year_url, status, case_count, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (year, year_url, status, len(cases), time.time()))
+    
+    def cases_for_year(self, year: int) -> Dict[str, str]:
+        """Return {case_url: docket} recorded for a year, in discovery order"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT case_url, docket FROM case_urls WHERE year = ? ORDER BY rowid", (year,)).fetchall()
+        return dict(rows)
+    
+    def fetched_urls(self) -> set:
+        """Return the set of case URLs whose text was fetched successfully"""
+        return self.urls_with_status('ok')
+    
+    def urls_with_status(self, *statuses: str) -> set:
+        """Return the set of case URLs whose last fetch ended with one of statuses"""
+        placeholders = ','.join('?' * len(statuses))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT case_url FROM fetches WHERE status IN ({placeholders})", statuses).fetchall()
+        return {row[0] for row in rows}
+    
+    def stale_extractions(self, extractor: str) -> set:
+        """Return the set of fetched case URLs whose text came from another (or an unrecorded) extractor"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT case_url FROM fetches WHERE status = 'ok' AND extractor IS NOT ?", (extractor,)).fetchall()
+        return {row[0] for row in rows}
+    
+    def record_fetches(self, results: List[Tuple[str, str, Dict]]):
+        """
+        Store (case_url, case_text, metadata) tuples from step 2
+        
+        A failed fetch does not replace a successful one, so text awaiting
+        re-extraction is kept until a new fetch succeeds.
+        """
+        now = time.time()
+        rows = [
+            (url, meta.get('status', 'ok'), meta.get('http_status'), meta.get('content_length'),
+             meta.get('etag'), meta.get('last_modified'), now, text, meta.get('extractor'))
+            for url, text, meta in results
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO fetches (case_url, status, http_status, content_length, etag, last_modified, "
+                "fetched_at, case_text, extractor, attempts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT (case_url) DO UPDATE SET status = excluded.status, "
+                "http_status = excluded.http_status, content_length = excluded.content_length, "
+                "etag = excluded.etag, last_modified = excluded.last_modified, fetched_at = excluded.fetched_at, "
+                "case_text = excluded.case_text, extractor = excluded.extractor, attempts = attempts + 1 "
+                "WHERE fetches.status != 'ok' OR excluded.status = 'ok'",
+                rows)
+    
+    def case_texts(self, urls: List[str]) -> Dict[str, str]:
+        """Return {case_url: case_text} for the given URLs that have been fetched"""
+        texts = {}
+        with self.lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT case_url, case_text FROM fetches WHERE status = 'ok' "
+                    f"AND case_url IN ({placeholders})", chunk).fetchall()
+                texts.update(rows)
+        return texts
+    
+    def status_counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM fetches GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response served from the HTTP cache
+    """
+    
+    from_cache = True
+    
+    def __init__(self, url: str, content: bytes, headers: Dict[str, str], encoding: Optional[str]):
+        self.url = url
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.encoding = encoding or "utf-8"
+        self.status_code = 200
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache with conditional revalidation
+    
+    Bodies are stored zlib-compressed, one file per URL, with an SQLite index
+    holding validators (ETag / Last-Modified) and access times. Entries younger
+    than `ttl` seconds are served without touching the network; older ones are
+    revalidated with If-None-Match / If-Modified-Since. When the compressed
+    bodies exceed `max_bytes`, least recently used entries are evicted.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            content_type TEXT,
+            encoding TEXT,
+            size INTEGER,
+            stored_at REAL,
+            accessed_at REAL
+        );
+    """
+    
+    def __init__(self, cache_dir: Path, ttl: float = 7 * 24 * 3600, max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.cache_dir / "index.sqlite"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+        
+        # Counters for reporting
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.z"
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the index entry for a URL, or None if it is not cached"""
+        key = self._key(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, content_type, encoding, stored_at FROM entries WHERE key = ?",
+                (key,)).fetchone()
+        if row is None or not self._body_path(key).exists():
+            return None
+        etag, last_modified, content_type, encoding, stored_at = row
+        return {'key': key, 'url': url, 'etag': etag, 'last_modified': last_modified,
+                'content_type': content_type, 'encoding': encoding, 'stored_at': stored_at}
+    
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+    
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def load(self, entry: Dict, revalidated: bool = False) -> Optional[CachedResponse]:
+        """
+        Read a cached body and mark the entry as used (and fresh again if revalidated)
+        
+        Returns None, and drops the entry, if the body was evicted by another
+        thread since lookup() or cannot be read; the caller then refetches.
+        """
+        try:
+            content = zlib.decompress(self._body_path(entry['key']).read_bytes())
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable HTTP cache entry for {entry['url']}: {e}")
+            self.discard(entry['key'])
+            return None
+        now = time.time()
+        with self.lock, self.conn:
+            if revalidated:
+                self.conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                                  (now, now, entry['key']))
+                self.revalidated += 1
+            else:
+                self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, entry['key']))
+                self.hits += 1
+        headers = {'Content-Type': entry['content_type'] or ''}
+        if entry['etag']:
+            headers['ETag'] = entry['etag']
+        if entry['last_modified']:
+            headers['Last-Modified'] = entry['last_modified']
+        return CachedResponse(entry['url'], content, headers, entry['encoding'])
+    
+    def store(self, url: str, response: requests.Response):
+        """Compress and store a successful response body"""
+        key = self._key(url)
+        body = zlib.compress(response.content, 6)
+        path = self._body_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        
+        now = time.time()
+        with self.lock, self.conn:
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, etag, last_modified, content_type, encoding, "
+                "size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 response.headers.get('Content-Type'), response.encoding or response.apparent_encoding,
+                 len(body), now, now))
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self.misses += 1
+        
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+    
+    def discard(self, key: str):
+        """Remove one entry and its body"""
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.total_bytes -= row[0]
+            self._body_path(key).unlink(missing_ok=True)
+    
+    def evict(self):
+        """Drop least recently used entries until the cache is under 90% of max_bytes"""
+        target = int(self.max_bytes * 0.9)
+        with self.lock, self.conn:
+            rows = self.conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+            evicted = []
+            for key, size in rows:
+                if self.total_bytes <= target:
+                    break
+                self._body_path(key).unlink(missing_ok=True)
+                self.total_bytes -= size
+                evicted.append((key,))
+            self.conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} entries from HTTP cache ({self.total_bytes} bytes remain)")
+
+
+class CorpusStore:
+    """
+    Storage backend for stage outputs
+    
+    With format="parquet" (requires pyarrow) each stage is a Parquet file
+    written in bounded row groups, so stages can stream record batches and
+    read only the columns they need. With format="pickle" stages are the
+    original monolithic DataFrame pickles. Reads fall back to the other
+    format, so outputs from earlier runs stay usable.
+    """
+    
+    FORMATS = ("pickle", "parquet")
+    
+    def __init__(self, data_dir: Path, format: str = "pickle", row_group_size: int = 1000):
+        if format == "auto":
+            format = "parquet" if pq is not None else "pickle"
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown storage format {format!r}. Choose from {self.FORMATS}.")
+        if format == "parquet" and pq is None:
+            raise ValueError("Parquet storage requires pyarrow. Install with: pip install pyarrow")
+        self.data_dir = Path(data_dir)
+        self.format = format
+        self.row_group_size = row_group_size
+    
+    @property
+    def columnar(self) -> bool:
+        return self.format == "parquet"
+    
+    def _path(self, name: str, format: str) -> Path:
+        return self.data_dir / f"{name}.{format}"
+    
+    def path(self, name: str) -> Path:
+        """Path of an existing stage output, preferring the configured format"""
+        for format in (self.format,) + tuple(f for f in self.FORMATS if f != self.format):
+            path = self._path(name, format)
+            if path.exists() and (format == "pickle" or pq is not None):
+                return path
+        return self._path(name, self.format)
+    
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+    
+    def source(self, name: str) -> Dict:
+        """Identify the saved version of a stage output, for artifacts derived from it"""
+        path = self.path(name)
+        stat = path.stat()
+        return {'source': path.name, 'source_mtime_ns': stat.st_mtime_ns, 'source_size': stat.st_size}
+    
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read a whole stage output, optionally only some columns"""
+        path = self.path(name)
+        if path.suffix == ".parquet":
+            return pq.read_table(path, columns=columns).to_pandas()
+        df = pd.read_pickle(path)
+        return df[columns] if columns is not None else df
+    
+    def iter_batches(self, name: str, columns: Optional[List[str]] = None,
+                     batch_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream a stage output as DataFrames of at most batch_size rows"""
+        batch_size = batch_size or self.row_group_size
+        path = self.path(name)
+        if path.suffix == ".parquet":
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            df = self.read(name, columns)
+            for start in range(0, len(df), batch_size):
+                yield df.iloc[start:start + batch_size]
+    
+    def num_rows(self, name: str) -> int:
+        path = self.path(name)
+        if path.suffix == ".parquet":
+            return pq.ParquetFile(path).metadata.num_rows
+        return len(pd.read_pickle(path))
+    
+    def write(self, name: str, df: pd.DataFrame) -> Path:
+        return self.write_frames(name, [df])
+    
+    def write_frames(self, name: str, frames: Iterable[pd.DataFrame]) -> Path:
+        """
+        Write a stage output from an iterable of DataFrames
+        
+        Parquet output is written one row group at a time, so only one frame
+        needs to be in memory. The file is replaced atomically, which also
+        makes it safe for `frames` to stream from the previous version.
+        """
+        path = self._path(name, self.format)
+        tmp_path = path.with_name(path.name + ".tmp")
+        
+        if not self.columnar:
+            frames = list(frames)
+            df = pd.concat(frames, ignore_index=len(frames) > 1) if frames else pd.DataFrame()
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            return path
+        
+        writer = None
+        last_frame = None
+        try:
+            for frame in frames:
+                last_frame = frame
+                if len(frame) == 0:
+                    continue
+                if writer is None:
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False)
+                writer.write_table(table, row_group_size=self.row_group_size)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            # No rows at all: still write an empty file with whatever columns we saw
+            empty = last_frame if last_frame is not None else pd.DataFrame()
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+
+def file_sha256(path: Path) -> str:
+    """sha256 of a file's content, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed record of pipeline stage outputs
+    
+    A stage's key is a hash of the content of its input artifacts and of the
+    parameters that shape its output. The manifest keeps, per stage, the key
+    of the last completed run and the fingerprints of the outputs it wrote;
+    the stage is current while both still match, so a changed input or
+    parameter invalidates that stage and, through its outputs, every stage
+    downstream of it. File hashes are memoized by size and mtime so large
+    unchanged artifacts are not re-read on every check.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.root = self.path.parent
+        self.manifest = {'stages': {}, 'files': {}}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable stage manifest {self.path}: {e}")
+    
+    def _name(self, path: Path) -> str:
+        return os.path.relpath(path, self.root)
+    
+    def fingerprint(self, path: Path) -> Optional[str]:
+        """sha256 of a file's content (or a directory's files), None if it does not exist"""
+        path = Path(path)
+        if path.is_dir():
+            digest = hashlib.sha256()
+            for child in sorted(p for p in path.rglob("*") if p.is_file()):
+                digest.update(f"{child.relative_to(path)}\0{self.fingerprint(child)}\n".encode("utf-8"))
+            return digest.hexdigest()
+        if not path.exists():
+            return None
+        
+        stat = path.stat()
+        name = self._name(path)
+        memo = self.manifest['files'].get(name)
+        if memo and memo['size'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+            return memo['sha256']
+        sha256 = file_sha256(path)
+        self.manifest['files'][name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+        return sha256
+    
+    def key(self, stage: str, inputs: List[Path], params: Dict) -> str:
+        """Hash of a stage's name, input contents and parameters"""
+        payload = {
+            'stage': stage,
+            'inputs': {self._name(path): self.fingerprint(path) for path in inputs},
+            'params': params,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    
+    def is_current(self, stage: str, key: str, outputs: List[Path]) -> bool:
+        """True if the last run of stage had this key and its outputs are unchanged since"""
+        entry = self.manifest['stages'].get(stage)
+        if entry is None or entry['key'] != key:
+            return False
+        recorded = entry['outputs']
+        if set(recorded) != {self._name(path) for path in outputs}:
+            return False
+        return all(fingerprint is not None and fingerprint == recorded[self._name(path)]
+                   for path, fingerprint in ((path, self.fingerprint(path)) for path in outputs))
+    
+    def record(self, stage: str, key: str, outputs: List[Path], params: Dict):
+        """Record a completed stage run and the fingerprints of its outputs"""
+        self.manifest['stages'][stage] = {
+            'key': key,
+            'params': params,
+            'outputs': {self._name(path): self.fingerprint(path) for path in outputs},
+            'completed_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self._save()
+    
+    def outputs_unchanged(self, stage: str, outputs: List[Path]) -> bool:
+        """True if stage was recorded and its outputs still have the recorded fingerprints"""
+        entry = self.manifest['stages'].get(stage)
+        return entry is not None and entry['outputs'] == {self._name(path): self.fingerprint(path) for path in outputs}
+    
+    def refresh_outputs(self, stage: str, outputs: List[Path]):
+        """Re-fingerprint a recorded stage's outputs after an in-place update that keeps them valid"""
+        self.manifest['stages'][stage]['outputs'] = {self._name(path): self.fingerprint(path) for path in outputs}
+        self._save()
+    
+    def invalidate(self, *stages: str):
+        """Forget stages whose outputs were changed outside a full run"""
+        removed = [stage for stage in stages if self.manifest['stages'].pop(stage, None) is not None]
+        if removed:
+            self._save()
+    
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class TokenCorpus:
+    """
+    The lemmatized corpus as int32 token IDs over one global vocabulary
+    
+    Documents are stored CSR-style: the tokens of document i are
+    ids[offsets[i]:offsets[i + 1]] and vocabulary[id] is the token string.
+    Term and document frequencies per vocabulary entry are kept alongside.
+    Saved to a directory as .npy arrays (memory-mappable) and a JSON header
+    with the vocabulary; rows are aligned with full_proj_lemmatized.
+    """
+    
+    def __init__(self, vocabulary: List[str], offsets: np.ndarray, ids: np.ndarray,
+                 term_freq: np.ndarray, doc_freq: np.ndarray, source: Optional[Dict] = None):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.ids = ids
+        self.term_freq = term_freq
+        self.doc_freq = doc_freq
+        self.source = source or {}
+    
+    @property
+    def n_docs(self) -> int:
+        return len(self.offsets) - 1
+    
+    def tokens(self, doc: int) -> List[str]:
+        vocabulary = self.vocabulary
+        return [vocabulary[i] for i in self.ids[self.offsets[doc]:self.offsets[doc + 1]]]
+    
+    def counts(self, start: int = 0, stop: Optional[int] = None) -> sparse.csr_matrix:
+        """Document x vocabulary term-count matrix of documents start:stop"""
+        stop = self.n_docs if stop is None else stop
+        lo, hi = self.offsets[start], self.offsets[stop]
+        counts = sparse.csr_matrix(
+            (np.ones(hi - lo, dtype=np.int32), np.array(self.ids[lo:hi]), self.offsets[start:stop + 1] - lo),
+            shape=(stop - start, len(self.vocabulary)))
+        counts.sum_duplicates()  # sorts the (copied) IDs in place
+        return counts
+    
+    def _feature_chunks(self, analyzer: Callable[[str], List[str]],
+                        chunk_size: int) -> Tuple[List[str], Iterator[sparse.csr_matrix]]:
+        """
+        Sorted terms that analyzer yields for the vocabulary entries, and the
+        document-term count matrices over them, chunk_size documents at a time
+        """
+        analyzed = [analyzer(term) for term in self.vocabulary]
+        features = sorted({term for terms in analyzed for term in terms})
+        column = {term: i for i, term in enumerate(features)}
+        pairs = [(token_id, column[term]) for token_id, terms in enumerate(analyzed) for term in terms]
+        rows, cols = zip(*pairs) if pairs else ((), ())
+        mapping = sparse.csr_matrix((np.ones(len(pairs), dtype=np.int64), (rows, cols)),
+                                    shape=(len(self.vocabulary), len(features)))
+        chunks = (self.counts(start, min(start + chunk_size, self.n_docs)) @ mapping
+                  for start in range(0, self.n_docs, chunk_size))
+        return features, chunks
+    
+    def feature_counts(self, analyzer: Callable[[str], List[str]],
+                       chunk_size: int = 10000) -> Tuple[sparse.csr_matrix, List[str]]:
+        """
+        Document-term count matrix over the terms analyzer yields for each
+        vocabulary entry (what a CountVectorizer with that analyzer counts),
+        and the sorted terms, built without token strings
+        """
+        features, chunks = self._feature_chunks(analyzer, chunk_size)
+        chunks = list(chunks)
+        if not chunks:
+            return sparse.csr_matrix((0, len(features)), dtype=np.int64), features
+        return sparse.vstack(chunks, format='csr'), features
+    
+    def feature_frequencies(self, analyzer: Callable[[str], List[str]],
+                            chunk_size: int = 10000) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Sorted analyzer terms with their term and document frequencies, one chunk in memory at a time"""
+        features, chunks = self._feature_chunks(analyzer, chunk_size)
+        term_freq = np.zeros(len(features), dtype=np.int64)
+        doc_freq = np.zeros(len(features), dtype=np.int64)
+        for counts in chunks:
+            term_freq += np.asarray(counts.sum(axis=0)).ravel()
+            doc_freq += np.bincount(counts.indices, minlength=len(features))
+        return features, term_freq, doc_freq
+    
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "offsets.npy", np.asarray(self.offsets, dtype=np.int64))
+        np.save(path / "ids.npy", np.asarray(self.ids, dtype=np.int32))
+        np.save(path / "term_freq.npy", np.asarray(self.term_freq, dtype=np.int64))
+        np.save(path / "doc_freq.npy", np.asarray(self.doc_freq, dtype=np.int64))
+        return self.save_header(path)
+    
+    def save_header(self, path: Path) -> Path:
+        """Write corpus.json only (vocabulary and source), e.g. after updating source"""
+        path = Path(path)
+        with open(path / "corpus.json", 'w') as f:
+            json.dump({'n_docs': self.n_docs, 'n_tokens': int(self.offsets[-1]), 'source': self.source,
+                       'vocabulary': self.vocabulary}, f)
+        return path
+    
+    @staticmethod
+    def exists(path: Path) -> bool:
+        return (Path(path) / "corpus.json").exists()
+    
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> 'TokenCorpus':
+        path = Path(path)
+        mmap_mode = 'r' if mmap else None
+        with open(path / "corpus.json") as f:
+            header = json.load(f)
+        return cls(header['vocabulary'], np.load(path / "offsets.npy"), np.load(path / "ids.npy", mmap_mode=mmap_mode),
+                   np.load(path / "term_freq.npy"), np.load(path / "doc_freq.npy"), source=header['source'])
+    
+    @classmethod
+    def merge(cls, corpora: Iterable['TokenCorpus'], source: Optional[Dict] = None) -> 'TokenCorpus':
+        """
+        Concatenate corpora over disjoint documents into one corpus
+        
+        Vocabularies are unioned in order of first appearance and each
+        corpus's IDs remapped, and term and document frequencies add up, so
+        the result equals the corpus TokenCorpusBuilder would have built from
+        all documents in the same order.
+        """
+        index = {}
+        id_chunks, length_chunks, frequencies = [], [], []
+        for corpus in corpora:
+            mapping = np.array([index.setdefault(term, len(index)) for term in corpus.vocabulary], dtype=np.int32)
+            id_chunks.append(mapping[np.asarray(corpus.ids)] if len(mapping) else np.zeros(0, dtype=np.int32))
+            length_chunks.append(np.diff(corpus.offsets))
+            frequencies.append((mapping, corpus.term_freq, corpus.doc_freq))
+        term_freq = np.zeros(len(index), dtype=np.int64)
+        doc_freq = np.zeros(len(index), dtype=np.int64)
+        for mapping, corpus_term_freq, corpus_doc_freq in frequencies:
+            term_freq[mapping] += corpus_term_freq
+            doc_freq[mapping] += corpus_doc_freq
+        lengths = np.concatenate(length_chunks) if length_chunks else np.zeros(0, dtype=np.int64)
+        ids = np.concatenate(id_chunks) if id_chunks else np.zeros(0, dtype=np.int32)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        return cls(list(index), offsets, ids, term_freq, doc_freq, source=source)
+
+
+class TokenCorpusBuilder:
+    """
+    Accumulates token lists into a TokenCorpus, assigning IDs in order of first appearance
+    
+    Starting from an existing corpus keeps its IDs, so documents can be appended.
+    """
+    
+    def __init__(self, corpus: Optional[TokenCorpus] = None):
+        self.index = {term: i for i, term in enumerate(corpus.vocabulary)} if corpus is not None else {}
+        self.id_chunks = [np.asarray(corpus.ids, dtype=np.int32)] if corpus is not None else []
+        self.length_chunks = [np.diff(corpus.offsets)] if corpus is not None else []
+    
+    def add_documents(self, documents: Iterable[List[str]]):
+        index = self.index
+        lengths = []
+        ids = []
+        for tokens in documents:
+            lengths.append(len(tokens))
+            ids.extend(index.setdefault(token, len(index)) for token in tokens)
+        self.id_chunks.append(np.array(ids, dtype=np.int32))
+        self.length_chunks.append(np.array(lengths, dtype=np.int64))
+    
+    def build(self, source: Optional[Dict] = None) -> TokenCorpus:
+        ids = np.concatenate(self.id_chunks) if self.id_chunks else np.zeros(0, dtype=np.int32)
+        lengths = np.concatenate(self.length_chunks) if self.length_chunks else np.zeros(0, dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        corpus = TokenCorpus(list(self.index), offsets, ids, np.bincount(ids, minlength=len(self.index)),
+                             np.zeros(len(self.index), dtype=np.int64), source=source)
+        # Document frequencies from the de-duplicated count matrix, a chunk of documents at a time
+        for start in range(0, corpus.n_docs, 10000):
+            counts = corpus.counts(start, min(start + 10000, corpus.n_docs))
+            corpus.doc_freq += np.bincount(counts.indices, minlength=len(self.index))
+        return corpus
+
+
+# Odd 64-bit multiplier combining word hashes into shingle hashes
+_SHINGLE_BASE = np.uint64(0x9E3779B97F4A7C15)
+
+
+@functools.lru_cache(maxsize=2 ** 20)
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode("utf-8"))
+
+
+def shingle_hashes(words: List[str], size: int = 5) -> np.ndarray:
+    """
+    64-bit hashes of the word `size`-shingles of a document, in word order
+    
+    Words are hashed with CRC32 (stable across processes) and combined
+    polynomially; documents shorter than size words form a single shingle.
+    """
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    word_hashes = np.fromiter(map(_word_hash, words), dtype=np.uint64, count=len(words))
+    size = min(size, len(words))
+    n_shingles = len(words) - size + 1
+    hashes = np.zeros(n_shingles, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_BASE + word_hashes[offset:offset + n_shingles]
+    return hashes
+
+
+class MinHasher:
+    """
+    MinHash signatures of shingle sets with num_perm multiply-shift hash functions
+    
+    The fraction of equal signature entries of two documents estimates the
+    Jaccard similarity of their shingle sets. Shingles are hashed chunk_size
+    at a time, so memory per document stays at num_perm x chunk_size hashes
+    however long the opinion is.
+    """
+    
+    def __init__(self, num_perm: int = 128, seed: int = 1, chunk_size: int = 4096):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.chunk_size = chunk_size
+        self.a = rng.randint(1, 2 ** 62, size=num_perm, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.randint(0, 2 ** 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+    
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        """uint32 signature of a shingle hash array (all 0xFFFFFFFF for an empty document)"""
+        if len(shingles) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        shingles = np.unique(shingles)
+        # uint64 arithmetic wraps, which is what multiply-shift hashing relies on; the
+        # shift is monotonic, so it is applied to the minima rather than to every hash
+        minima = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(shingles), self.chunk_size):
+            hashed = np.multiply.outer(self.a, shingles[start:start + self.chunk_size])
+            hashed += self.b[:, None]
+            np.minimum(minima, hashed.min(axis=1), out=minima)
+        return (minima >> np.uint64(32)).astype(np.uint32)
+
+
+def lsh_clusters(signatures: np.ndarray, bands: int = 16, threshold: float = 0.8,
+                 valid: Optional[np.ndarray] = None, fixed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster near-duplicate documents from their MinHash signatures
+    
+    Documents sharing any band of bands x (num_perm / bands) signature rows
+    become candidates, and candidates whose estimated Jaccard similarity
+    is at least threshold are merged, so cost grows with the number of
+    candidate pairs rather than all pairs. Rows where valid is False never
+    merge. Rows where fixed is True are representatives of an earlier
+    clustering: they are not compared with each other, stay
+    representatives, and other rows join at most one of them. Returns each
+    document's representative (its cluster's first document, or its fixed
+    row) and its estimated similarity to the document it was merged with
+    (1.0 for representatives).
+    """
+    n_docs, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide the signature length ({num_perm})")
+    rows = num_perm // bands
+    valid = np.ones(n_docs, dtype=bool) if valid is None else valid
+    fixed = np.zeros(n_docs, dtype=bool) if fixed is None else fixed
+    parent = np.arange(n_docs)
+    similarity = np.ones(n_docs)
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    candidates = np.flatnonzero(valid)
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[candidates, band * rows:(band + 1) * rows])
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind='stable')
+        boundaries = np.flatnonzero(keys[order][1:] != keys[order][:-1]) + 1
+        for bucket in np.split(candidates[order], boundaries):
+            # Compare against one anchor at a time; unmatched members form the next round
+            while len(bucket) > 1:
+                anchor, rest = bucket[0], bucket[1:]
+                sims = (signatures[rest] == signatures[anchor]).mean(axis=1)
+                matched = (sims >= threshold) & ~(fixed[anchor] & fixed[rest])
+                for doc, sim in zip(rest[matched], sims[matched]):
+                    root_a, root_b = find(anchor), find(doc)
+                    if root_a == root_b or (fixed[root_a] and fixed[root_b]):
+                        continue
+                    # The surviving root is the fixed one, else the earlier document
+                    if fixed[root_b] or (not fixed[root_a] and root_b < root_a):
+                        root_a, root_b = root_b, root_a
+                    parent[root_b] = root_a
+                    similarity[[anchor, doc]] = np.minimum(similarity[[anchor, doc]], sim)
+                bucket = rest[~matched]
+    
+    representative = np.array([find(i) for i in range(n_docs)])
+    similarity[representative == np.arange(n_docs)] = 1.0
+    return representative, similarity
+
+
+def assign_topics(doc_topic: np.ndarray, top_k: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Batched topic assignment for a document-topic matrix
+    
+    Returns the dominant topic and its weight for every document, plus the
+    top_k topics per document (strongest first) and their weights, using
+    argmax/argpartition over the whole matrix at once.
+    """
+    doc_topic = np.asarray(doc_topic)
+    n_docs, n_topics = doc_topic.shape
+    dominant = doc_topic.argmax(axis=1)
+    
+    top_k = max(1, min(top_k, n_topics))
+    if top_k < n_topics:
+        top_topics = np.argpartition(-doc_topic, top_k - 1, axis=1)[:, :top_k]
+    else:
+        top_topics = np.broadcast_to(np.arange(n_topics), (n_docs, n_topics))
+    top_weights = np.take_along_axis(doc_topic, top_topics, axis=1)
+    order = np.argsort(-top_weights, axis=1, kind='stable')
+    
+    return {
+        'topic_number': dominant,
+        'topic_strength': doc_topic[np.arange(n_docs), dominant],
+        'top_topics': np.take_along_axis(top_topics, order, axis=1).astype(np.int32),
+        'top_weights': np.take_along_axis(top_weights, order, axis=1).astype(np.float32),
+    }
+
+
+def load_document_topics(data_dir, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """The document-topic matrix and top-k mixtures step 4 saved in data_dir (see the modeler method)"""
+    data_dir = Path(data_dir)
+    matrix_file = data_dir / "doc_topic_matrix.npy"
+    top_k_file = data_dir / "doc_topic_top_k.npz"
+    if not matrix_file.exists() or not top_k_file.exists():
+        raise ValueError("No document-topic matrix found. Run step4_topic_modeling() first.")
+    result = dict(np.load(top_k_file))
+    result['matrix'] = np.load(matrix_file, mmap_mode='r' if mmap else None)
+    return result
+
+
+def top_term_indices(components: np.ndarray, n_top: int) -> np.ndarray:
+    """Indices of the n_top highest-weighted terms of each topic, strongest first"""
+    n_top = min(n_top, components.shape[1])
+    top = np.argpartition(-components, n_top - 1, axis=1)[:, :n_top]
+    order = np.argsort(-np.take_along_axis(components, top, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1)
+
+
+def umass_coherence(doc_term: sparse.spmatrix, top_terms: np.ndarray) -> np.ndarray:
+    """
+    UMass coherence of each topic's top terms, from document co-occurrence counts
+    
+    doc_term is any (n_docs x n_terms) matrix whose non-zeros mark term
+    occurrence; top_terms is (n_topics x n_top) term indices, strongest first.
+    Higher (closer to zero) is more coherent.
+    """
+    present = sparse.csc_matrix(doc_term, dtype=np.float64)
+    present.data[:] = 1
+    scores = np.empty(len(top_terms))
+    for topic_idx, terms in enumerate(top_terms):
+        sub = present[:, terms]
+        co_docs = (sub.T @ sub).toarray()
+        upper, lower = np.tril_indices(len(terms), k=-1)
+        # Pairs (w_i, w_j) with w_j ranked above w_i: log((D(w_i, w_j) + 1) / D(w_j))
+        scores[topic_idx] = np.log((co_docs[upper, lower] + 1) / np.maximum(co_docs[lower, lower], 1)).mean()
+    return scores
+
+
+def _warm_start_factors(tfidf_matrix: sparse.spmatrix, W: np.ndarray, H: np.ndarray, n_topics: int,
+                        random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad a smaller NMF solution with random components, scaled like NMF(init='random')"""
+    n_new = n_topics - H.shape[0]
+    rng = np.random.RandomState(random_state + n_topics)
+    scale = np.sqrt(tfidf_matrix.mean() / n_topics)
+    H_new = np.abs(scale * rng.standard_normal((n_new, H.shape[1])))
+    W_new = np.abs(scale * rng.standard_normal((W.shape[0], n_new)))
+    return np.hstack([W, W_new]), np.vstack([H, H_new])
+
+
+def _fit_topic_chain(tfidf_file: str, chain: List[int], n_top_words: int, max_iter: int,
+                     random_state: int) -> List[Dict]:
+    """
+    Fit NMF for an increasing sequence of topic counts, warm-starting each fit
+    from the previous solution (runs in a worker process of sweep_topic_counts)
+    """
+    tfidf_matrix = sparse.load_npz(tfidf_file)
+    results = []
+    W = H = None
+    for n_topics in chain:
+        start = time.perf_counter()
+        if H is None:
+            nmf_model = sklearn_decomposition.NMF(n_components=n_topics, random_state=random_state, max_iter=max_iter)
+            W = nmf_model.fit_transform(tfidf_matrix)
+        else:
+            W, H = _warm_start_factors(tfidf_matrix, W, H, n_topics, random_state)
+            nmf_model = sklearn_decomposition.NMF(n_components=n_topics, init='custom', random_state=random_state,
+                                                  max_iter=max_iter)
+            W = nmf_model.fit_transform(tfidf_matrix, W=W, H=H)
+        H = nmf_model.components_
+        coherence = umass_coherence(tfidf_matrix, top_term_indices(H, n_top_words))
+        results.append({
+            'n_topics': n_topics,
+            'reconstruction_error': nmf_model.reconstruction_err_,
+            'coherence': coherence.mean(),
+            'min_topic_coherence': coherence.min(),
+            'n_iter': nmf_model.n_iter_,
+            'warm_started': len(results) > 0,
+            'fit_seconds': time.perf_counter() - start,
+        })
+    return results
+
+
+def year_topic_matrix(years: np.ndarray, topics: np.ndarray, start_year: int, n_years: int,
+                      n_topics: int) -> np.ndarray:
+    """Dense (n_years x n_topics) count matrix of (year, topic) pairs via one bincount"""
+    flat = (np.asarray(years, dtype=np.int64) - start_year) * n_topics + np.asarray(topics, dtype=np.int64)
+    return np.bincount(flat, minlength=n_years * n_topics).reshape(n_years, n_topics)
+
+
+def write_visualization_export(out_dir, start_year: int, counts: np.ndarray, totals: np.ndarray,
+                               topics: List[Dict], exemplars: pd.DataFrame) -> Path:
+    """
+    Write the compact D3 area-chart export to out_dir
+    
+    - year_topic_counts.json (and .json.gz): start_year, n_years, n_topics,
+      the dense year x topic count matrix flattened row-major, and per-year totals
+    - year_topic_counts.bin: the same as little-endian uint32, laid out as
+      [start_year, n_years, n_topics, counts..., totals...]; this is what
+      index.js loads
+    - topics.json: one {topic_number, name, words} entry per topic, in
+      column order; topic numbers may be sparse (topics with no cases have
+      no column). words is normalized to a comma-separated list, dropping
+      stray quotes, whitespace and empty entries
+    - exemplars.csv: one example case per topic (topic_number, url, title, leadpp)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts = np.asarray(counts, dtype=np.uint32)
+    totals = np.asarray(totals, dtype=np.uint32)
+    n_years, n_topics = counts.shape
+    
+    # index.js labels column k with topics[k]
+    topic_numbers = [int(topic['topic_number']) for topic in topics]
+    if len(topic_numbers) != n_topics or topic_numbers != sorted(set(topic_numbers)):
+        raise ValueError(f"topics must list one entry per count column in increasing topic_number order, "
+                         f"got {topic_numbers} for {n_topics} columns")
+    topics = [{**topic, 'words': ', '.join(filter(None, (word.strip(' "\t\r\n')
+                                                         for word in str(topic['words']).split(','))))}
+              for topic in topics]
+    
+    payload = json.dumps({
+        'start_year': int(start_year),
+        'n_years': n_years,
+        'n_topics': n_topics,
+        'counts': counts.ravel().tolist(),
+        'totals': totals.tolist(),
+    }, separators=(',', ':')).encode('utf-8')
+    (out_dir / "year_topic_counts.json").write_bytes(payload)
+    with gzip.open(out_dir / "year_topic_counts.json.gz", 'wb') as f:
+        f.write(payload)
+    
+    header = np.array([start_year, n_years, n_topics], dtype=np.uint32)
+    np.concatenate([header, counts.ravel(), totals]).astype('<u4').tofile(out_dir / "year_topic_counts.bin")
+    
+    with open(out_dir / "topics.json", 'w') as f:
+        json.dump(topics, f, separators=(',', ':'))
+    exemplars.to_csv(out_dir / "exemplars.csv", index=False)
+    return out_dir
+
+
+class TopicModel:
+    """
+    A fitted TF-IDF + NMF model that labels new documents without refitting
+    
+    Saved as a directory of plain files: model.json (vocabulary, vectorizer
+    settings and topic words), idf.npy and components.npy (float32). The
+    arrays are memory-mapped on load, so loading is cheap and worker
+    processes share one copy through the page cache.
+    
+    Texts passed to transform()/predict() are tokenized with the tokenizer
+    given at load time; without one they must already be lemmatized strings
+    (the processed_text_str column). The tokenizer the model was fit with is
+    saved alongside it when picklable (see load_tokenizer).
+    """
+    
+    FILES = ("model.json", "idf.npy", "components.npy")
+    TOKENIZER_FILE = "tokenizer.pickle"
+    
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, components: np.ndarray, topic_words: Dict,
+                 stop_words=None, max_iter: int = 200, tol: float = 1e-4, tokenizer=None):
+        self.vocabulary = list(vocabulary)
+        self.idf = idf
+        self.components = components
+        self.topic_words = {int(topic): words for topic, words in topic_words.items()}
+        self.stop_words = stop_words
+        self.max_iter = max_iter
+        self.tol = tol
+        self.tokenizer = tokenizer
+        
+        self.vectorizer = sklearn_text.TfidfVectorizer(vocabulary=self.vocabulary, stop_words=stop_words,
+                                                       ngram_range=(1, 1), dtype=components.dtype)
+        self.vectorizer.idf_ = np.asarray(idf)
+    
+    @property
+    def n_topics(self) -> int:
+        return self.components.shape[0]
+    
+    @classmethod
+    def from_fitted(cls, tfidf_vectorizer: TfidfVectorizer, nmf_model, topic_words: Dict) -> 'TopicModel':
+        """Build from a fitted vectorizer and NMF/MiniBatchNMF model"""
+        return cls(
+            vocabulary=tfidf_vectorizer.get_feature_names_out().tolist(),
+            idf=tfidf_vectorizer.idf_.astype(np.float32),
+            components=nmf_model.components_.astype(np.float32),
+            topic_words=topic_words,
+            stop_words=tfidf_vectorizer.stop_words,
+            max_iter=nmf_model.max_iter,
+            tol=nmf_model.tol,
+        )
+    
+    def save(self, model_dir) -> Path:
+        """Write the model files to model_dir, replacing any previous model"""
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        np.save(model_dir / "idf.npy", np.asarray(self.idf, dtype=np.float32))
+        np.save(model_dir / "components.npy", np.asarray(self.components, dtype=np.float32))
+        with open(model_dir / "model.json", 'w') as f:
+            json.dump({
+                'vocabulary': self.vocabulary,
+                'stop_words': self.stop_words,
+                'max_iter': self.max_iter,
+                'tol': self.tol,
+                'topic_words': self.topic_words,
+            }, f)
+        tokenizer_file = model_dir / self.TOKENIZER_FILE
+        tokenizer_file.unlink(missing_ok=True)
+        if self.tokenizer is not None:
+            try:
+                data = pickle.dumps(self.tokenizer)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                logger.warning(f"Tokenizer is not picklable and is not saved with the model: {e}")
+            else:
+                tokenizer_file.write_bytes(data)
+        return model_dir
+    
+    @classmethod
+    def exists(cls, model_dir) -> bool:
+        return all((Path(model_dir) / name).exists() for name in cls.FILES)
+    
+    @classmethod
+    def load_tokenizer(cls, model_dir):
+        """The tokenizer the saved model was fit with, or None if it was not saved"""
+        tokenizer_file = Path(model_dir) / cls.TOKENIZER_FILE
+        if not tokenizer_file.exists():
+            return None
+        with open(tokenizer_file, 'rb') as f:
+            return pickle.load(f)
+    
+    @classmethod
+    def load(cls, model_dir, mmap: bool = True, tokenizer=None) -> 'TopicModel':
+        """Load a saved model; idf and components are memory-mapped unless mmap=False"""
+        model_dir = Path(model_dir)
+        if not cls.exists(model_dir):
+            raise ValueError(f"No topic model found in {model_dir}. Run step4_topic_modeling() first.")
+        with open(model_dir / "model.json") as f:
+            settings = json.load(f)
+        mmap_mode = 'r' if mmap else None
+        return cls(
+            idf=np.load(model_dir / "idf.npy", mmap_mode=mmap_mode),
+            components=np.load(model_dir / "components.npy", mmap_mode=mmap_mode),
+            tokenizer=tokenizer,
+            **settings,
+        )
+    
+    def vectorize(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """TF-IDF matrix of texts over the model vocabulary"""
+        if self.tokenizer is not None:
+            texts = [' '.join(self.tokenizer(text)) for text in texts]
+        return self.vectorizer.transform(texts)
+    
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Document-topic weights of texts with the topic components held fixed
+        (the same coordinate-descent solve as NMF.transform)
+        """
+        tfidf_matrix = self.vectorize(texts)
+        doc_topic, _, _ = sklearn_decomposition.non_negative_factorization(
+            tfidf_matrix, H=self.components, n_components=self.n_topics, init='custom',
+            update_H=False, max_iter=self.max_iter, tol=self.tol,
+        )
+        return doc_topic
+    
+    def predict(self, texts: Iterable[str], top_k: int = 3, batch_size: int = 256) -> pd.DataFrame:
+        """
+        Label texts in batches of batch_size
+        
+        Returns one row per text with the dominant topic_number, topic_strength
+        and topic_words, plus the top_k topics and their weights.
+        """
+        texts = list(texts)
+        frames = []
+        for start in range(0, len(texts), batch_size):
+            assignment = assign_topics(self.transform(texts[start:start + batch_size]), top_k=top_k)
+            frames.append(pd.DataFrame({
+                'topic_number': assignment['topic_number'],
+                'topic_strength': assignment['topic_strength'],
+                'top_topics': list(assignment['top_topics']),
+                'top_weights': list(assignment['top_weights']),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=['topic_number', 'topic_strength', 'topic_words', 'top_topics', 'top_weights'])
+        df = pd.concat(frames, ignore_index=True)
+        df.insert(2, 'topic_words', df['topic_number'].map(self.topic_words))
+        return df
+
+
+def _resource_usage() -> Dict[str, float]:
+    """CPU seconds of this process and its finished children, and peak RSS in bytes"""
+    usage = {'cpu_seconds': time.process_time(), 'children_cpu_seconds': 0.0,
+             'peak_rss_bytes': 0, 'children_peak_rss_bytes': 0}
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        usage['children_cpu_seconds'] = children.ru_utime + children.ru_stime
+        usage['peak_rss_bytes'] = own.ru_maxrss * scale
+        usage['children_peak_rss_bytes'] = children.ru_maxrss * scale
+    return usage
+
+
+class RunProfiler:
+    """
+    Structured per-stage metrics for a pipeline run
+    
+    Each stage records wall and CPU time (including worker processes that
+    have exited), the process peak RSS at the end of the stage, documents
+    and documents/sec, and the change in the counters returned by
+    `counters` (bytes fetched, cache hits, retries, ...). With cprofile=True
+    every stage is also run under cProfile (saved to profile_dir/<stage>.prof);
+    with trace_memory=True tracemalloc reports each stage's peak traced
+    allocation and its top allocation sites.
+    """
+    
+    def __init__(self, counters: Callable[[], Dict[str, int]] = dict, cprofile: bool = False,
+                 trace_memory: bool = False, profile_dir: Optional[Path] = None):
+        self.counters = counters
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else Path("profiles")
+        self.started_at = datetime.now(timezone.utc)
+        self.stages = []
+        self._active = None
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as one stage; yields the record so callers can add 'documents'"""
+        record = {'stage': name, 'status': 'ok', 'documents': None}
+        counters_before = self.counters()
+        usage_before = _resource_usage()
+        profile = cProfile.Profile() if self.cprofile else None
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        self._active = name
+        try:
+            yield record
+        except BaseException:
+            record['status'] = 'failed'
+            raise
+        finally:
+            self._active = None
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - start
+            usage = _resource_usage()
+            record['wall_seconds'] = wall
+            record['cpu_seconds'] = usage['cpu_seconds'] - usage_before['cpu_seconds']
+            record['children_cpu_seconds'] = usage['children_cpu_seconds'] - usage_before['children_cpu_seconds']
+            record['peak_rss_bytes'] = usage['peak_rss_bytes']
+            record['children_peak_rss_bytes'] = usage['children_peak_rss_bytes']
+            if record['documents'] is not None and wall > 0:
+                record['documents_per_second'] = record['documents'] / wall
+            counters_after = self.counters()
+            record.update({key: value - counters_before.get(key, 0) for key, value in counters_after.items()})
+            
+            if profile is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profile_file = self.profile_dir / f"{name}.prof"
+                profile.dump_stats(str(profile_file))
+                record['cprofile_file'] = str(profile_file)
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                record['tracemalloc_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                record['tracemalloc_top'] = [str(stat) for stat in snapshot.statistics('lineno')[:10]]
+                tracemalloc.stop()
+            self.stages.append(record)
+            logger.info(f"Stage {name}: {wall:.1f}s wall, {record['cpu_seconds']:.1f}s CPU, "
+                        f"peak RSS {record['peak_rss_bytes'] / 1024 ** 2:.0f} MB")
+    
+    @property
+    def active(self) -> bool:
+        return self._active is not None
+    
+    def report(self, **run_info) -> Dict:
+        totals = {
+            'wall_seconds': sum(stage['wall_seconds'] for stage in self.stages),
+            'cpu_seconds': sum(stage['cpu_seconds'] for stage in self.stages),
+            'children_cpu_seconds': sum(stage['children_cpu_seconds'] for stage in self.stages),
+            'peak_rss_bytes': max((stage['peak_rss_bytes'] for stage in self.stages), default=0),
+        }
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'run': run_info,
+            'stages': self.stages,
+            'totals': totals,
+        }
+    
+    def write_report(self, path, **run_info) -> Path:
+        """Write the run report as JSON"""
+        path = Path(path)
+        with open(path, 'w') as f:
+            json.dump(self.report(**run_info), f, indent=2, default=str)
+        return path
+    
+    def write_prometheus(self, path, prefix: str = "scotus_pipeline") -> Path:
+        """Write the numeric stage metrics in Prometheus text exposition format (for node_exporter's textfile collector)"""
+        metrics = {}
+        for stage in self.stages:
+            for key, value in stage.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics.setdefault(key, []).append((stage['stage'], value))
+        lines = []
+        for key, samples in sorted(metrics.items()):
+            lines.append(f"# TYPE {prefix}_{key} gauge")
+            lines.extend(f'{prefix}_{key}{{stage="{stage}"}} {value}' for stage, value in samples)
+        lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+        lines.append(f"{prefix}_last_run_timestamp_seconds {time.time():.0f}")
+        
+        # Write then rename so the collector never reads a partial file
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+
+def profiled_stage(count_documents: Optional[Callable] = None):
+    """
+    Run a pipeline step as a RunProfiler stage when the modeler has an active profiler
+    
+    Documents are counted with count_documents(self, result), by default the
+    length of the returned DataFrame (or of the first element of a returned tuple).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None or profiler.active:
+                return method(self, *args, **kwargs)
+            with profiler.stage(method.__name__) as record:
+                result = method(self, *args, **kwargs)
+                if count_documents is not None:
+                    record['documents'] = count_documents(self, result)
+                else:
+                    frame = result[0] if isinstance(result, tuple) else result
+                    record['documents'] = len(frame) if frame is not None else None
+                return result
+        return wrapper
+    return decorator
+
+
 class SupremeCourtTopicModeler:
     """
     A complete pipeline for Supreme Court case topic modeling.
@@ -71,13 +1919,28 @@ class SupremeCourtTopicModeler:
     5. Generate visualization data
     """
     
-    def __init__(self, data_dir: str = "data", start_year: int = 1760, end_year: int = 2018):
+    def __init__(self, data_dir: str = "data", start_year: int = 1760, end_year: int = 2018,
+                 root_url: str = "http://caselaw.findlaw.com/court/us-supreme-court/years/",
+                 max_workers: int = 8, requests_per_second: float = 5.0,
+                 http_cache: bool = True, cache_ttl: float = 7 * 24 * 3600,
+                 cache_max_bytes: int = 2 * 1024 ** 3, n_jobs: int = 1, spacy_batch_size: int = 32,
+                 tokenizer="auto", storage: str = "pickle", min_token_length: int = 2,
+                 stage_cache: bool = True, extractor="lxml", dedupe: bool = True,
+                 nlp_data_dir: Optional[str] = None, download_nlp_data: bool = True,
+                 shard_index: int = 0, shard_count: int = 1):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.start_year = start_year
         self.end_year = end_year
         self.str_data_dir = data_dir
         self.dir_contents = glob.glob(self.str_data_dir)
+        self.root_url = root_url
+        
+        # Concurrency settings for fetching (requests_per_second is per host, <= 0 disables limiting)
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self._rate_limiters: Dict[str, TokenBucket] = {}
+        self._rate_limiters_lock = threading.Lock()
         
         # Web scraping headers to avoid being blocked
         self.headers = {
@@ -89,129 +1952,300 @@ class SupremeCourtTopicModeler:
             "Upgrade-Insecure-Requests": "1",
         }
         
-        # Initialize stopwords
+        # Shared session so worker threads reuse pooled connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max(1, max_workers), pool_maxsize=max(1, max_workers))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Worker processes for text preprocessing (-1 uses every core) and
+        # documents per spaCy nlp.pipe batch (1 lemmatizes one document at a time)
+        self.n_jobs = n_jobs
+        self.spacy_batch_size = spacy_batch_size
+        
+        # On-disk response cache shared by all fetches (None disables caching)
+        self.http_cache = HttpCache(self.data_dir / "http_cache", ttl=cache_ttl,
+                                    max_bytes=cache_max_bytes) if http_cache else None
+        
+        # Stage output storage: "pickle", "parquet" (chunked, columnar) or "auto"
+        self.store = CorpusStore(self.data_dir, format=storage)
+        
+        # Opinion text extraction backend: a name from EXTRACTORS or any callable (html, url) -> text
+        self.extractor = EXTRACTORS[extractor]() if isinstance(extractor, str) and extractor in EXTRACTORS else extractor
+        if not callable(self.extractor):
+            raise ValueError(f"Unknown extractor {extractor!r}. Choose from {sorted(EXTRACTORS)} or pass a callable.")
+        
+        # Merge near-duplicate cases and strip boilerplate between steps 2 and 3 (see dedupe_cases)
+        self.dedupe = dedupe
+        
+        # Hash partition of the case list this modeler owns (see run_shard); 0 of 1 is the whole corpus
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index must be between 0 and shard_count - 1, got {shard_index} of {shard_count}")
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        
+        # Persistent record of crawl progress so steps 1 and 2 can resume
+        self.ledger = FetchLedger(self.data_dir / "fetch_ledger.sqlite")
+        
+        # Content-addressed record of completed stages, so unchanged stages are skipped (None disables)
+        self.stage_cache = StageCache(self.data_dir / "stage_manifest.json") if stage_cache else None
+        
+        # Initialize stopwords; NLTK data is looked up in nlp_data_dir and NLTK's
+        # search path first and only downloaded if missing and download_nlp_data is set
+        self.nlp_data_dir = nlp_data_dir
+        self.download_nlp_data = download_nlp_data
         self._setup_stopwords()
         
+        # Tokenizer: a name from TOKENIZERS, "auto", or any picklable callable text -> tokens;
+        # tokens shorter than min_token_length are dropped by the built-in tokenizers
+        self.min_token_length = min_token_length
+        self.tokenizer = self._make_tokenizer(tokenizer)
+        
         # Results storage
         self.case_urls_df = None
         self.full_cases_df = None
         self.processed_df = None
+        self.new_cases_df = None
         self.final_results = None
+        self.topic_model = None
+        
+        # Fetch counters for run reports (updated from worker threads)
+        self.fetch_stats = Counter()
+        self._fetch_stats_lock = threading.Lock()
+        self.profiler = None
+    
+    def _count_fetch(self, **counts):
+        with self._fetch_stats_lock:
+            self.fetch_stats.update(counts)
+    
+    def run_counters(self) -> Dict[str, int]:
+        """Cumulative fetch, extraction and HTTP cache counters, as recorded per stage in run reports"""
+        with self._fetch_stats_lock:
+            counters = {key: self.fetch_stats.get(key, 0)
+                        for key in ('http_requests', 'bytes_fetched', 'retries', 'failed_fetches',
+                                    'pages_extracted', 'extraction_microseconds')}
+        if self.http_cache:
+            counters.update(cache_hits=self.http_cache.hits, cache_revalidated=self.http_cache.revalidated,
+                            cache_misses=self.http_cache.misses)
+        return counters
     
     def _setup_stopwords(self):
         """Set up comprehensive stopwords list for legal text"""
-        
-        # Basic stopwords
-        basic_stopwords = set(ENGLISH_STOP_WORDS)
-        if stopwords:
-            basic_stopwords.update(stopwords.words('english'))
-        
-        # Legal/court specific stopwords (reduced list - keep more legal terms)
-        legal_stopwords = [
-            'join', 'seek', 'note', 'pd', 'misc', 'assistant', 'whereon', 'dismiss', 'sod', 
-            'vote', 'present', 'entire', 'ante', 'leave', 'concur', 'entire', 'mootness', 
-            'jj', 'amici', 'sup', 'rep', 'stat', 'like', 'rev', 'trans', 'vii', 'erisa', 
-            'usca', 'lead', 'cf', 'cca', 'fsupp', 'afdc', 'amicus', 'ante', 'pd', 'aver', 
-            'may', 'argued', 'argue', 'decide', 'rptr', 'pp', 'fd', 'june', 'july', 
-            'august', 'september', 'october', 'november', 'ca', 'certiorari', 
-            'december', 'january', 'february', 'march', 'april', 'writ', 'footnote', 
-            'member', 'curiam', 'usc', 'file'
-        ]
-        
-        # Only include most common names to avoid being too aggressive
-        if names:
-            # Get only very common names to avoid removing too much
-            common_male_names = ['john', 'james', 'robert', 'michael', 'william', 'david', 'richard', 'thomas']
-            common_female_names = ['mary', 'patricia', 'jennifer', 'linda', 'elizabeth', 'barbara', 'susan', 'jessica']
-            all_names = common_male_names + common_female_names
-        else:
-            all_names = []
-        
-        # Reduced state names list (only abbreviations to avoid removing content)
-        state_abbrevs = [
-            'al', 'ak', 'az', 'ar', 'ca', 'co', 'ct', 'de', 'fl', 'ga', 'hi', 'id', 'il', 'in', 
-            'ia', 'ks', 'ky', 'la', 'me', 'md', 'ma', 'mi', 'mn', 'ms', 'mo', 'mt', 'ne', 'nv', 
-            'nh', 'nj', 'nm', 'ny', 'nc', 'nd', 'oh', 'ok', 'or', 'pa', 'ri', 'sc', 'sd', 'tn', 
-            'tx', 'ut', 'vt', 'va', 'wa', 'wv', 'wi', 'wy'
-        ]
-        
-        self.STOPLIST = basic_stopwords.union(set(legal_stopwords + all_names + state_abbrevs))
+        self.STOPLIST = legal_stoplist(nlp_data_dir=self.nlp_data_dir, download=self.download_nlp_data)
         logger.info(f"Created stopwords list with {len(self.STOPLIST)} terms")
     
-    def beautiful_soup_grabber(self, link: str, max_retries: int = 3) -> BeautifulSoup:
+    def _rate_limit(self, link: str):
+        """Wait for the per-host token bucket before issuing a request"""
+        host = urlparse(link).netloc
+        with self._rate_limiters_lock:
+            bucket = self._rate_limiters.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second)
+                self._rate_limiters[host] = bucket
+        bucket.acquire()
+    
+    def _fetch(self, link: str, max_retries: int = 3, revalidate: bool = False) -> Optional[requests.Response]:
         """
-        Get BeautifulSoup object from URL with retry logic
+        Fetch a URL with rate limiting and retry logic, returning the response or None
+        
+        Fresh cached responses are returned without a request; stale ones (or
+        any cached response when revalidate=True) are revalidated with a
+        conditional request and reused on 304 Not Modified.
+        """
+        return self._fetch_with_status(link, max_retries=max_retries, revalidate=revalidate)[0]
+    
+    @staticmethod
+    def _is_permanent_error(http_status: Optional[int]) -> bool:
+        """HTTP errors that retrying will not fix: 4xx other than 429 Too Many Requests"""
+        return http_status is not None and 400 <= http_status < 500 and http_status != 429
+    
+    def _fetch_with_status(self, link: str, max_retries: int = 3,
+                           revalidate: bool = False) -> Tuple[Optional[requests.Response], Optional[int]]:
+        """
+        _fetch, also returning the HTTP status of a failed fetch (None if there was no response)
+        
+        Permanent errors (see _is_permanent_error) are not retried.
         """
+        cached = self.http_cache.lookup(link) if self.http_cache else None
+        if cached is not None and not revalidate and self.http_cache.is_fresh(cached):
+            response = self.http_cache.load(cached)
+            if response is not None:
+                return response, None
+            cached = None
+        request_headers = HttpCache.conditional_headers(cached) if cached is not None else {}
+        
+        http_status = None
         for attempt in range(max_retries):
             try:
-                response = requests.get(link, headers=self.headers, timeout=10)
+                self._rate_limit(link)
+                response = self.session.get(link, timeout=10, headers=request_headers)
+                self._count_fetch(http_requests=1, bytes_fetched=len(response.content))
+                if response.status_code == 304 and cached is not None:
+                    cached_response = self.http_cache.load(cached, revalidated=True)
+                    if cached_response is not None:
+                        return cached_response, None
+                    # The cached body went away after revalidation; fetch it in full
+                    cached, request_headers = None, {}
+                    self._rate_limit(link)
+                    response = self.session.get(link, timeout=10)
+                    self._count_fetch(http_requests=1, bytes_fetched=len(response.content))
                 response.raise_for_status()
-                return BeautifulSoup(response.text, "lxml")
+                if self.http_cache:
+                    self.http_cache.store(link, response)
+                return response, None
             except requests.exceptions.RequestException as e:
+                http_status = e.response.status_code if e.response is not None else None
+                if self._is_permanent_error(http_status):
+                    self._count_fetch(failed_fetches=1)
+                    logger.error(f"Failed to fetch {link}: HTTP {http_status}, not retrying")
+                    return None, http_status
                 logger.warning(f"Attempt {attempt + 1} failed for {link}: {e}")
                 if attempt < max_retries - 1:
+                    self._count_fetch(retries=1)
                     time.sleep(2 ** attempt)  # Exponential backoff
                 else:
+                    self._count_fetch(failed_fetches=1)
                     logger.error(f"Failed to fetch {link} after {max_retries} attempts")
-                    return None
+                    return None, http_status
+        return None, http_status
     
-    def step1_get_case_urls(self) -> pd.DataFrame:
+    def beautiful_soup_grabber(self, link: str, max_retries: int = 3, revalidate: bool = False) -> BeautifulSoup:
+        """
+        Get BeautifulSoup object from URL with retry logic
+        """
+        response = self._fetch(link, max_retries=max_retries, revalidate=revalidate)
+        if response is None:
+            return None
+        return bs4.BeautifulSoup(response.text, "lxml")
+    
+    def _stage_artifacts(self, stage: str) -> Tuple[List[Path], List[Path]]:
+        """Input and output artifacts of a pipeline stage, as fingerprinted by the stage cache"""
+        store_path = self.store.path
+        artifacts = {
+            'step1_get_case_urls': ([], [store_path("supcourt_yearlist"),
+                                     self.data_dir / "supcourt_year_manifest.json"]),
+            'step2_extract_case_text': ([store_path("supcourt_yearlist")], [store_path("full_proj_preproc")]),
+            'dedupe_cases': ([store_path("full_proj_preproc")],
+                             [store_path("full_proj_dedup"), self.data_dir / "duplicate_cases.csv",
+                              self.data_dir / "dedup_signatures.npz"]),
+            'step3_preprocess_text': ([store_path(self._case_text_stage())],
+                                      [store_path("full_proj_lemmatized"), self.data_dir / "token_corpus"]),
+            'step4_topic_modeling': (
+                [store_path("full_proj_lemmatized")],
+                [store_path("topic_modeled_cases"), self.data_dir / "topic_words.json",
+                 self.data_dir / "doc_topic_matrix.npy", self.data_dir / "doc_topic_top_k.npz",
+                 self.data_dir / "topic_model"]),
+            'step5_prepare_visualization_data': (
+                [store_path("topic_modeled_cases"), self.data_dir / "topic_words.json", store_path("full_proj_preproc")],
+                [self.data_dir / "visualization_data.csv", self.data_dir / "yearly_totals.csv",
+                 self.data_dir / "viz"]),
+        }
+        return artifacts[stage]
+    
+    def _case_text_stage(self) -> str:
+        """Stage output step 3 reads case text from"""
+        return "full_proj_dedup" if self.dedupe else "full_proj_preproc"
+    
+    def _stage_is_current(self, stage: str, params: Dict) -> bool:
+        """True if the stage cache shows stage already ran on these inputs with these parameters"""
+        if self.stage_cache is None:
+            return False
+        inputs, outputs = self._stage_artifacts(stage)
+        if not self.stage_cache.is_current(stage, self.stage_cache.key(stage, inputs, params), outputs):
+            return False
+        logger.info(f"{stage} is up to date (inputs and parameters unchanged); reusing saved outputs")
+        return True
+    
+    def _record_stage(self, stage: str, params: Dict):
+        """Record a completed stage in the stage cache"""
+        if self.stage_cache is None:
+            return
+        inputs, outputs = self._stage_artifacts(stage)
+        self.stage_cache.record(stage, self.stage_cache.key(stage, inputs, params), outputs, params)
+    
+    def _crawl_params(self) -> Dict:
+        params = {'start_year': self.start_year, 'end_year': self.end_year, 'root_url': self.root_url}
+        if self.shard_count > 1:
+            params['shard'] = [self.shard_index, self.shard_count]
+        return params
+    
+    def _scan_year_page(self, year_url: str, revalidate: bool = False) -> Tuple[Optional[Dict[str, str]], float]:
+        """Fetch one year index page and extract its case links; None if the fetch failed"""
+        started = time.perf_counter()
+        response = self._fetch(year_url, revalidate=revalidate)
+        cases = extract_case_links(response.content) if response is not None else None
+        return cases, time.perf_counter() - started
+    
+    @profiled_stage()
+    def step1_get_case_urls(self, rescan_recent_years: int = 0, max_workers: Optional[int] = None) -> pd.DataFrame:
         """
         Step 1: Scrape Supreme Court case URLs and metadata
+        
+        Year pages are fetched concurrently by a bounded thread pool; request
+        rate is capped per host by the same token bucket as step 2. Year pages
+        already recorded in the fetch ledger are not fetched again, except for
+        the latest `rescan_recent_years` years of the range, which may have
+        gained cases since they were scanned. If such a rescan fails, the
+        cases found by the earlier scan are kept.
+        
+        Besides the case list, writes supcourt_year_manifest.json with each
+        year's page URL, status, case count and fetch time.
         """
         logger.info("Step 1: Collecting case URLs from Supreme Court archives...")
         
-        root_url = "http://caselaw.findlaw.com/court/us-supreme-court/years/"
-        years = [root_url + str(year) for year in range(self.start_year, self.end_year + 1)]
+        root_url = self.root_url
+        max_workers = max_workers or self.max_workers
+        year_urls = {year: root_url + str(year) for year in range(self.start_year, self.end_year + 1)}
         
         case_data = {}
         
-        for i, year_url in enumerate(years):
-            if i % 10 == 0:
-                logger.info(f"Processing year {self.start_year + i}/{self.end_year}")
-            
-            # Debug: show what URL we're trying to access
-            logger.debug(f"Fetching: {year_url}")
-            
-            soup = self.beautiful_soup_grabber(year_url)
-            if not soup:
-                logger.warning(f"Failed to get soup for {year_url}")
-                continue
-            
-            # New approach: look for the actual case links in the modern structure
-            # Based on the screenshot, cases are in links that go to /us-supreme-court/
-            links = soup.findAll("a")
-            logger.debug(f"Found {len(links)} total links on {year_url}")
-            
-            year_case_count = 0
-            for link in links:
-                href = link.get("href", "")
-                
-                # New pattern: look for links that contain /us-supreme-court/ and have case numbers
-                # Example from screenshot: should match links to actual cases, not years pages
-                if href and "/us-supreme-court/" in href and "/years/" not in href:
-                    # Additional check: make sure it's not a navigation link
-                    if not href.startswith("https://www.findlaw.com/") or "/us-supreme-court/" in href:
-                        # Extract case number from URL (last part before .html)
-                        url_parts = href.rstrip('/').split('/')
-                        if url_parts:
-                            last_part = url_parts[-1].replace('.html', '')
-                            # Extract numbers for docket
-                            docket = re.sub("[^0-9-]", "", last_part)
-                            
-                            if docket:  # Only add if we found a docket number
-                                case_data[href] = docket
-                                year_case_count += 1
-                                
-                                # Debug: show first few matches
-                                if year_case_count <= 3:
-                                    case_title = link.get_text(strip=True)[:50]
-                                    logger.debug(f"  Match {year_case_count}: {href} -> docket {docket} | {case_title}")
-            
-            logger.info(f"  Year {self.start_year + i}: found {year_case_count} cases")
-            
-            # Be nice to the server
-            time.sleep(0.5)
+        # Year pages already scanned in a previous (possibly interrupted) run
+        scanned_before = self.ledger.completed_years()
+        rescan_from = self.end_year - max(rescan_recent_years, 0) + 1
+        completed_years = {year: count for year, count in scanned_before.items() if year < rescan_from}
+        if completed_years:
+            logger.info(f"Resuming: {len(completed_years)} year pages already scanned")
+        
+        pending_years = [year for year in year_urls if year not in completed_years]
+        logger.info(f"Scanning {len(pending_years)} year pages with {max_workers} workers")
+        
+        # Results come back in year order and are committed to the ledger as they arrive
+        scanned = {}
+        rescan_errors = set()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            # Year pages being rescanned must not be served stale from the HTTP cache
+            scans = executor.map(lambda year: self._scan_year_page(year_urls[year], revalidate=year >= rescan_from),
+                                 pending_years)
+            for year, (year_cases, seconds) in zip(pending_years, scans):
+                if year_cases is None and year in scanned_before:
+                    # A failed rescan keeps the cases found by the last successful scan
+                    logger.warning(f"Failed to rescan year page {year_urls[year]}; "
+                                   f"keeping the {scanned_before[year]} cases found before")
+                    rescan_errors.add(year)
+                    continue
+                scanned[year] = (year_cases, seconds)
+                if year_cases is None:
+                    logger.warning(f"Failed to fetch year page {year_urls[year]}")
+                    self.ledger.record_year(year, year_urls[year], "error", {})
+                    continue
+                self.ledger.record_year(year, year_urls[year], "ok", year_cases)
+                logger.info(f"  Year {year}: found {len(year_cases)} cases")
+        
+        manifest = []
+        for year, year_url in year_urls.items():
+            if year in scanned:
+                year_cases, seconds = scanned[year]
+                entry = {'source': 'fetched', 'fetch_seconds': round(seconds, 3)}
+            else:
+                year_cases = self.ledger.cases_for_year(year)
+                entry = {'source': 'ledger', 'fetch_seconds': None}
+                if year in rescan_errors:
+                    entry['rescan_error'] = True
+            case_data.update(year_cases or {})
+            manifest.append({'year': year, 'url': year_url, 'status': 'ok' if year_cases is not None else 'error',
+                             'case_count': len(year_cases or {}), **entry})
+        self._write_year_manifest(manifest)
         
         logger.info(f"Total cases found across all years: {len(case_data)}")
         
@@ -248,159 +2282,641 @@ class SupremeCourtTopicModeler:
                 logger.info(f"Found {len(case_containers)} potential case containers")
                 
         df = pd.DataFrame(list(case_data.items()), columns=["case_url", "docket"])
+        if self.shard_count > 1:
+            # Hash partition: keep the cases whose URL hashes to this shard (CRC32 is stable across hosts)
+            in_shard = df['case_url'].map(lambda url: zlib.crc32(url.encode("utf-8")) % self.shard_count)
+            df = df[in_shard == self.shard_index].reset_index(drop=True)
+            logger.info(f"Shard {self.shard_index} of {self.shard_count}: keeping {len(df)} of {len(in_shard)} cases")
         
         # Save intermediate result and CSV for inspection
-        output_file = self.data_dir / "supcourt_yearlist.pickle"
         csv_file = self.data_dir / "supcourt_yearlist.csv"
         
-        df.to_pickle(output_file)
+        output_file = self.store.write("supcourt_yearlist", df)
         df.to_csv(csv_file, index=False)
         
         logger.info(f"Step 1 complete. Found {len(df)} cases. Saved to {output_file} and {csv_file}")
+        self._record_stage("step1_get_case_urls", self._crawl_params())
         
         self.case_urls_df = df
         return df
     
-    def step2_extract_case_text(self, batch_size: int = 5000) -> pd.DataFrame:
+    def _write_year_manifest(self, years: List[Dict]) -> Path:
+        """Save the per-year outcome of a step 1 crawl to supcourt_year_manifest.json"""
+        manifest_file = self.data_dir / "supcourt_year_manifest.json"
+        failed = [entry['year'] for entry in years if entry['status'] != 'ok']
+        manifest = {
+            'root_url': self.root_url,
+            'start_year': self.start_year,
+            'end_year': self.end_year,
+            'total_cases': sum(entry['case_count'] for entry in years),
+            'failed_years': failed,
+            'years': years,
+        }
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        if failed:
+            logger.warning(f"{len(failed)} year pages failed to fetch; rerun step 1 to retry them")
+        return manifest_file
+    
+    def fetch_case(self, url: str) -> Tuple[str, Dict]:
+        """
+        Fetch a single case page, returning its extracted text and HTTP metadata
+        """
+        response, http_status = self._fetch_with_status(url)
+        if response is None:
+            status = 'permanent_error' if self._is_permanent_error(http_status) else 'error'
+            return "", {'status': status, 'http_status': http_status}
+        
+        meta = {
+            'status': 'ok',
+            'http_status': response.status_code,
+            'content_length': len(response.content),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'extractor': self._extractor_id(),
+        }
+        return self._extract_text(response.text, url), meta
+    
+    def _extract_text(self, page: str, url: str) -> str:
+        """Run the extraction backend on a case page, counting pages and time spent"""
+        started = time.perf_counter()
+        text = self.extractor(page, url)
+        self._count_fetch(pages_extracted=1, extraction_microseconds=int((time.perf_counter() - started) * 1e6))
+        return text
+    
+    def _extractor_params(self) -> Dict:
+        """The extraction backend's name and version, for the stage cache"""
+        extractor = self.extractor
+        return {'extractor': getattr(extractor, '__qualname__', type(extractor).__qualname__),
+                'extractor_version': getattr(extractor, 'version', None)}
+    
+    def _extractor_id(self) -> str:
+        """The extraction backend's name and version as recorded in the fetch ledger"""
+        params = self._extractor_params()
+        return f"{params['extractor']}:{params['extractor_version']}"
+    
+    def extract_case_content(self, url: str) -> str:
+        """
+        Extract case content from a single URL
+        """
+        response = self._fetch(url)
+        if response is None:
+            return ""
+        return self._extract_text(response.text, url)
+    
+    def extract_text_from_soup(self, soup: BeautifulSoup, url: str = "") -> str:
+        """
+        Extract the opinion text from a parsed case page
+        """
+        extractor = self.extractor if isinstance(self.extractor, SoupExtractor) else SoupExtractor()
+        return extractor.extract_soup(soup, url)
+    
+    def _settled_urls(self, retry_permanent_errors: bool = False) -> set:
+        """
+        Case URLs step 2 does not fetch again: ones fetched with the current
+        extractor, and permanent failures unless retrying
+        """
+        statuses = ('ok',) if retry_permanent_errors else ('ok', 'permanent_error')
+        return self.ledger.urls_with_status(*statuses) - self.ledger.stale_extractions(self._extractor_id())
+    
+    def _log_fetch_failures(self, retry_hint: str):
+        status_counts = self.ledger.status_counts()
+        if status_counts.get('error'):
+            logger.warning(f"{status_counts['error']} cases failed to fetch; {retry_hint}")
+        if status_counts.get('permanent_error'):
+            logger.warning(f"{status_counts['permanent_error']} cases failed permanently (HTTP 4xx) and are skipped; "
+                           f"pass retry_permanent_errors=True to retry them")
+    
+    def _import_temp_batches(self):
+        """Load temp_batch pickles written by older runs into the fetch ledger"""
+        fetched = self.ledger.fetched_urls()
+        for temp_file in sorted(self.data_dir.glob("temp_batch_*.pickle")):
+            batch = pd.read_pickle(temp_file)
+            results = [
+                (url, text, {'status': 'ok'})
+                for url, text in zip(batch['case_url'], batch['case_text'])
+                if url not in fetched and isinstance(text, str) and text
+            ]
+            if results:
+                self.ledger.record_fetches(results)
+                logger.info(f"Imported {len(results)} fetched cases from {temp_file.name}")
+    
+    @profiled_stage()
+    def step2_extract_case_text(self, batch_size: int = 5000, max_workers: Optional[int] = None,
+                                urls: Optional[Iterable[str]] = None,
+                                retry_permanent_errors: bool = False) -> pd.DataFrame:
         """
         Step 2: Extract full text from each case URL
+        
+        Cases are fetched concurrently by a bounded thread pool sharing one
+        connection pool; request rate is capped per host by a token bucket.
+        Every result is recorded in the fetch ledger, so cases fetched by an
+        earlier run are skipped and an interrupted run resumes where it stopped.
+        Cases that failed permanently (HTTP 4xx) are skipped too unless
+        retry_permanent_errors is set. Cases whose text came from another
+        extractor or extractor version are extracted again (from the HTTP
+        cache when it still holds the page). With urls, only those cases and
+        such stale ones are fetched; the output still covers every case.
         """
         logger.info("Step 2: Extracting full case text...")
         
         if self.case_urls_df is None:
             # Try to load from file
-            try:
-                self.case_urls_df = pd.read_pickle(self.data_dir / "supcourt_yearlist.pickle")
-            except FileNotFoundError:
+            if not self.store.exists("supcourt_yearlist"):
                 raise ValueError("No case URLs found. Run step1_get_case_urls() first.")
+            self.case_urls_df = self.store.read("supcourt_yearlist")
         
         df = self.case_urls_df.copy()
+        max_workers = max_workers or self.max_workers
         
-        def extract_case_content(url: str) -> str:
-            """Extract case content from a single URL"""
-            soup = self.beautiful_soup_grabber(url)
-            if not soup:
-                return ""
-            
-            # Try multiple selectors to find case content
-            content_selectors = [
-                "div.caselawcontent.searchable-content",
-                "div.caselawcontent", 
-                "div.searchable-content",
-                "div[class*='content']",
-                "div[class*='case']",
-                "div[class*='opinion']",
-                "div[class*='text']"
-            ]
-            
-            all_text = []
-            
-            for selector in content_selectors:
-                content_divs = soup.select(selector)
-                if content_divs:
-                    for div in content_divs:
-                        text = div.get_text(separator=' ', strip=True)
-                        if text and len(text) > 100:  # Only include substantial text
-                            all_text.append(text)
-                    break  # Use first successful selector
-            
-            # Fallback: get all paragraph text if specific selectors fail
-            if not all_text:
-                paragraphs = soup.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    if len(text) > 50:  # Only substantial paragraphs
-                        all_text.append(text)
-            
-            # Final fallback: get all text but try to clean it
-            if not all_text:
-                body_text = soup.get_text(separator=' ', strip=True)
-                if len(body_text) > 200:
-                    all_text.append(body_text)
-            
-            result = ' '.join(all_text)
-            logger.debug(f"Extracted {len(result)} characters from {url}")
-            return result
-        
-        # Process in batches to avoid overwhelming the server
-        total_cases = len(df)
-        df['case_text'] = ""
+        self._import_temp_batches()
+        settled = self._settled_urls(retry_permanent_errors)
+        pending_urls = [url for url in df['case_url'] if url not in settled]
+        if urls is not None:
+            urls = set(urls) | self.ledger.stale_extractions(self._extractor_id())
+            pending_urls = [url for url in pending_urls if url in urls]
+        extracted_before = self.run_counters()
+        total_cases = len(pending_urls)
+        logger.info(f"{len(df) - total_cases} cases already fetched or skipped, {total_cases} remaining")
         
-        for start_idx in range(0, total_cases, batch_size):
-            end_idx = min(start_idx + batch_size, total_cases)
-            logger.info(f"Processing cases {start_idx} to {end_idx} of {total_cases}")
-            
-            batch = df.iloc[start_idx:end_idx].copy()
-            batch_results = []
-            
-            for idx, row in batch.iterrows():
-                case_text = extract_case_content(row['case_url'])
-                batch_results.append(case_text)
+        # Process in batches; results are committed to the ledger as they arrive
+        commit_every = 100
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start_idx in range(0, total_cases, batch_size):
+                end_idx = min(start_idx + batch_size, total_cases)
+                logger.info(f"Processing cases {start_idx} to {end_idx} of {total_cases} "
+                            f"with {max_workers} workers")
                 
-                # Progress indicator and rate limiting
-                if (idx - start_idx) % 100 == 0:
-                    logger.info(f"  Processed {idx - start_idx} cases in current batch")
-                time.sleep(0.2)  # Rate limiting
-            
-            # Update the main dataframe
-            df.loc[start_idx:end_idx-1, 'case_text'] = batch_results
-            
-            # Save intermediate results
-            temp_file = self.data_dir / f"temp_batch_{start_idx}_{end_idx}.pickle"
-            df.iloc[start_idx:end_idx].to_pickle(temp_file)
+                batch_urls = pending_urls[start_idx:end_idx]
+                pending_results = []
+                
+                # executor.map yields results in submission order
+                for i, (url, (case_text, meta)) in enumerate(
+                        zip(batch_urls, executor.map(self.fetch_case, batch_urls))):
+                    pending_results.append((url, case_text, meta))
+                    if len(pending_results) >= commit_every:
+                        self.ledger.record_fetches(pending_results)
+                        pending_results = []
+                    
+                    # Progress indicator
+                    if i % 100 == 0:
+                        logger.info(f"  Processed {i} cases in current batch")
+                
+                if pending_results:
+                    self.ledger.record_fetches(pending_results)
+        
+        extracted = self.run_counters()
+        pages = extracted['pages_extracted'] - extracted_before['pages_extracted']
+        microseconds = extracted['extraction_microseconds'] - extracted_before['extraction_microseconds']
+        if pages:
+            hits = getattr(self.extractor, 'selector_hits', {})
+            logger.info(f"Extracted text from {pages} pages in {microseconds / 1e6:.2f}s "
+                        f"({microseconds / 1e3 / pages:.2f} ms/page); rules used: {dict(hits)}")
+        
+        self._log_fetch_failures("rerun step 2 to retry them")
+        
+        # Assemble the corpus from the ledger, one row group at a time
+        def case_frames():
+            for start in range(0, len(df), self.store.row_group_size):
+                chunk = df.iloc[start:start + self.store.row_group_size].copy()
+                texts = self.ledger.case_texts(chunk['case_url'].tolist())
+                chunk['case_text'] = chunk['case_url'].map(texts).fillna("")
+                yield chunk
         
         # Save final result
-        output_file = self.data_dir / "full_proj_preproc.pickle"
-        df.to_pickle(output_file)
+        output_file = self.store.write_frames("full_proj_preproc", case_frames())
         logger.info(f"Step 2 complete. Saved to {output_file}")
+        self._record_stage("step2_extract_case_text", self._extractor_params())
+        
+        if self.store.columnar:
+            # Leave the text on disk; step 3 streams it back in batches
+            self.full_cases_df = None
+            return df
         
+        df = self.store.read("full_proj_preproc")
         self.full_cases_df = df
         return df
     
-    def tokenize_text(self, text: str) -> List[str]:
+    @profiled_stage()
+    def stream_cases(self, batch_size: int = 1000, max_workers: Optional[int] = None, n_jobs: Optional[int] = None,
+                     queue_size: int = 4, retry_permanent_errors: bool = False) -> pd.DataFrame:
         """
-        Tokenize and clean text using spaCy if available, otherwise basic processing
+        Steps 2 and 3 as one streaming pass
+        
+        A fetch thread downloads case pages (max_workers threads, at most two
+        batches of batch_size cases in flight) and queues them in corpus
+        order. The calling thread tokenizes each batch, in a persistent pool
+        of n_jobs worker processes when n_jobs > 1, and adds it to the
+        token-ID corpus step 4 vectorizes from, while a writer thread saves
+        the case text. The queues hold at most queue_size batches and block
+        the stage feeding them when full, so memory stays at a few batches
+        (with columnar storage) and tokenizing overlaps with fetching: the
+        pass takes about as long as the slower of the two.
+        
+        Produces the same full_proj_preproc, full_proj_lemmatized and
+        token_corpus outputs as steps 2 and 3, and records fetches in the
+        ledger (skipping permanent failures and re-extracting pages from
+        another extractor) like step 2. Near-duplicate merging (dedupe_cases)
+        needs the whole corpus before tokenizing and is not applied.
         """
-        if not text or not isinstance(text, str):
-            return []
+        logger.info("Streaming steps 2 and 3: fetching, tokenizing and indexing case text...")
         
-        # Basic cleaning
-        separators = ["\xa0\xa0\xa0\xa0", "\r", "\n", "\t", "n't", "'m", "'ll", '[^a-z ]']
-        clean_text = text.lower()
-        for sep in separators:
-            clean_text = re.sub(sep, " ", clean_text)
+        if self.case_urls_df is None:
+            if not self.store.exists("supcourt_yearlist"):
+                raise ValueError("No case URLs found. Run step1_get_case_urls() first.")
+            self.case_urls_df = self.store.read("supcourt_yearlist")
+        if self.dedupe:
+            logger.warning("Near-duplicate merging needs the whole corpus and is skipped in streaming mode")
         
-        if parser:
-            # Use spaCy for better tokenization and lemmatization
-            tokens = parser(clean_text)
-            tokens = [tok.lemma_.strip() for tok in tokens if tok.lemma_.strip()]
-        else:
-            # Fallback to simple tokenization
-            tokens = clean_text.split()
+        df = self.case_urls_df.copy()
+        max_workers = max_workers or self.max_workers
+        n_jobs = n_jobs or self.n_jobs
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
         
-        # Apply stoplist and length filtering
-        final_tokens = [tok for tok in tokens if len(tok) > 1 and tok not in self.STOPLIST]
+        self._import_temp_batches()
+        fetched = self._settled_urls(retry_permanent_errors)
+        logger.info(f"{sum(url in fetched for url in df['case_url'])} of {len(df)} cases already fetched or skipped")
         
-        return final_tokens
+        fetched_batches = queue.Queue(maxsize=queue_size)
+        text_batches = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        errors = []
+        waits = Counter()
+        
+        def put(target, item, stage):
+            """Blocking put that gives up once another stage has failed"""
+            started = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    waits[stage] += time.perf_counter() - started
+                    return
+                except queue.Full:
+                    pass
+            raise RuntimeError("Streaming stopped after a failure in another stage")
+        
+        def drain(source, stage):
+            """Items from a queue up to the end-of-stream marker (None)"""
+            while True:
+                started = time.perf_counter()
+                while True:
+                    try:
+                        item = source.get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        if stop.is_set():
+                            raise RuntimeError("Streaming stopped after a failure in another stage")
+                waits[stage] += time.perf_counter() - started
+                if item is None:
+                    return
+                yield item
+        
+        def start_thread(name, target):
+            def run():
+                try:
+                    target()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            thread = threading.Thread(target=run, name=name, daemon=True)
+            thread.start()
+            return thread
+        
+        def fetch_batches():
+            """Producer: fetch pages missing from the ledger and queue the cases in batches"""
+            def finish(batch, futures):
+                results = [(url, *future.result()) for url, future in futures.items()]
+                if results:
+                    self.ledger.record_fetches(results)
+                texts = self.ledger.case_texts(batch['case_url'].tolist())
+                batch['case_text'] = batch['case_url'].map(texts).fillna("")
+                put(fetched_batches, batch, 'fetch_blocked')
+            
+            in_flight = deque()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for start in range(0, len(df), batch_size):
+                    batch = df.iloc[start:start + batch_size].copy()
+                    futures = {url: executor.submit(self.fetch_case, url)
+                               for url in batch['case_url'] if url not in fetched}
+                    in_flight.append((batch, futures))
+                    if len(in_flight) > 1:
+                        finish(*in_flight.popleft())
+                while in_flight:
+                    finish(*in_flight.popleft())
+            put(fetched_batches, None, 'fetch_blocked')
+        
+        output = {}
+        
+        def write_case_text():
+            output['full_proj_preproc'] = self.store.write_frames("full_proj_preproc",
+                                                                  drain(text_batches, 'write_waiting'))
+        
+        token_corpus = TokenCorpusBuilder()
+        counts = Counter()
+        
+        def processed_frames(pool):
+            for batch in drain(fetched_batches, 'tokenize_waiting'):
+                put(text_batches, batch, 'tokenize_blocked')
+                counts['cases'] += len(batch)
+                processed = self._preprocess_cases(batch[['case_url', 'docket', 'case_text']].copy(),
+                                                   require_documents=False, n_jobs=n_jobs,
+                                                   log_samples=counts['documents'] == 0, executor=pool)
+                counts['documents'] += len(processed)
+                token_corpus.add_documents(processed['processed_text'])
+                logger.info(f"  Streamed {counts['cases']} of {len(df)} cases")
+                yield self._lemmatized_frame(processed)
+        
+        # A persistent pool, so worker processes are not restarted for every batch
+        use_pool = n_jobs > 1
+        threads = [start_thread("stream-fetch", fetch_batches), start_thread("stream-write", write_case_text)]
+        try:
+            with self._tokenizer_pool(n_jobs) if use_pool else nullcontext() as pool:
+                output['full_proj_lemmatized'] = self.store.write_frames("full_proj_lemmatized",
+                                                                         processed_frames(pool))
+            put(text_batches, None, 'tokenize_blocked')
+            threads[1].join()
+        except BaseException:
+            # A failure in the fetch or writer thread surfaces here as "streaming stopped"; report the cause
+            failed = list(errors)
+            stop.set()
+            if failed:
+                raise failed[0]
+            raise
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+        
+        token_corpus_dir = token_corpus.build(source=self._lemmatized_source()).save(self.data_dir / "token_corpus")
+        logger.info(f"Saved token-ID corpus ({len(token_corpus.index)} distinct tokens) to {token_corpus_dir}")
+        if counts['documents'] == 0:
+            raise ValueError("No documents remain after preprocessing. Check text extraction and stop words list.")
+        
+        self._log_fetch_failures("rerun to retry them")
+        logger.info(f"Streaming complete. {counts['documents']} of {counts['cases']} cases preprocessed. "
+                    f"Tokenizer waited {waits['tokenize_waiting']:.1f}s for pages, fetcher waited "
+                    f"{waits['fetch_blocked']:.1f}s on a full queue. Saved to {output['full_proj_preproc']} "
+                    f"and {output['full_proj_lemmatized']}")
+        self._record_stage("step2_extract_case_text", self._extractor_params())
+        if not self.dedupe:
+            self._record_stage("step3_preprocess_text", {**self._tokenizer_params(), 'columnar': self.store.columnar})
+        
+        self.full_cases_df = None
+        self.processed_df = self.store.read("full_proj_lemmatized")
+        return self.processed_df
     
-    def step3_preprocess_text(self) -> pd.DataFrame:
+    @profiled_stage()
+    def dedupe_cases(self, threshold: float = 0.8, shingle_size: int = 5, num_perm: int = 128, bands: int = 16,
+                     boilerplate_fraction: float = 0.2, sample_size: int = 2000,
+                     batch_size: int = 1000, incremental: bool = False) -> pd.DataFrame:
         """
-        Step 3: Clean and preprocess case text
+        Deduplication stage between steps 2 and 3
+        
+        Word shingles that occur on more than boilerplate_fraction of pages
+        (estimated from an evenly spaced sample of sample_size pages) are
+        treated as navigation/ad boilerplate: they are left out of the MinHash
+        signatures and the words they cover are stripped from the text.
+        Cases are then clustered with MinHash LSH (see lsh_clusters) and only
+        the first case of each cluster of near-duplicates (estimated Jaccard
+        similarity >= threshold) is kept.
+        
+        Writes full_proj_dedup (read by step 3 when dedupe is enabled) and
+        duplicate_cases.csv, mapping every dropped case_url to the case_url
+        it was merged into. case_text keeps the page text as extracted; the
+        text with boilerplate removed is the clean_text column (missing for
+        pages without boilerplate), which step 3 tokenizes.
+        
+        The signatures, clusters and boilerplate shingles are saved to
+        dedup_signatures.npz. With incremental=True only cases missing from
+        it are hashed, with the saved boilerplate, and clustered against the
+        saved representatives, which are all kept.
         """
-        logger.info("Step 3: Preprocessing text...")
+        logger.info("Deduplicating case text...")
+        if not self.store.exists("full_proj_preproc"):
+            raise ValueError("No case text found. Run step2_extract_case_text() first.")
         
-        if self.full_cases_df is None:
-            # Try to load from file
-            try:
-                self.full_cases_df = pd.read_pickle(self.data_dir / "full_proj_preproc.pickle")
-            except FileNotFoundError:
-                raise ValueError("No case text found. Run step2_extract_case_text() first.")
+        stage_params = {'threshold': threshold, 'shingle_size': shingle_size, 'num_perm': num_perm, 'bands': bands,
+                        'boilerplate_fraction': boilerplate_fraction, 'sample_size': sample_size,
+                        'text_column': 'clean_text'}
+        result_columns = ['case_url', 'docket', 'n_merged']
+        if self._stage_is_current("dedupe_cases", stage_params):
+            return self.store.read("full_proj_dedup", columns=result_columns if self.store.columnar else None)
+        
+        def case_words(batch):
+            return [_clean_text(text).split() if isinstance(text, str) else [] for text in batch['case_text']]
+        
+        text_columns = ['case_url', 'docket', 'case_text']
+        n_docs = self.store.num_rows("full_proj_preproc")
+        state = self._load_dedupe_state(stage_params) if incremental else None
+        if incremental and state is None:
+            logger.info("No saved dedupe signatures for these settings; deduplicating the whole corpus")
+        
+        if state is not None:
+            boilerplate = state['boilerplate']
+            known = {url: j for j, url in enumerate(state['case_url'])}
+        else:
+            # Boilerplate: shingles shared by a large fraction of a sample of pages
+            step = max(1, n_docs // sample_size)
+            sampled = []
+            offset = 0
+            for batch in self.store.iter_batches("full_proj_preproc", columns=['case_text'], batch_size=batch_size):
+                picks = [i - offset for i in range(-(-offset // step) * step, offset + len(batch), step)]
+                sampled.extend(np.unique(shingle_hashes(words, shingle_size)) for words in case_words(batch.iloc[picks]))
+                offset += len(batch)
+            boilerplate = np.zeros(0, dtype=np.uint64)
+            if sampled:
+                shingles, page_counts = np.unique(np.concatenate(sampled), return_counts=True)
+                boilerplate = shingles[(page_counts > boilerplate_fraction * len(sampled)) & (page_counts >= 3)]
+            logger.info(f"Found {len(boilerplate)} boilerplate shingles in a sample of {len(sampled)} pages")
+            known = {}
+        
+        def is_boilerplate(shingles):
+            if len(boilerplate) == 0:
+                return np.zeros(len(shingles), dtype=bool)
+            # boilerplate is sorted (np.unique), so a binary search beats np.isin's per-call sort
+            return boilerplate[np.minimum(np.searchsorted(boilerplate, shingles), len(boilerplate) - 1)] == shingles
+        
+        # MinHash signatures of what remains of each page; saved ones are reused
+        hasher = MinHasher(num_perm=num_perm)
+        signatures = np.empty((n_docs, num_perm), dtype=np.uint32)
+        has_text = np.zeros(n_docs, dtype=bool)
+        has_boilerplate = np.zeros(n_docs, dtype=bool)
+        saved_row = np.full(n_docs, -1)
+        urls = []
+        offset = 0
+        for batch in self.store.iter_batches("full_proj_preproc", columns=['case_url', 'case_text'],
+                                             batch_size=batch_size):
+            rows = np.arange(offset, offset + len(batch))
+            saved_row[rows] = [known.get(url, -1) for url in batch['case_url']]
+            new = saved_row[rows] < 0
+            for i, words in zip(rows[new], case_words(batch[new])):
+                shingles = shingle_hashes(words, shingle_size)
+                shared = is_boilerplate(shingles)
+                has_boilerplate[i] = shared.any()
+                has_text[i] = not shared.all()
+                signatures[i] = hasher.signature(shingles[~shared])
+            urls.extend(batch['case_url'])
+            offset += len(batch)
+        urls = np.array(urls, dtype=object)
+        
+        reused = saved_row >= 0
+        fixed = np.zeros(n_docs, dtype=bool)
+        if state is not None:
+            source = saved_row[reused]
+            signatures[reused] = state['signatures'][source]
+            has_text[reused] = state['has_text'][source]
+            has_boilerplate[reused] = state['has_boilerplate'][source]
+            # Saved representatives stay kept; saved duplicates keep their assignment
+            fixed[reused] = state['representative'][source] == source
+            logger.info(f"Reusing saved signatures of {reused.sum()} cases, hashing {n_docs - reused.sum()} new ones")
+        
+        representative, similarity = lsh_clusters(signatures, bands=bands, threshold=threshold,
+                                                  valid=has_text & (fixed | ~reused), fixed=fixed)
+        if state is not None:
+            position = {url: i for i, url in enumerate(urls)}
+            for i in np.flatnonzero(reused & ~fixed):
+                j = saved_row[i]
+                representative[i] = position.get(state['case_url'][state['representative'][j]], i)
+                similarity[i] = state['similarity'][j] if representative[i] != i else 1.0
+        n_merged = np.bincount(representative, minlength=n_docs) - 1
+        keep = representative == np.arange(n_docs)
+        duplicates = pd.DataFrame({'case_url': urls[~keep], 'kept_url': urls[representative[~keep]],
+                                   'similarity': similarity[~keep].round(3)})
+        duplicates.to_csv(self.data_dir / "duplicate_cases.csv", index=False)
+        
+        # Cleaned text of pages stripped by the previous run, so they are not hashed again
+        previous_clean = {}
+        if state is not None and self.store.exists("full_proj_dedup"):
+            for batch in self.store.iter_batches("full_proj_dedup", columns=['case_url', 'clean_text']):
+                batch = batch[batch['clean_text'].notna()]
+                previous_clean.update(zip(batch['case_url'], batch['clean_text']))
         
-        df = self.full_cases_df.copy()
+        def strip_boilerplate(text):
+            words = _clean_text(text).split()
+            shared = is_boilerplate(shingle_hashes(words, shingle_size)).astype(int)
+            covered = np.convolve(shared, np.ones(min(shingle_size, len(words)), dtype=int))[:len(words)] > 0
+            return ' '.join(compress(words, (~covered).tolist()))
         
+        def deduplicated_frames():
+            offset = 0
+            for batch in self.store.iter_batches("full_proj_preproc", columns=text_columns, batch_size=batch_size):
+                rows = np.arange(offset, offset + len(batch))
+                offset += len(batch)
+                batch = batch[keep[rows]].copy()
+                rows = rows[keep[rows]]
+                stripped = has_boilerplate[rows]
+                clean_text = pd.Series(None, index=batch.index, dtype=object)
+                clean_text[stripped] = [
+                    previous_clean[url] if url in previous_clean else strip_boilerplate(text)
+                    for url, text in zip(batch.loc[stripped, 'case_url'], batch.loc[stripped, 'case_text'])]
+                batch['clean_text'] = clean_text
+                batch['n_merged'] = n_merged[rows]
+                yield batch
+        
+        output_file = self.store.write_frames("full_proj_dedup", deduplicated_frames())
+        self._save_dedupe_state(stage_params, urls, signatures, has_text, has_boilerplate, representative,
+                                similarity, boilerplate)
+        logger.info(f"Deduplication complete. Kept {keep.sum()} of {n_docs} cases, merged {len(duplicates)} "
+                    f"near-duplicates, stripped boilerplate from {has_boilerplate[keep].sum()} cases. "
+                    f"Saved to {output_file}")
+        self._record_stage("dedupe_cases", stage_params)
+        
+        if self.store.columnar:
+            self.full_cases_df = None
+            return self.store.read("full_proj_dedup", columns=result_columns)
+        self.full_cases_df = self.store.read("full_proj_dedup")
+        return self.full_cases_df
+    
+    def _save_dedupe_state(self, params: Dict, urls: np.ndarray, signatures: np.ndarray, has_text: np.ndarray,
+                           has_boilerplate: np.ndarray, representative: np.ndarray, similarity: np.ndarray,
+                           boilerplate: np.ndarray):
+        """Save what incremental dedupe_cases runs reuse: signatures, clusters and boilerplate shingles"""
+        path = self.data_dir / "dedup_signatures.npz"
+        tmp_path = path.with_name("dedup_signatures.tmp.npz")
+        np.savez(tmp_path, params=np.array(json.dumps(params, sort_keys=True)), case_url=urls.astype(str),
+                 signatures=signatures, has_text=has_text, has_boilerplate=has_boilerplate,
+                 representative=representative, similarity=similarity, boilerplate=boilerplate)
+        os.replace(tmp_path, path)
+    
+    def _load_dedupe_state(self, params: Dict) -> Optional[Dict[str, np.ndarray]]:
+        """The saved dedupe state, or None if it is missing or was built with other settings"""
+        path = self.data_dir / "dedup_signatures.npz"
+        if not path.exists():
+            return None
+        with np.load(path) as saved:
+            state = dict(saved)
+        if str(state.pop('params')) != json.dumps(params, sort_keys=True):
+            return None
+        return state
+    
+    def _make_tokenizer(self, tokenizer):
+        """Resolve the tokenizer setting to a callable"""
+        return make_tokenizer(tokenizer, self.STOPLIST, min_length=self.min_token_length)
+    
+    def _tokenizer_params(self) -> Dict:
+        """Everything about the tokenizer that changes step 3 output, for the stage cache"""
+        tokenizer = self.tokenizer
+        params = {'tokenizer': getattr(tokenizer, '__qualname__', type(tokenizer).__qualname__)}
+        stoplist = getattr(tokenizer, 'stoplist', None)
+        if stoplist is not None:
+            params['stoplist'] = hashlib.sha256("\n".join(sorted(stoplist)).encode("utf-8")).hexdigest()
+        if hasattr(tokenizer, 'min_length'):
+            params['min_length'] = tokenizer.min_length
+        nlp = load_spacy_pipeline() if isinstance(tokenizer, SpacyTokenizer) else None
+        if nlp:
+            params['spacy_model'] = f"{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+        return params
+    
+    def tokenize_text(self, text: str) -> List[str]:
+        """
+        Tokenize and clean text using spaCy if available, otherwise basic processing
+        """
+        return self.tokenizer(text)
+    
+    def _tokenize_series(self, texts: pd.Series, n_jobs: int = 1, chunk_size: int = 32,
+                         executor: Optional[ProcessPoolExecutor] = None) -> List[List[str]]:
+        """
+        Tokenize a series of documents, spreading chunks across worker processes when n_jobs > 1
+        
+        Results come back in input order and are identical to the serial path.
+        Tokenizers with a tokenize_batch method (spaCy) batch documents themselves instead.
+        executor is an already running pool (see _tokenizer_pool) to use instead of starting one.
+        """
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        if hasattr(self.tokenizer, "tokenize_batch") and self.spacy_batch_size > 1:
+            logger.info(f"Tokenizing in batches of {self.spacy_batch_size} using {n_jobs} process(es)")
+            return self.tokenizer.tokenize_batch(texts.tolist(), n_jobs=n_jobs, batch_size=self.spacy_batch_size,
+                                                 executor=executor)
+        n_jobs = min(n_jobs, max(1, len(texts) // chunk_size))
+        if n_jobs <= 1:
+            return [self.tokenize_text(text) for text in texts]
+        
+        logger.info(f"Tokenizing with {n_jobs} worker processes in chunks of {chunk_size} documents")
+        text_list = texts.tolist()
+        chunks = (text_list[i:i + chunk_size] for i in range(0, len(text_list), chunk_size))
+        tokenized = []
+        with nullcontext(executor) if executor is not None else self._tokenizer_pool(n_jobs) as pool:
+            for chunk_tokens in pool.map(_tokenize_chunk, chunks):
+                tokenized.extend(chunk_tokens)
+        return tokenized
+    
+    def _tokenizer_pool(self, n_jobs: int) -> ProcessPoolExecutor:
+        """Worker processes that each hold a copy of the tokenizer, for _tokenize_chunk and _tokenize_batch_chunk"""
+        return ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_tokenize_worker, initargs=(self.tokenizer,))
+    
+    def _preprocess_cases(self, df: pd.DataFrame, require_documents: bool = True, n_jobs: Optional[int] = None,
+                          log_samples: bool = True, executor: Optional[ProcessPoolExecutor] = None,
+                          text_column: str = 'case_text') -> pd.DataFrame:
+        """
+        Filter, tokenize and clean a frame of cases with a text_column column ('case_text' by default)
+        """
         # Debug: check text extraction quality
         logger.info("Analyzing extracted text quality...")
-        df['text_length'] = df['case_text'].str.len()
+        df['text_length'] = df[text_column].str.len()
         logger.info(f"Text length stats: mean={df['text_length'].mean():.0f}, "
                    f"median={df['text_length'].median():.0f}, "
                    f"min={df['text_length'].min()}, max={df['text_length'].max()}")
@@ -412,17 +2928,20 @@ class SupremeCourtTopicModeler:
         logger.info(f"Removed {initial_count - len(df)} documents shorter than {min_length} characters")
         
         if len(df) == 0:
+            if not require_documents:
+                return df
             raise ValueError("No documents remain after filtering short texts. Check text extraction.")
         
         # Sample some documents for debugging
-        logger.info("Sample extracted text:")
-        for i in range(min(3, len(df))):
-            sample_text = df.iloc[i]['case_text'][:200]
+        if log_samples:
+            logger.info("Sample extracted text:")
+        for i in range(min(3, len(df)) if log_samples else 0):
+            sample_text = df.iloc[i][text_column][:200]
             logger.info(f"  Doc {i}: {sample_text}...")
         
         # Apply text preprocessing
         logger.info("Tokenizing and cleaning text...")
-        df['processed_text'] = df['case_text'].apply(self.tokenize_text)
+        df['processed_text'] = self._tokenize_series(df[text_column], n_jobs=n_jobs or self.n_jobs, executor=executor)
         
         # Debug: check tokenization results
         df['token_count'] = df['processed_text'].apply(len)
@@ -439,59 +2958,446 @@ class SupremeCourtTopicModeler:
         df = df[df['token_count'] >= min_tokens]
         logger.info(f"Removed {initial_count - len(df)} documents with fewer than {min_tokens} tokens")
         
-        if len(df) == 0:
-            raise ValueError("No documents remain after tokenization. Check stop words list.")
+        if len(df) == 0:
+            if not require_documents:
+                return df
+            raise ValueError("No documents remain after tokenization. Check stop words list.")
+        
+        # Sample processed text for debugging
+        if log_samples:
+            logger.info("Sample processed text:")
+        for i in range(min(3, len(df)) if log_samples else 0):
+            sample_tokens = df.iloc[i]['processed_text'][:20]
+            logger.info(f"  Doc {i}: {sample_tokens}")
+        
+        return df
+    
+    # Columns kept by each stage when using columnar storage; raw text and
+    # token lists are not carried past the stage that needs them
+    LEMMATIZED_COLUMNS = ['case_url', 'docket', 'text_length', 'token_count', 'processed_text_str']
+    TOPIC_MODELED_COLUMNS = ['case_url', 'docket', 'token_count', 'topic_number', 'topic_strength', 'topic_words']
+    
+    # Step 4 TF-IDF settings (min_df drops to 1 for vocabularies under 100 words),
+    # and the lenient fallback used when pruning leaves no terms
+    TFIDF_SETTINGS = {'max_df': 0.95, 'min_df': 2, 'stop_words': 'english', 'max_features': 5000}
+    TFIDF_FALLBACK_SETTINGS = {'max_df': 0.99, 'min_df': 1, 'stop_words': None, 'max_features': 1000}
+    
+    @profiled_stage()
+    def step3_preprocess_text(self, incremental: bool = False, n_jobs: Optional[int] = None) -> pd.DataFrame:
+        """
+        Step 3: Clean and preprocess case text
+        
+        In incremental mode only cases missing from the saved lemmatized corpus
+        are tokenized and appended to it. n_jobs > 1 tokenizes in a process pool
+        started once for the run.
+        With columnar storage the corpus is streamed through in row-group
+        batches, reading only the columns this step needs. Token lists are
+        saved as int32 token IDs (see load_token_corpus) rather than as
+        lists of strings; processed_text_str is kept for the vectorizer.
+        When dedupe is enabled the text is read from the dedupe_cases output.
+        
+        A full run is skipped when the stage cache shows the saved corpus was
+        built from the same case text with the same tokenizer, stoplist and
+        minimum token length.
+        """
+        logger.info("Step 3: Preprocessing text...")
+        
+        stage_params = {**self._tokenizer_params(), 'columnar': self.store.columnar}
+        if not incremental and self._stage_is_current("step3_preprocess_text", stage_params):
+            self.processed_df = self.store.read("full_proj_lemmatized")
+            return self.processed_df
+        
+        text_columns = ['case_url', 'docket', 'case_text']
+        source = self._case_text_stage()
+        if self.dedupe:
+            text_columns.append('clean_text')
+        in_memory = self.full_cases_df
+        if self.dedupe and in_memory is not None and 'n_merged' not in in_memory.columns:
+            # Step 2 output that has not been through dedupe_cases
+            in_memory = None
+        if in_memory is not None:
+            batches = iter([in_memory[text_columns].copy()])
+        elif self.store.exists(source):
+            batches = self.store.iter_batches(source, columns=text_columns)
+        elif self.dedupe and self.store.exists("full_proj_preproc"):
+            raise ValueError("No deduplicated case text found. Run dedupe_cases() first.")
+        else:
+            raise ValueError("No case text found. Run step2_extract_case_text() first.")
+        
+        output_columns = self.LEMMATIZED_COLUMNS if self.store.columnar else None
+        output_frame = self._lemmatized_frame
+        
+        token_corpus = TokenCorpusBuilder()
+        existing = iter([])
+        if incremental and self.store.exists("full_proj_lemmatized"):
+            done_urls = set(self.store.read("full_proj_lemmatized", columns=['case_url'])['case_url'])
+            batches = (batch[~batch['case_url'].isin(done_urls)].copy() for batch in batches)
+            existing = map(output_frame, self.store.iter_batches("full_proj_lemmatized", columns=output_columns))
+            previous = self.load_token_corpus()
+            if previous is not None and previous.n_docs == len(done_urls):
+                token_corpus = TokenCorpusBuilder(previous)
+            else:
+                existing = self._add_token_ids(token_corpus, existing)
+            logger.info(f"Incremental mode: {len(done_urls)} cases already preprocessed")
+        
+        counts = {'new': 0}
+        
+        def processed_frames(pool):
+            for batch in batches:
+                if len(batch) == 0:
+                    continue
+                if 'clean_text' in batch:
+                    # Model the boilerplate-free text where dedupe_cases stripped some
+                    batch['clean_text'] = batch['clean_text'].fillna(batch['case_text'])
+                processed = self._preprocess_cases(batch, require_documents=False, n_jobs=n_jobs,
+                                                   log_samples=counts['new'] == 0, executor=pool,
+                                                   text_column='clean_text' if 'clean_text' in batch else 'case_text')
+                counts['new'] += len(processed)
+                token_corpus.add_documents(processed['processed_text'])
+                yield output_frame(processed)
+        
+        # One pool for the whole run, so worker processes (and spaCy in them) start once
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        with self._tokenizer_pool(n_jobs) if n_jobs > 1 else nullcontext() as pool:
+            # Save result, streaming any existing documents ahead of the new ones
+            output_file = self.store.write_frames("full_proj_lemmatized", chain(existing, processed_frames(pool)))
+        token_corpus_dir = token_corpus.build(source=self._lemmatized_source()).save(self.data_dir / "token_corpus")
+        logger.info(f"Saved token-ID corpus ({len(token_corpus.index)} distinct tokens) to {token_corpus_dir}")
+        
+        if counts['new'] == 0 and not incremental:
+            raise ValueError("No documents remain after preprocessing. Check text extraction and stop words list.")
+        if incremental:
+            logger.info(f"Incremental mode: {counts['new']} new documents preprocessed")
+        
+        df = self.store.read("full_proj_lemmatized")
+        logger.info(f"Step 3 complete. {len(df)} documents processed. Saved to {output_file}")
+        self._record_stage("step3_preprocess_text", stage_params)
+        
+        self.processed_df = df
+        return df
+    
+    def _lemmatized_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """The part of a preprocessed frame saved as full_proj_lemmatized"""
+        # Token lists are kept only as token IDs (see TokenCorpus), not in the saved frames
+        if self.store.columnar:
+            return frame[self.LEMMATIZED_COLUMNS]
+        return frame.drop(columns=['processed_text', 'clean_text'], errors='ignore')
+    
+    @staticmethod
+    def _add_token_ids(builder: TokenCorpusBuilder, frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Pass lemmatized frames through, adding their documents to a token-ID corpus"""
+        for frame in frames:
+            builder.add_documents(frame['processed_text_str'].str.split())
+            yield frame
+    
+    def load_token_corpus(self, mmap: bool = True) -> Optional[TokenCorpus]:
+        """
+        Load the token-ID corpus saved by step 3, or None if it is missing or
+        was not built from the current lemmatized corpus
+        """
+        path = self.data_dir / "token_corpus"
+        if not TokenCorpus.exists(path) or not self.store.exists("full_proj_lemmatized"):
+            return None
+        corpus = TokenCorpus.load(path, mmap=mmap)
+        current = self._lemmatized_source()
+        if corpus.source is None or any(corpus.source.get(key) != value for key, value in current.items()):
+            logger.info("Token-ID corpus is stale; the lemmatized corpus has changed")
+            return None
+        return corpus
+    
+    def _assign_topics(self, df: pd.DataFrame, assignment: Dict[str, np.ndarray], topic_words: Dict) -> pd.DataFrame:
+        """
+        Label each document with its dominant topic from an assign_topics() result
+        """
+        df['topic_number'] = assignment['topic_number']
+        df['topic_strength'] = assignment['topic_strength']
+        
+        # Add topic words to dataframe
+        df['topic_words'] = df['topic_number'].map(topic_words)
+        return df
+    
+    def _save_document_topics(self, case_urls, doc_topic: np.ndarray, assignment: Dict[str, np.ndarray],
+                              append: bool = False):
+        """
+        Save the document-topic matrix (float32 .npy, memory-mappable) and the
+        top-k topic mixtures, row-aligned with topic_modeled_cases
+        """
+        matrix_file = self.data_dir / "doc_topic_matrix.npy"
+        top_k_file = self.data_dir / "doc_topic_top_k.npz"
+        doc_topic = np.asarray(doc_topic, dtype=np.float32)
+        case_urls = np.asarray(case_urls, dtype=str)
+        top_topics = assignment['top_topics']
+        top_weights = assignment['top_weights']
+        
+        if append:
+            if not (matrix_file.exists() and top_k_file.exists()):
+                logger.warning("No saved document-topic matrix to append to; rerun step 4 without incremental to rebuild it")
+                return
+            stored = np.load(top_k_file)
+            if stored['top_topics'].shape[1] != top_topics.shape[1]:
+                logger.warning("Saved top-k mixtures use a different k; rerun step 4 without incremental to rebuild them")
+                return
+            doc_topic = np.vstack([np.load(matrix_file), doc_topic])
+            case_urls = np.concatenate([stored['case_url'], case_urls])
+            top_topics = np.vstack([stored['top_topics'], top_topics])
+            top_weights = np.vstack([stored['top_weights'], top_weights])
+        
+        np.save(matrix_file, doc_topic)
+        np.savez(top_k_file, case_url=case_urls, top_topics=top_topics, top_weights=top_weights)
+    
+    def load_document_topics(self, mmap: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Load the document-topic matrix and top-k mixtures saved by step 4
+        
+        Returns a dict with 'matrix' (n_docs x n_topics float32, memory-mapped
+        by default), 'case_url', 'top_topics' and 'top_weights'.
+        """
+        return load_document_topics(self.data_dir, mmap=mmap)
+    
+    def _update_topic_modeling(self, n_topics: int, top_k: int = 3) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """
+        Label only documents missing from the saved results using the saved model
+        
+        Returns None when there is no compatible saved model, in which case the
+        caller should refit from scratch.
+        """
+        model_dir = self.data_dir / "topic_model"
+        if not TopicModel.exists(model_dir) or not self.store.exists("topic_modeled_cases"):
+            logger.info("No saved topic model found. Fitting from scratch...")
+            return None
+        
+        model = TopicModel.load(model_dir)
+        if model.n_topics != n_topics:
+            logger.info(f"Saved model has {model.n_topics} topics, {n_topics} requested. "
+                        f"Fitting from scratch...")
+            return None
+        
+        labeled_df = self.store.read("topic_modeled_cases")
+        new_df = self.processed_df[~self.processed_df['case_url'].isin(labeled_df['case_url'])].copy()
+        logger.info(f"Incremental mode: labeling {len(new_df)} new documents with the saved model")
+        
+        topic_words = model.topic_words
+        if len(new_df) > 0:
+            nmf_matrix = model.transform(new_df['processed_text_str'])
+            assignment = assign_topics(nmf_matrix, top_k=top_k)
+            new_df = self._assign_topics(new_df, assignment, topic_words)
+            self._save_document_topics(new_df['case_url'], nmf_matrix, assignment, append=True)
+            if self.store.columnar:
+                new_df = new_df[self.TOPIC_MODELED_COLUMNS]
+            output_file = self.store.write_frames("topic_modeled_cases", [labeled_df, new_df])
+        else:
+            output_file = self.store.path("topic_modeled_cases")
+        df = self.store.read("topic_modeled_cases")
+        
+        logger.info(f"Step 4 complete. Saved to {output_file}")
+        
+        self.new_cases_df = new_df
+        self.processed_df = df
+        return df, topic_words
+    
+    @staticmethod
+    def _topic_words(components: np.ndarray, feature_names, n_top_words: int) -> Dict:
+        """Comma-separated top words of each topic"""
+        return {
+            topic_idx: ', '.join(feature_names[i] for i in top_terms)
+            for topic_idx, top_terms in enumerate(top_term_indices(components, n_top_words))
+        }
+    
+    @staticmethod
+    def _log_topic_summary(topic_counts: pd.Series, topic_words: Dict, n_topics: int):
+        logger.info("\nTopic Summary:")
+        for topic_idx in range(n_topics):
+            count = topic_counts.get(topic_idx, 0)
+            words = topic_words[topic_idx][:100] + "..." if len(topic_words[topic_idx]) > 100 else topic_words[topic_idx]
+            logger.info(f"Topic {topic_idx} ({count} cases): {words}")
+    
+    def _save_topic_model(self, tfidf_vectorizer, nmf_model, topic_words: Dict):
+        """Save topic words and the fitted model so new documents can be labeled without refitting"""
+        topic_file = self.data_dir / "topic_words.json"
+        with open(topic_file, 'w') as f:
+            json.dump(topic_words, f, indent=2)
+        
+        self.topic_model = TopicModel.from_fitted(tfidf_vectorizer, nmf_model, topic_words)
+        self.topic_model.tokenizer = self.tokenizer
+        self.topic_model.save(self.data_dir / "topic_model")
+    
+    def load_topic_model(self, mmap: bool = True) -> TopicModel:
+        """Load the model saved by step 4, tokenizing raw text with this pipeline's tokenizer"""
+        self.topic_model = TopicModel.load(self.data_dir / "topic_model", mmap=mmap, tokenizer=self.tokenizer)
+        return self.topic_model
+    
+    def classify_texts(self, texts: Iterable[str], top_k: int = 3, batch_size: int = 256) -> pd.DataFrame:
+        """
+        Assign topics to raw opinion texts with the saved model, without refitting
+        
+        Accepts any iterable of texts and labels them in batches; see TopicModel.predict.
+        """
+        if self.topic_model is None:
+            self.load_topic_model()
+        return self.topic_model.predict(texts, top_k=top_k, batch_size=batch_size)
+    
+    @staticmethod
+    def _prune_vocabulary(term_counts: Counter, doc_counts: Counter, n_docs: int, max_df, min_df: int,
+                          stop_words, max_features: Optional[int]) -> List[str]:
+        """
+        Select features the way TfidfVectorizer does: drop stop words, apply the
+        document-frequency bounds, then keep the max_features most frequent terms
+        """
+        excluded = sklearn_text.ENGLISH_STOP_WORDS if stop_words == 'english' else frozenset()
+        terms = sorted(term for term in term_counts if term not in excluded)
+        if not terms:
+            return []
+        dfs = np.array([doc_counts[term] for term in terms])
+        tfs = np.array([term_counts[term] for term in terms])
+        max_doc_count = max_df if isinstance(max_df, int) else max_df * n_docs
+        kept = np.flatnonzero((dfs <= max_doc_count) & (dfs >= min_df))
+        if max_features is not None and len(kept) > max_features:
+            kept = np.sort(kept[(-tfs[kept]).argsort()[:max_features]])
+        return [terms[i] for i in kept]
+    
+    def _select_tfidf_features(self, term_counts: Dict[str, int], doc_counts: Dict[str, int], n_docs: int,
+                               n_unique_words: int) -> Tuple[List[str], Dict]:
+        """
+        Apply the TF-IDF settings to corpus counts, falling back to the lenient
+        settings when no terms remain; returns the vocabulary and the settings used
+        """
+        logger.info(f"Total unique words in corpus: {n_unique_words}")
+        if n_unique_words < 100:
+            logger.warning(f"Very small vocabulary ({n_unique_words} words). Reducing min_df.")
+            min_df_val = 1
+        else:
+            min_df_val = self.TFIDF_SETTINGS['min_df']
+        
+        # Same settings as the in-memory TfidfVectorizer, then the lenient fallback
+        settings = [{**self.TFIDF_SETTINGS, 'min_df': min_df_val}, self.TFIDF_FALLBACK_SETTINGS]
+        for params in settings:
+            vocabulary = self._prune_vocabulary(term_counts, doc_counts, n_docs, **params)
+            if vocabulary:
+                return vocabulary, params
+            logger.error("TF-IDF failed: After pruning, no terms remain.")
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    
+    def _fit_streaming_vectorizer(self, batch_size: int) -> TfidfVectorizer:
+        """
+        Build the TF-IDF vocabulary and IDF weights in one streaming pass over
+        the lemmatized corpus (or from the token-ID corpus when it is current);
+        memory is bounded by vocabulary size, not corpus size
+        """
+        analyzer = sklearn_text.TfidfVectorizer().build_analyzer()
+        corpus = self.load_token_corpus()
+        if corpus is not None:
+            # Frequencies come straight from the token-ID corpus, without re-tokenizing text
+            features, term_freq, doc_freq = corpus.feature_frequencies(analyzer, chunk_size=batch_size)
+            term_counts, doc_counts = dict(zip(features, term_freq)), dict(zip(features, doc_freq))
+            n_docs = corpus.n_docs
+        else:
+            term_counts = Counter()
+            doc_counts = Counter()
+            n_docs = 0
+            for batch in self.store.iter_batches("full_proj_lemmatized", columns=['processed_text_str'],
+                                                 batch_size=batch_size):
+                for text in batch['processed_text_str']:
+                    tokens = analyzer(text)
+                    term_counts.update(tokens)
+                    doc_counts.update(set(tokens))
+                    n_docs += 1
+        
+        vocabulary, params = self._select_tfidf_features(term_counts, doc_counts, n_docs, len(term_counts))
+        tfidf_vectorizer = sklearn_text.TfidfVectorizer(vocabulary=vocabulary, stop_words=params['stop_words'],
+                                                        ngram_range=(1, 1))
+        doc_freq = np.array([doc_counts[term] for term in vocabulary])
+        tfidf_vectorizer.idf_ = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        logger.info(f"TF-IDF matrix shape: ({n_docs}, {len(vocabulary)})")
+        return tfidf_vectorizer
+    
+    def _stream_topic_modeling(self, n_topics: int, n_top_words: int, batch_size: int,
+                               n_epochs: int, top_k: int = 3, random_state: int = 42) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Out-of-core step 4: stream the lemmatized corpus from disk, fit
+        MiniBatchNMF with partial_fit and write labels batch by batch
+        """
+        MiniBatchNMF = getattr(sklearn_decomposition, "MiniBatchNMF", None)
+        if MiniBatchNMF is None:
+            raise ValueError("Out-of-core topic modeling requires scikit-learn >= 1.1 (MiniBatchNMF).")
+        if not self.store.exists("full_proj_lemmatized"):
+            raise ValueError("No processed text found. Run step3_preprocess_text() first.")
+        
+        logger.info("Creating TF-IDF vocabulary out of core...")
+        tfidf_vectorizer = self._fit_streaming_vectorizer(batch_size)
+        feature_names = tfidf_vectorizer.get_feature_names_out()
         
-        # Sample processed text for debugging
-        logger.info("Sample processed text:")
-        for i in range(min(3, len(df))):
-            sample_tokens = df.iloc[i]['processed_text'][:20]
-            logger.info(f"  Doc {i}: {sample_tokens}")
+        logger.info(f"Fitting MiniBatchNMF model with {n_topics} topics over {n_epochs} epoch(s)...")
+        nmf_model = MiniBatchNMF(n_components=n_topics, batch_size=batch_size, random_state=random_state)
+        for epoch in range(n_epochs):
+            for batch in self.store.iter_batches("full_proj_lemmatized", columns=['processed_text_str'],
+                                                 batch_size=batch_size):
+                nmf_model.partial_fit(tfidf_vectorizer.transform(batch['processed_text_str']))
+            logger.info(f"  Epoch {epoch + 1}/{n_epochs} done")
         
-        # Save result
-        output_file = self.data_dir / "full_proj_lemmatized.pickle"
-        df.to_pickle(output_file)
-        logger.info(f"Step 3 complete. {len(df)} documents processed. Saved to {output_file}")
+        topic_words = self._topic_words(nmf_model.components_, feature_names, n_top_words)
+        
+        # Label documents batch by batch and stream them to the output
+        columns = ['case_url', 'docket', 'token_count', 'processed_text_str'] if self.store.columnar else None
+        topic_counts = np.zeros(n_topics, dtype=np.int64)
+        n_docs = self.store.num_rows("full_proj_lemmatized")
+        doc_topic = np.lib.format.open_memmap(self.data_dir / "doc_topic_matrix.npy", mode='w+',
+                                              dtype=np.float32, shape=(n_docs, n_topics))
+        top_k_parts = {'case_url': [], 'top_topics': [], 'top_weights': []}
+        
+        def labeled_frames(doc_topic: np.memmap):
+            offset = 0
+            for batch in self.store.iter_batches("full_proj_lemmatized", columns=columns, batch_size=batch_size):
+                nmf_matrix = nmf_model.transform(tfidf_vectorizer.transform(batch['processed_text_str']))
+                assignment = assign_topics(nmf_matrix, top_k=top_k)
+                batch = self._assign_topics(batch.copy(), assignment, topic_words)
+                topic_counts[:] += np.bincount(assignment['topic_number'], minlength=n_topics)
+                
+                doc_topic[offset:offset + len(batch)] = nmf_matrix
+                offset += len(batch)
+                top_k_parts['case_url'].append(batch['case_url'].to_numpy(dtype=str))
+                top_k_parts['top_topics'].append(assignment['top_topics'])
+                top_k_parts['top_weights'].append(assignment['top_weights'])
+                yield batch[self.TOPIC_MODELED_COLUMNS] if self.store.columnar else batch
+        
+        output_file = self.store.write_frames("topic_modeled_cases", labeled_frames(doc_topic))
+        doc_topic.flush()
+        del doc_topic
+        np.savez(self.data_dir / "doc_topic_top_k.npz",
+                 **{name: np.concatenate(parts) for name, parts in top_k_parts.items()})
+        self._log_topic_summary(pd.Series(topic_counts), topic_words, n_topics)
+        self._save_topic_model(tfidf_vectorizer, nmf_model, topic_words)
+        
+        logger.info(f"Step 4 complete. Saved to {output_file}")
         
+        df = self.store.read("topic_modeled_cases")
+        self.new_cases_df = None
         self.processed_df = df
-        return df
+        return df, topic_words
     
-    def step4_topic_modeling(self, n_topics: int = 30, n_top_words: int = 40) -> Tuple[pd.DataFrame, Dict]:
+    def _fit_tfidf(self, df: pd.DataFrame) -> Tuple[TfidfVectorizer, sparse.csr_matrix, np.ndarray]:
         """
-        Step 4: Apply NMF topic modeling
+        Fit the step 4 TF-IDF vectorizer in memory, falling back to more lenient
+        settings when the default pruning leaves no terms
         """
-        logger.info("Step 4: Applying topic modeling...")
-        
-        if self.processed_df is None:
-            # Try to load from file
-            try:
-                self.processed_df = pd.read_pickle(self.data_dir / "full_proj_lemmatized.pickle")
-            except FileNotFoundError:
-                raise ValueError("No processed text found. Run step3_preprocess_text() first.")
-        
-        df = self.processed_df.copy()
-        
         # Debug vocabulary before TF-IDF
         logger.info("Checking vocabulary before TF-IDF...")
-        all_text = ' '.join(df['processed_text_str'].tolist())
-        unique_words = set(all_text.split())
+        unique_words = set()
+        for text in df['processed_text_str']:
+            unique_words.update(text.split())
         logger.info(f"Total unique words in corpus: {len(unique_words)}")
         
         if len(unique_words) < 100:
             logger.warning(f"Very small vocabulary ({len(unique_words)} words). Reducing min_df.")
             min_df_val = 1
         else:
-            min_df_val = 2
+            min_df_val = self.TFIDF_SETTINGS['min_df']
         
         # Set up TF-IDF vectorizer with more lenient parameters
         logger.info("Creating TF-IDF vectors...")
-        tfidf_vectorizer = TfidfVectorizer(
-            max_df=0.95,
-            min_df=min_df_val,  # Reduced from 5
-            stop_words='english',
-            ngram_range=(1, 1),
-            max_features=5000  # Limit features to avoid memory issues
-        )
+        tfidf_vectorizer = sklearn_text.TfidfVectorizer(**{**self.TFIDF_SETTINGS, 'min_df': min_df_val},
+                                                        ngram_range=(1, 1))
         
         try:
             tfidf_matrix = tfidf_vectorizer.fit_transform(df['processed_text_str'])
@@ -502,135 +3408,441 @@ class SupremeCourtTopicModeler:
             logger.error(f"TF-IDF failed: {e}")
             logger.info("Trying with even more lenient parameters...")
             
-            # Emergency fallback: very lenient parameters
-            tfidf_vectorizer = TfidfVectorizer(
-                max_df=0.99,
-                min_df=1,
-                stop_words=None,  # Don't use sklearn's stop words
-                ngram_range=(1, 1),
-                max_features=1000
-            )
+            # Emergency fallback: very lenient parameters, without sklearn's stop words
+            tfidf_vectorizer = sklearn_text.TfidfVectorizer(**self.TFIDF_FALLBACK_SETTINGS, ngram_range=(1, 1))
             tfidf_matrix = tfidf_vectorizer.fit_transform(df['processed_text_str'])
             feature_names = tfidf_vectorizer.get_feature_names_out()
             logger.info(f"Fallback TF-IDF matrix shape: {tfidf_matrix.shape}")
+        return tfidf_vectorizer, tfidf_matrix, feature_names
+    
+    def _fit_tfidf_from_tokens(self, corpus: TokenCorpus) -> Tuple[TfidfVectorizer, sparse.csr_matrix, np.ndarray]:
+        """
+        Fit the step 4 TF-IDF model from the token-ID corpus
+        
+        The term-count matrix is built directly from the ID arrays; feature
+        selection and weighting match _fit_tfidf on the same documents.
+        """
+        logger.info("Creating TF-IDF vectors from the token-ID corpus...")
+        counts, features = corpus.feature_counts(sklearn_text.TfidfVectorizer().build_analyzer())
+        term_freq = np.asarray(counts.sum(axis=0)).ravel()
+        doc_freq = np.bincount(counts.indices, minlength=len(features))
+        vocabulary, params = self._select_tfidf_features(dict(zip(features, term_freq)), dict(zip(features, doc_freq)),
+                                                         corpus.n_docs, int(np.count_nonzero(corpus.term_freq)))
+        
+        counts = counts[:, np.searchsorted(features, vocabulary)]
+        transformer = sklearn_text.TfidfTransformer().fit(counts)
+        tfidf_vectorizer = sklearn_text.TfidfVectorizer(vocabulary=vocabulary, stop_words=params['stop_words'],
+                                                        ngram_range=(1, 1))
+        tfidf_vectorizer.idf_ = transformer.idf_
+        tfidf_matrix = transformer.transform(counts)
+        logger.info(f"TF-IDF matrix shape: {tfidf_matrix.shape}")
+        return tfidf_vectorizer, tfidf_matrix, tfidf_vectorizer.get_feature_names_out()
+    
+    def _lemmatized_source(self) -> Dict:
+        """Identify the saved lemmatized corpus, for artifacts derived from it"""
+        return self.store.source("full_proj_lemmatized")
+    
+    def _tfidf_cache_source(self) -> Dict:
+        """Identify the lemmatized corpus and settings a cached TF-IDF matrix was built from"""
+        return {**self._lemmatized_source(), 'settings': [self.TFIDF_SETTINGS, self.TFIDF_FALLBACK_SETTINGS]}
+    
+    def _load_tfidf_cache(self) -> Optional[Tuple[TfidfVectorizer, sparse.csr_matrix]]:
+        """Load the cached TF-IDF matrix and vectorizer, or None if missing or stale"""
+        matrix_file = self.data_dir / "tfidf_matrix.npz"
+        vocabulary_file = self.data_dir / "tfidf_vocabulary.json"
+        if not (matrix_file.exists() and vocabulary_file.exists() and self.store.exists("full_proj_lemmatized")):
+            return None
+        with open(vocabulary_file) as f:
+            cached = json.load(f)
+        if any(cached.get(key) != value for key, value in self._tfidf_cache_source().items()):
+            logger.info("Cached TF-IDF matrix is stale; the lemmatized corpus or TF-IDF settings have changed")
+            return None
+        
+        tfidf_vectorizer = sklearn_text.TfidfVectorizer(vocabulary=cached['vocabulary'],
+                                                        stop_words=cached['stop_words'], ngram_range=(1, 1))
+        tfidf_vectorizer.idf_ = np.array(cached['idf'])
+        return tfidf_vectorizer, sparse.load_npz(matrix_file)
+    
+    def build_tfidf_cache(self, batch_size: int = 2000, refresh: bool = False) -> Tuple[TfidfVectorizer, sparse.csr_matrix]:
+        """
+        Build the TF-IDF matrix of the lemmatized corpus once and cache it
+        
+        The matrix is saved as tfidf_matrix.npz (scipy sparse) and the
+        vocabulary and IDF weights as tfidf_vocabulary.json. Both are reused by
+        step 4 and sweep_topic_counts() until step 3 output changes.
+        """
+        if not refresh:
+            cached = self._load_tfidf_cache()
+            if cached is not None:
+                return cached
+        if not self.store.exists("full_proj_lemmatized"):
+            raise ValueError("No processed text found. Run step3_preprocess_text() first.")
+        
+        logger.info("Building TF-IDF matrix cache...")
+        token_corpus = self.load_token_corpus()
+        if token_corpus is not None:
+            tfidf_vectorizer, tfidf_matrix, _ = self._fit_tfidf_from_tokens(token_corpus)
+        else:
+            tfidf_vectorizer = self._fit_streaming_vectorizer(batch_size)
+            tfidf_matrix = sparse.vstack([
+                tfidf_vectorizer.transform(batch['processed_text_str'])
+                for batch in self.store.iter_batches("full_proj_lemmatized", columns=['processed_text_str'],
+                                                     batch_size=batch_size)
+            ], format='csr')
+        
+        sparse.save_npz(self.data_dir / "tfidf_matrix.npz", tfidf_matrix)
+        with open(self.data_dir / "tfidf_vocabulary.json", 'w') as f:
+            json.dump({
+                **self._tfidf_cache_source(),
+                'stop_words': tfidf_vectorizer.stop_words,
+                'vocabulary': tfidf_vectorizer.get_feature_names_out().tolist(),
+                'idf': tfidf_vectorizer.idf_.tolist(),
+            }, f)
+        logger.info(f"Cached TF-IDF matrix {tfidf_matrix.shape} to {self.data_dir / 'tfidf_matrix.npz'}")
+        return tfidf_vectorizer, tfidf_matrix
+    
+    def sweep_topic_counts(self, n_topics_grid: Iterable[int] = (10, 20, 30, 40, 50), n_top_words: int = 10,
+                           n_jobs: Optional[int] = None, max_iter: int = 1000, random_state: int = 42,
+                           batch_size: int = 2000) -> pd.DataFrame:
+        """
+        Fit NMF for a grid of topic counts and compare them
+        
+        The TF-IDF matrix is built once (see build_tfidf_cache). The sorted grid
+        is split into at most n_jobs contiguous chains of at least two
+        settings each, which run in worker processes; within a chain each fit
+        is warm-started from the nearest smaller solution. Reports reconstruction error and mean UMass coherence of the
+        n_top_words terms per setting, saved to topic_count_sweep.csv.
+        """
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        grid = sorted(set(n_topics_grid))
+        if not grid or grid[0] < 1:
+            raise ValueError("n_topics_grid must contain positive topic counts")
+        
+        self.build_tfidf_cache(batch_size=batch_size)
+        tfidf_file = str(self.data_dir / "tfidf_matrix.npz")
+        
+        # Contiguous chunks, so each warm start comes from the next smaller topic count
+        n_chains = max(1, min(n_jobs, len(grid) // 2))
+        chains = [topic_chain.tolist() for topic_chain in np.array_split(grid, n_chains)]
+        logger.info(f"Sweeping {len(grid)} topic counts in {n_chains} warm-started chain(s)")
+        args = (n_top_words, max_iter, random_state)
+        if n_chains == 1:
+            results = _fit_topic_chain(tfidf_file, chains[0], *args)
+        else:
+            with ProcessPoolExecutor(max_workers=n_chains) as executor:
+                futures = [executor.submit(_fit_topic_chain, tfidf_file, topic_chain, *args) for topic_chain in chains]
+                results = list(chain.from_iterable(future.result() for future in futures))
+        
+        report = pd.DataFrame(results).sort_values('n_topics').reset_index(drop=True)
+        output_file = self.data_dir / "topic_count_sweep.csv"
+        report.to_csv(output_file, index=False)
+        for row in report.itertuples():
+            logger.info(f"n_topics={row.n_topics}: reconstruction error {row.reconstruction_error:.4f}, "
+                        f"coherence {row.coherence:.3f} ({row.fit_seconds:.1f}s)")
+        logger.info(f"Topic count sweep saved to {output_file}")
+        return report
+    
+    @profiled_stage()
+    def step4_topic_modeling(self, n_topics: int = 30, n_top_words: int = 40,
+                             incremental: bool = False, out_of_core: bool = False,
+                             batch_size: int = 2000, n_epochs: int = 3, top_k: int = 3,
+                             random_state: int = 42) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Step 4: Apply NMF topic modeling
+        
+        In incremental mode the saved vectorizer and NMF model are reused to
+        label only new documents instead of refitting on the whole corpus.
+        With out_of_core=True the corpus is streamed from disk in batches of
+        batch_size documents and fit with MiniBatchNMF.partial_fit, so memory
+        is bounded by the batch size rather than the corpus size.
+        
+        Besides the labeled cases, the full document-topic matrix and each
+        document's top_k topic mixture are saved (see load_document_topics).
+        
+        A full run is skipped when the stage cache shows the saved model was
+        fit on the same lemmatized corpus with the same TF-IDF settings,
+        n_topics, random_state and other parameters; an incremental run
+        invalidates the cached step 4 and step 5 entries.
+        """
+        logger.info("Step 4: Applying topic modeling...")
+        
+        stage_params = {
+            'tfidf': self.TFIDF_SETTINGS, 'tfidf_fallback': self.TFIDF_FALLBACK_SETTINGS,
+            'n_topics': n_topics, 'n_top_words': n_top_words, 'top_k': top_k, 'random_state': random_state,
+            'out_of_core': out_of_core, 'columnar': self.store.columnar,
+        }
+        if out_of_core:
+            stage_params.update(batch_size=batch_size, n_epochs=n_epochs)
+        if incremental:
+            if self.stage_cache is not None:
+                self.stage_cache.invalidate("step4_topic_modeling", "step5_prepare_visualization_data")
+        elif self._stage_is_current("step4_topic_modeling", stage_params):
+            return self._load_topic_modeling_outputs()
+        
+        if out_of_core and not incremental:
+            result = self._stream_topic_modeling(n_topics, n_top_words, batch_size, n_epochs, top_k=top_k,
+                                                 random_state=random_state)
+            self._record_stage("step4_topic_modeling", stage_params)
+            return result
+        
+        if self.processed_df is None:
+            # Try to load from file
+            if not self.store.exists("full_proj_lemmatized"):
+                raise ValueError("No processed text found. Run step3_preprocess_text() first.")
+            columns = ['case_url', 'docket', 'token_count', 'processed_text_str'] if self.store.columnar else None
+            self.processed_df = self.store.read("full_proj_lemmatized", columns=columns)
+        
+        if incremental:
+            updated = self._update_topic_modeling(n_topics, top_k=top_k)
+            if updated is not None:
+                return updated
+        
+        df = self.processed_df.copy()
+        
+        cached = self._load_tfidf_cache()
+        token_corpus = self.load_token_corpus() if cached is None else None
+        if cached is not None:
+            tfidf_vectorizer, tfidf_matrix = cached
+            feature_names = tfidf_vectorizer.get_feature_names_out()
+            logger.info(f"Reusing cached TF-IDF matrix {tfidf_matrix.shape}")
+        elif token_corpus is not None and token_corpus.n_docs == len(df):
+            tfidf_vectorizer, tfidf_matrix, feature_names = self._fit_tfidf_from_tokens(token_corpus)
+        else:
+            tfidf_vectorizer, tfidf_matrix, feature_names = self._fit_tfidf(df)
         
         # Apply NMF
         logger.info(f"Fitting NMF model with {n_topics} topics...")
-        nmf_model = NMF(
+        nmf_model = sklearn_decomposition.NMF(
             n_components=n_topics,
-            random_state=42,
+            random_state=random_state,
             max_iter=1000
         )
         
         nmf_matrix = nmf_model.fit_transform(tfidf_matrix)
         
-        # Assign topics to documents
-        topic_assignments = []
-        topic_strengths = []
-        
-        for doc_topics in nmf_matrix:
-            max_index, max_value = max(enumerate(doc_topics), key=operator.itemgetter(1))
-            topic_assignments.append(max_index)
-            topic_strengths.append(max_value)
-        
-        df['topic_number'] = topic_assignments
-        df['topic_strength'] = topic_strengths
-        
         # Extract topic words
-        topic_words = {}
-        for topic_idx, topic in enumerate(nmf_model.components_):
-            top_words = [feature_names[i] for i in topic.argsort()[:-n_top_words - 1:-1]]
-            topic_words[topic_idx] = ', '.join(top_words)
+        topic_words = self._topic_words(nmf_model.components_, feature_names, n_top_words)
         
-        # Add topic words to dataframe
-        df['topic_words'] = df['topic_number'].map(topic_words)
+        # Assign topics to documents
+        assignment = assign_topics(nmf_matrix, top_k=top_k)
+        df = self._assign_topics(df, assignment, topic_words)
+        self._save_document_topics(df['case_url'], nmf_matrix, assignment)
         
         # Print topic summary
-        logger.info("\nTopic Summary:")
-        topic_counts = df['topic_number'].value_counts().sort_index()
-        for topic_idx in range(n_topics):
-            count = topic_counts.get(topic_idx, 0)
-            words = topic_words[topic_idx][:100] + "..." if len(topic_words[topic_idx]) > 100 else topic_words[topic_idx]
-            logger.info(f"Topic {topic_idx} ({count} cases): {words}")
+        self._log_topic_summary(df['topic_number'].value_counts().sort_index(), topic_words, n_topics)
         
         # Save results
-        output_file = self.data_dir / "topic_modeled_cases.pickle"
-        df.to_pickle(output_file)
+        if self.store.columnar:
+            df = df[self.TOPIC_MODELED_COLUMNS]
+        output_file = self.store.write("topic_modeled_cases", df)
         
-        # Save topic words separately
-        topic_file = self.data_dir / "topic_words.json"
-        with open(topic_file, 'w') as f:
-            json.dump(topic_words, f, indent=2)
+        # Save topic words and the fitted model
+        self._save_topic_model(tfidf_vectorizer, nmf_model, topic_words)
         
         logger.info(f"Step 4 complete. Saved to {output_file}")
+        self._record_stage("step4_topic_modeling", stage_params)
         
+        self.new_cases_df = None
+        self.processed_df = df
+        return df, topic_words
+    
+    def _load_topic_modeling_outputs(self) -> Tuple[pd.DataFrame, Dict]:
+        """Read back the labeled cases and topic words saved by step 4"""
+        with open(self.data_dir / "topic_words.json") as f:
+            topic_words = {int(topic): words for topic, words in json.load(f).items()}
+        df = self.store.read("topic_modeled_cases")
+        self.new_cases_df = None
         self.processed_df = df
         return df, topic_words
     
-    def step5_prepare_visualization_data(self) -> pd.DataFrame:
+    @staticmethod
+    def _add_years(df: pd.DataFrame) -> pd.DataFrame:
         """
-        Step 5: Prepare data for D3.js visualization
+        Add a 'year' column parsed from the case URL, dropping cases without one
         """
-        logger.info("Step 5: Preparing visualization data...")
-        
-        if self.processed_df is None:
-            # Try to load from file
-            try:
-                self.processed_df = pd.read_pickle(self.data_dir / "topic_modeled_cases.pickle")
-            except FileNotFoundError:
-                raise ValueError("No topic-modeled data found. Run step4_topic_modeling() first.")
-        
-        df = self.processed_df.copy()
-        
-        # Extract year from case URL (this might need adjustment based on URL format)
-        def extract_year_from_url(url):
-            # Try to extract year from URL pattern
-            year_match = re.search(r'/(\d{4})/', url)
-            if year_match:
-                return int(year_match.group(1))
-            # Fallback: try to extract from any 4-digit number
-            year_match = re.search(r'\b(1[7-9]\d{2}|20[0-2]\d)\b', url)
-            if year_match:
-                return int(year_match.group(1))
-            return None
+        # Year path segment first, then any plausible 4-digit year in the URL
+        urls = df['case_url'].astype(str)
+        years = urls.str.extract(r'/(\d{4})/', expand=False)
+        missing = years.isna()
+        if missing.any():
+            years[missing] = urls[missing].str.extract(r'\b(1[7-9]\d{2}|20[0-2]\d)\b', expand=False)
         
-        df['year'] = df['case_url'].apply(extract_year_from_url)
+        df['year'] = years.astype(float)
         
         # Remove cases without valid years
         df = df.dropna(subset=['year'])
         df['year'] = df['year'].astype(int)
+        return df
+    
+    @staticmethod
+    def _visualization_frames(counts: np.ndarray, start_year: int,
+                              trend_window: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Long-format year-topic data and yearly totals from a dense count matrix
         
-        # Create year-topic counts
-        year_topic_counts = df.groupby(['year', 'topic_number']).size().reset_index(name='count')
-        
-        # Fill missing year-topic combinations with 0
-        all_years = range(df['year'].min(), df['year'].max() + 1)
-        all_topics = range(df['topic_number'].max() + 1)
+        Each row also carries the topic's share of that year's cases and a
+        centered rolling mean of the share over trend_window years.
+        """
+        n_years, n_topics = counts.shape
+        totals = counts.sum(axis=1)
+        shares = np.divide(counts, totals[:, None], out=np.zeros(counts.shape), where=totals[:, None] > 0)
+        trends = pd.DataFrame(shares).rolling(trend_window, center=True, min_periods=1).mean().to_numpy()
+        years = np.arange(start_year, start_year + n_years)
         
-        # Create complete year-topic grid
-        complete_grid = []
-        for year in all_years:
-            for topic in all_topics:
-                complete_grid.append({'year': year, 'topic_number': topic})
+        viz_data = pd.DataFrame({
+            'year': np.repeat(years, n_topics),
+            'topic_number': np.tile(np.arange(n_topics), n_years),
+            'count': counts.ravel().astype(int),
+        })
+        viz_data['topic_name'] = pd.Categorical.from_codes(
+            viz_data['topic_number'], [f"Topic {i}" for i in range(n_topics)]).astype(str)
+        viz_data['share'] = shares.ravel()
+        viz_data['share_trend'] = trends.ravel()
         
-        complete_df = pd.DataFrame(complete_grid)
-        viz_data = complete_df.merge(year_topic_counts, on=['year', 'topic_number'], how='left')
-        viz_data['count'] = viz_data['count'].fillna(0).astype(int)
+        has_cases = totals > 0
+        yearly_totals = pd.DataFrame({'year': years[has_cases], 'total_cases': totals[has_cases].astype(int)})
+        return viz_data, yearly_totals
+    
+    def _update_visualization_data(self, viz_file: Path, yearly_file: Path, trend_window: int) -> pd.DataFrame:
+        """
+        Add the year-topic counts of newly labeled cases to the saved visualization data
+        """
+        new_df = self._add_years(self.new_cases_df.copy())
+        viz_data = pd.read_csv(viz_file)
+        yearly_totals = pd.read_csv(yearly_file)
+        logger.info(f"Incremental mode: adding {len(new_df)} new cases to {viz_file}")
         
-        # Add topic metadata (you might want to manually create topic names)
-        topic_names = {i: f"Topic {i}" for i in range(df['topic_number'].max() + 1)}
-        viz_data['topic_name'] = viz_data['topic_number'].map(topic_names)
+        if len(new_df) > 0:
+            start_year = min(viz_data['year'].min(), new_df['year'].min())
+            n_years = max(viz_data['year'].max(), new_df['year'].max()) - start_year + 1
+            n_topics = max(viz_data['topic_number'].max(), new_df['topic_number'].max()) + 1
+            
+            counts = np.zeros((n_years, n_topics), dtype=np.int64)
+            counts[viz_data['year'] - start_year, viz_data['topic_number']] = viz_data['count']
+            counts += year_topic_matrix(new_df['year'], new_df['topic_number'], start_year, n_years, n_topics)
+            viz_data, yearly_totals = self._visualization_frames(counts, start_year, trend_window)
         
-        # Save visualization data
-        viz_file = self.data_dir / "visualization_data.csv"
         viz_data.to_csv(viz_file, index=False)
+        yearly_totals.to_csv(yearly_file, index=False)
+        self._export_visualization(viz_data, yearly_totals)
+        
+        logger.info(f"Step 5 complete. Visualization data saved to {viz_file}")
+        
+        self.final_results = viz_data
+        return viz_data
+    
+    @staticmethod
+    def _lead_paragraph(text: str, max_chars: int = 300) -> str:
+        """Opening of an opinion, whitespace-collapsed and cut at a word boundary"""
+        text = ' '.join(str(text).split())
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars].rsplit(' ', 1)[0]
+    
+    def _topic_exemplars(self, topic_numbers: List[int]) -> pd.DataFrame:
+        """The most strongly assigned case of each of topic_numbers, with the opening of its text"""
+        columns = ['case_url', 'docket', 'topic_number', 'topic_strength']
+        labeled = self.processed_df
+        if labeled is None or not set(columns) <= set(labeled.columns):
+            labeled = self.store.read("topic_modeled_cases", columns=columns if self.store.columnar else None)
+        best = labeled.loc[labeled.groupby('topic_number')['topic_strength'].idxmax(), columns]
+        
+        lead = {}
+        if self.store.exists("full_proj_preproc"):
+            wanted = set(best['case_url'])
+            for batch in self.store.iter_batches("full_proj_preproc", columns=['case_url', 'case_text']):
+                batch = batch[batch['case_url'].isin(wanted)]
+                lead.update(zip(batch['case_url'], batch['case_text'].map(self._lead_paragraph)))
+        
+        exemplars = pd.DataFrame({'topic_number': topic_numbers}).merge(best, on='topic_number', how='left')
+        return pd.DataFrame({
+            'topic_number': exemplars['topic_number'],
+            'url': exemplars['case_url'].fillna(''),
+            'title': exemplars['docket'].map(lambda docket: f"No. {docket}" if isinstance(docket, str) and docket else ''),
+            'leadpp': exemplars['case_url'].map(lead).fillna(''),
+        })
+    
+    def _export_visualization(self, viz_data: pd.DataFrame, yearly_totals: pd.DataFrame) -> Path:
+        """
+        Write the compact, deduplicated D3 export (see write_visualization_export)
+        alongside the long-format CSVs
+        """
+        matrix = viz_data.pivot(index='year', columns='topic_number', values='count').fillna(0)
+        totals = yearly_totals.set_index('year')['total_cases'].reindex(matrix.index, fill_value=0)
+        
+        topic_words = {}
+        topic_file = self.data_dir / "topic_words.json"
+        if topic_file.exists():
+            with open(topic_file) as f:
+                topic_words = {int(topic): words for topic, words in json.load(f).items()}
+        topics = [
+            {'topic_number': int(topic), 'name': f"Topic {topic}", 'words': topic_words.get(int(topic), '')}
+            for topic in matrix.columns
+        ]
+        
+        out_dir = write_visualization_export(self.data_dir / "viz", int(matrix.index[0]), matrix.to_numpy(),
+                                             totals.to_numpy(), topics,
+                                             self._topic_exemplars([topic['topic_number'] for topic in topics]))
+        logger.info(f"Compact visualization export saved to {out_dir}")
+        return out_dir
+    
+    @profiled_stage(lambda self, result: len(self.processed_df) if self.processed_df is not None else None)
+    def step5_prepare_visualization_data(self, incremental: bool = False, trend_window: int = 5) -> pd.DataFrame:
+        """
+        Step 5: Prepare data for D3.js visualization
+        
+        Besides the long-format CSVs, writes the compact export read by
+        visualization/Step2_viz_area_chart to data_dir/viz: a dense
+        year x topic count matrix (JSON, gzip and binary), a topic
+        dictionary and an exemplar case table.
+        
+        Every year-topic row also has the topic's share of that year's cases
+        ('share') and its centered rolling mean over trend_window years
+        ('share_trend').
         
-        # Also create yearly totals for brushing visualization
-        yearly_totals = df.groupby('year').size().reset_index(name='total_cases')
+        In incremental mode the counts of the cases labeled by the last
+        incremental step 4 are added to the saved outputs in place. Otherwise
+        the step is skipped when the stage cache shows its outputs were built
+        from the current step 4 outputs with the same trend_window.
+        """
+        logger.info("Step 5: Preparing visualization data...")
+        
+        viz_file = self.data_dir / "visualization_data.csv"
         yearly_file = self.data_dir / "yearly_totals.csv"
+        stage_params = {'trend_window': trend_window}
+        if incremental and self.new_cases_df is not None and viz_file.exists() and yearly_file.exists():
+            if self.stage_cache is not None:
+                self.stage_cache.invalidate("step5_prepare_visualization_data")
+            return self._update_visualization_data(viz_file, yearly_file, trend_window)
+        if self._stage_is_current("step5_prepare_visualization_data", stage_params):
+            self.final_results = pd.read_csv(viz_file)
+            return self.final_results
+        
+        if self.processed_df is None:
+            # Try to load from file
+            if not self.store.exists("topic_modeled_cases"):
+                raise ValueError("No topic-modeled data found. Run step4_topic_modeling() first.")
+            columns = ['case_url', 'docket', 'topic_number', 'topic_strength'] if self.store.columnar else None
+            self.processed_df = self.store.read("topic_modeled_cases", columns=columns)
+        
+        df = self._add_years(self.processed_df.copy())
+        
+        # Dense year x topic counts, filling years and topics without cases with 0
+        start_year = df['year'].min()
+        n_years = df['year'].max() - start_year + 1
+        n_topics = df['topic_number'].max() + 1
+        counts = year_topic_matrix(df['year'], df['topic_number'], start_year, n_years, n_topics)
+        viz_data, yearly_totals = self._visualization_frames(counts, start_year, trend_window)
+        
+        # Save visualization data, plus yearly totals for brushing visualization
+        viz_data.to_csv(viz_file, index=False)
         yearly_totals.to_csv(yearly_file, index=False)
+        self._export_visualization(viz_data, yearly_totals)
         
         logger.info(f"Step 5 complete. Visualization data saved to {viz_file}")
+        self._record_stage("step5_prepare_visualization_data", stage_params)
         
         self.final_results = viz_data
         return viz_data
@@ -638,41 +3850,293 @@ class SupremeCourtTopicModeler:
     def get_data(self) -> pd.DataFrame:
         """
         Get the final processed data with topics and case text
+        
+        Saved step 1 and 2 outputs are reused when they exist and, with the
+        stage cache enabled, were built for the current year range and root
+        URL and from the current case list. Otherwise the step is rerun; both
+        resume from the fetch ledger, so only missing pages are fetched.
         """
 
         results = {}
 
-        if os.path.exists(self.data_dir / "supcourt_yearlist.pickle"):
-            results['case_urls'] = pd.read_pickle(self.data_dir / "supcourt_yearlist.pickle")
+        def reusable(stage, params):
+            return self.stage_cache is None or self._stage_is_current(stage, params)
+
+        if self.store.exists("supcourt_yearlist") and reusable("step1_get_case_urls", self._crawl_params()):
+            results['case_urls'] = self.store.read("supcourt_yearlist")
         else:
-            logger.warning("No case URLs found. Running step1_get_case_urls()...")
+            logger.warning("No case URLs for the current year range found. Running step1_get_case_urls()...")
             results['case_urls'] = self.step1_get_case_urls()
-        if os.path.exists(self.data_dir / "full_proj_preproc.pickle"):
-            results['full_cases'] = pd.read_pickle(self.data_dir / "full_proj_preproc.pickle")
+        failed_fetches = self.ledger.status_counts().get('error', 0)
+        if (self.store.exists("full_proj_preproc") and not failed_fetches
+                and reusable("step2_extract_case_text", self._extractor_params())):
+            # Columnar storage leaves the case text on disk for step 3 to stream
+            columns = ['case_url', 'docket'] if self.store.columnar else None
+            results['full_cases'] = self.store.read("full_proj_preproc", columns=columns)
+        elif failed_fetches:
+            logger.warning(f"{failed_fetches} cases failed to fetch previously. Running step2_extract_case_text()...")
+            results['full_cases'] = self.step2_extract_case_text()
         else:
             logger.warning("No full cases found. Running step2_extract_case_text()...")
             results['full_cases'] = self.step2_extract_case_text()
         
         return results
 
-    def run_full_pipeline(self, n_topics: int = 30) -> Dict:
+    def update_data(self, rescan_recent_years: int = 1) -> Dict:
+        """
+        Discover cases added since the last run and fetch only those
+        """
+        known_urls = set()
+        if self.store.exists("full_proj_preproc"):
+            known_urls = set(self.store.read("full_proj_preproc", columns=['case_url'])['case_url'])
+        
+        results = {}
+        results['case_urls'] = self.step1_get_case_urls(rescan_recent_years=rescan_recent_years)
+        new_urls = results['case_urls'].loc[~results['case_urls']['case_url'].isin(known_urls), 'case_url']
+        logger.info(f"Incremental update: {len(new_urls)} cases not in the stored corpus")
+        
+        # Fetch only the new cases; earlier transient failures are retried by a full run (get_data)
+        results['full_cases'] = self.step2_extract_case_text(urls=new_urls)
+        return results
+    
+    def process_shard(self, streaming: bool = False) -> Dict:
+        """
+        Steps 1-3 for the shard this modeler owns, leaving mergeable artifacts
+        
+        The shard's token-ID corpus (vocabulary, document and term
+        frequencies), lemmatized and case-text outputs stay in data_dir, and
+        shard.json records what they were built from, for merge_shards.
+        Both shard.json and the token-ID corpus record the sha256 of the
+        lemmatized corpus, so the shard stays verifiable after it is copied
+        to another host (file times are not preserved by every copy).
+        """
+        if streaming:
+            self.step1_get_case_urls()
+            self.stream_cases()
+        else:
+            self.get_data()
+            if self.dedupe:
+                self.dedupe_cases()
+            self.step3_preprocess_text()
+        
+        corpus = self.load_token_corpus()
+        lemmatized_sha256 = file_sha256(self.store.path("full_proj_lemmatized"))
+        if corpus.source.get('sha256') != lemmatized_sha256:
+            # Adding the hash leaves step 3 current, so keep the stage cache in step with it
+            _, outputs = self._stage_artifacts("step3_preprocess_text")
+            refresh = self.stage_cache is not None and self.stage_cache.outputs_unchanged(
+                "step3_preprocess_text", outputs)
+            corpus.source = {**corpus.source, 'sha256': lemmatized_sha256}
+            corpus.save_header(self.data_dir / "token_corpus")
+            if refresh:
+                self.stage_cache.refresh_outputs("step3_preprocess_text", outputs)
+        manifest = {
+            'data_dir': str(self.data_dir),
+            'start_year': self.start_year,
+            'end_year': self.end_year,
+            'root_url': self.root_url,
+            'shard_index': self.shard_index,
+            'shard_count': self.shard_count,
+            'storage': self.store.format,
+            'tokenizer': self._tokenizer_params(),
+            'n_docs': corpus.n_docs,
+            'vocabulary_size': len(corpus.vocabulary),
+            'lemmatized_sha256': lemmatized_sha256,
+        }
+        with open(self.data_dir / "shard.json", 'w') as f:
+            json.dump(manifest, f, indent=2)
+        logger.info(f"Shard complete: {corpus.n_docs} documents, {len(corpus.vocabulary)} distinct tokens "
+                    f"in {self.data_dir}")
+        return manifest
+    
+    def _shard_settings(self) -> Dict:
+        """Constructor arguments shard workers share with this modeler (see run_shard)"""
+        extractor = next((name for name, cls in EXTRACTORS.items() if type(self.extractor) is cls), self.extractor)
+        return {
+            'root_url': self.root_url,
+            'max_workers': self.max_workers,
+            'requests_per_second': self.requests_per_second,
+            'http_cache': self.http_cache is not None,
+            'n_jobs': self.n_jobs,
+            'spacy_batch_size': self.spacy_batch_size,
+            'tokenizer': self.tokenizer,
+            'storage': self.store.format,
+            'stage_cache': self.stage_cache is not None,
+            'extractor': extractor,
+            'dedupe': self.dedupe,
+            'nlp_data_dir': self.nlp_data_dir,
+            'download_nlp_data': self.download_nlp_data,
+        }
+    
+    @profiled_stage(count_documents=lambda self, manifests: sum(manifest['n_docs'] for manifest in manifests))
+    def run_shards(self, n_shards: int, partition: str = "years", streaming: bool = False,
+                   max_processes: Optional[int] = None) -> List[Dict]:
+        """
+        Run steps 1-3 as n_shards independent shard workers in local processes
+        
+        partition="years" splits start_year..end_year into contiguous year
+        ranges; partition="hash" gives every shard the whole range and a
+        hash partition of the case URLs (each shard then scans every year
+        page, but cases are spread evenly). Shards run in data_dir/shards
+        with this modeler's settings; the per-host request rate is divided
+        among concurrently running shards. Returns the shard manifests.
+        
+        On a cluster, run pipeline.py shard on each host instead and
+        merge the copied shard directories with merge_shards.
+        """
+        if partition not in ("years", "hash"):
+            raise ValueError(f"Unknown shard partition {partition!r}. Choose 'years' or 'hash'.")
+        n_years = self.end_year - self.start_year + 1
+        if partition == "years":
+            n_shards = min(n_shards, n_years)
+        max_processes = min(max_processes or n_shards, n_shards)
+        
+        settings = self._shard_settings()
+        settings['requests_per_second'] = self.requests_per_second / max_processes
+        shards_dir = self.data_dir / "shards"
+        shards_dir.mkdir(exist_ok=True)
+        specs = []
+        for i in range(n_shards):
+            spec = {**settings, 'data_dir': str(shards_dir / f"shard-{i:03d}"), 'streaming': streaming}
+            if partition == "years":
+                spec['start_year'] = self.start_year + i * n_years // n_shards
+                spec['end_year'] = self.start_year + (i + 1) * n_years // n_shards - 1
+            else:
+                spec.update(start_year=self.start_year, end_year=self.end_year, shard_index=i, shard_count=n_shards)
+            specs.append(spec)
+        
+        logger.info(f"Running {n_shards} shards ({partition} partition) in {max_processes} processes...")
+        with ProcessPoolExecutor(max_workers=max_processes) as executor:
+            manifests = list(executor.map(_run_shard_spec, specs))
+        for manifest in manifests:
+            logger.info(f"  {manifest['data_dir']}: years {manifest['start_year']}-{manifest['end_year']}, "
+                        f"{manifest['n_docs']} documents")
+        return manifests
+    
+    @profiled_stage()
+    def merge_shards(self, shard_dirs: Iterable[str]) -> pd.DataFrame:
+        """
+        Coordinator step: reduce finished shards into this modeler's step 3 outputs
+        
+        The shards' token-ID corpora are merged (vocabularies unioned,
+        document and term frequencies summed) and their case lists, case
+        text and lemmatized outputs concatenated in shard order, so steps
+        4 and 5 then fit the global TF-IDF and topic model as usual. Shards
+        must have been tokenized the same way and cover disjoint cases.
+        """
+        logger.info("Merging shards...")
+        shards = []
+        for shard_dir in map(Path, shard_dirs):
+            manifest_file = shard_dir / "shard.json"
+            if not manifest_file.exists():
+                raise ValueError(f"{shard_dir} is not a finished shard (no shard.json). Run run_shard() on it first.")
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+            store = CorpusStore(shard_dir, format=manifest['storage'])
+            corpus = TokenCorpus.load(shard_dir / "token_corpus")
+            lemmatized_sha256 = file_sha256(store.path("full_proj_lemmatized"))
+            if not lemmatized_sha256 == manifest.get('lemmatized_sha256') == (corpus.source or {}).get('sha256'):
+                raise ValueError(f"Token-ID corpus in {shard_dir} does not match its lemmatized corpus. "
+                                 f"Rerun the shard.")
+            shards.append((shard_dir, manifest, store, corpus))
+        if not shards:
+            raise ValueError("No shards to merge.")
+        
+        tokenizers = {json.dumps(manifest['tokenizer'], sort_keys=True) for _, manifest, _, _ in shards}
+        if len(tokenizers) > 1:
+            raise ValueError("Shards were tokenized with different settings and cannot be merged.")
+        if tokenizers != {json.dumps(self._tokenizer_params(), sort_keys=True)}:
+            raise ValueError("Shards were tokenized differently from this modeler. Use the shards' tokenizer settings.")
+        case_urls = [store.read("full_proj_lemmatized", columns=['case_url'] if store.columnar else None)['case_url']
+                     for _, _, store, _ in shards]
+        all_urls = pd.concat(case_urls, ignore_index=True)
+        if all_urls.duplicated().any():
+            raise ValueError(f"{all_urls.duplicated().sum()} cases appear in more than one shard. "
+                             f"Shards must cover disjoint year ranges or hash partitions.")
+        
+        def concatenated(name, columns=None):
+            for _, _, store, _ in shards:
+                if store.exists(name):
+                    yield from store.iter_batches(name, columns=columns)
+        
+        self.store.write_frames("supcourt_yearlist", concatenated("supcourt_yearlist"))
+        self.store.write_frames("full_proj_preproc",
+                                concatenated("full_proj_preproc", ['case_url', 'docket', 'case_text']))
+        if all(store.exists("full_proj_dedup") for _, _, store, _ in shards):
+            self.store.write_frames("full_proj_dedup", concatenated("full_proj_dedup"))
+        output_file = self.store.write_frames("full_proj_lemmatized", map(
+            self._lemmatized_frame, concatenated("full_proj_lemmatized")))
+        
+        corpus = TokenCorpus.merge((corpus for _, _, _, corpus in shards), source=self._lemmatized_source())
+        token_corpus_dir = corpus.save(self.data_dir / "token_corpus")
+        logger.info(f"Merged {len(shards)} shards: {corpus.n_docs} documents, {len(corpus.vocabulary)} distinct "
+                    f"tokens. Saved to {output_file} and {token_corpus_dir}")
+        
+        self.case_urls_df = None
+        self.full_cases_df = None
+        self.processed_df = self.store.read("full_proj_lemmatized")
+        return self.processed_df
+    
+    def run_full_pipeline(self, n_topics: int = 30, incremental: bool = False, out_of_core: bool = False,
+                          profile: bool = False, trace_memory: bool = False,
+                          prometheus_file: Optional[str] = None, streaming: bool = False, shards: int = 1,
+                          shard_partition: str = "years", shard_dirs: Optional[List[str]] = None) -> Dict:
         """
         Run the complete pipeline from start to finish
+        
+        With incremental=True, only newly discovered cases are fetched,
+        tokenized and labeled with the saved topic model, and the visualization
+        outputs are updated in place. out_of_core=True streams step 4 from disk.
+        streaming=True runs steps 2 and 3 as one overlapped pass (see
+        stream_cases) instead of one after the other. shards > 1 runs steps
+        1-3 as that many shard workers in local processes (see run_shards);
+        shard_dirs merges shards already run elsewhere instead. Either way
+        the shards are merged (merge_shards) before steps 4 and 5.
+        
+        Every step is measured (see RunProfiler) and the metrics are written to
+        run_report.json in the data directory, and to prometheus_file in
+        Prometheus text format if given, even when a step fails. profile=True
+        adds cProfile output per step, trace_memory=True tracemalloc statistics.
         """
         logger.info("Starting complete Supreme Court topic modeling pipeline...")
         
-        results = {}
-        results = self.get_data()
+        self.profiler = RunProfiler(self.run_counters, cprofile=profile, trace_memory=trace_memory,
+                                    profile_dir=self.data_dir / "profiles")
+        run_info = {'n_topics': n_topics, 'incremental': incremental, 'out_of_core': out_of_core,
+                    'streaming': streaming, 'shards': len(shard_dirs) if shard_dirs else shards,
+                    'storage': self.store.format, 'n_jobs': self.n_jobs, 'status': 'failed'}
         try:
-            
-            # Step 3: Preprocess text
-            results['processed_cases'] = self.step3_preprocess_text()
+            if (shards > 1 or shard_dirs) and incremental:
+                raise ValueError("Sharded runs do not support incremental mode.")
+            if shards > 1 and not shard_dirs:
+                manifests = self.run_shards(shards, partition=shard_partition, streaming=streaming)
+                shard_dirs = [manifest['data_dir'] for manifest in manifests]
+            if shard_dirs:
+                # Steps 1-3 ran per shard; reduce them into the global corpus
+                results = {'shards': shard_dirs}
+                results['processed_cases'] = self.merge_shards(shard_dirs)
+            elif streaming:
+                if incremental:
+                    raise ValueError("Streaming mode does not support incremental runs.")
+                # Steps 1-3, with fetching, tokenizing and indexing overlapped
+                results = {'case_urls': self.step1_get_case_urls()}
+                results['processed_cases'] = self.stream_cases()
+            else:
+                results = self.update_data() if incremental else self.get_data()
+                
+                # Merge near-duplicate cases and strip boilerplate
+                if self.dedupe:
+                    results['deduplicated_cases'] = self.dedupe_cases(incremental=incremental)
+                
+                # Step 3: Preprocess text
+                results['processed_cases'] = self.step3_preprocess_text(incremental=incremental)
             
             # Step 4: Topic modeling
-            results['topic_modeled'], results['topic_words'] = self.step4_topic_modeling(n_topics=n_topics)
+            results['topic_modeled'], results['topic_words'] = self.step4_topic_modeling(
+                n_topics=n_topics, incremental=incremental, out_of_core=out_of_core)
             
             # Step 5: Prepare visualization data
-            results['visualization_data'] = self.step5_prepare_visualization_data()
+            results['visualization_data'] = self.step5_prepare_visualization_data(incremental=incremental)
             
             logger.info("Pipeline completed successfully!")
             # Print summary
@@ -684,30 +4148,379 @@ class SupremeCourtTopicModeler:
             - Data saved to: {self.data_dir}
             """)
             
+            run_info['status'] = 'ok'
             return results
             
         except Exception as e:
             logger.error(f"Pipeline failed at step: {e}")
             raise
+        finally:
+            report_file = self.profiler.write_report(self.data_dir / "run_report.json", **run_info)
+            logger.info(f"Run report saved to {report_file}")
+            if prometheus_file:
+                self.profiler.write_prometheus(prometheus_file)
+            self.profiler = None
+
+
+def run_shard(data_dir: str, start_year: int, end_year: int, shard_index: int = 0, shard_count: int = 1,
+              streaming: bool = False, **modeler_kwargs) -> Dict:
+    """
+    Shard worker: steps 1-3 for one shard of the corpus in its own data_dir
+    
+    A shard is a year range, optionally narrowed to the cases whose URL
+    hash falls in partition shard_index of shard_count. Returns the
+    shard manifest (also saved as shard.json) for merge_shards.
+    """
+    modeler = SupremeCourtTopicModeler(data_dir=data_dir, start_year=start_year, end_year=end_year,
+                                       shard_index=shard_index, shard_count=shard_count, **modeler_kwargs)
+    return modeler.process_shard(streaming=streaming)
+
+
+def _run_shard_spec(spec: Dict) -> Dict:
+    return run_shard(**spec)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent classify calls into one batched TopicModel.transform
+    
+    A single background thread takes the first waiting request, then keeps
+    collecting for up to max_wait seconds or until max_batch_size documents
+    are queued, vectorizes them as one sparse matrix and hands each caller
+    its slice of the document-topic weights.
+    """
+    
+    def __init__(self, model: TopicModel, max_batch_size: int = 64, max_wait: float = 0.005):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.documents = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="topic-microbatcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for classification; the future resolves to their document-topic rows"""
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+    
+    def _collect(self) -> List[Tuple[List[str], Future]]:
+        pending = [self._queue.get()]
+        n_docs = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while n_docs < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            n_docs += len(pending[-1][0])
+        return pending
+    
+    def _run(self):
+        while True:
+            pending = self._collect()
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                doc_topic = self.model.transform(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.documents += len(texts)
+            offset = 0
+            for request_texts, future in pending:
+                future.set_result(doc_topic[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+
+class TopicInferenceService:
+    """
+    Answers classify requests from the step 4 artifacts of a data directory
+    
+    Raw text is labeled through a MicroBatcher over the saved TopicModel.
+    A case_url already in the corpus is answered from the saved
+    document-topic matrix without any inference. Both are memory-mapped, so
+    forked workers share one copy of the model.
+    
+    Without a saved tokenizer the default one is built, with NLTK stopwords
+    looked up in nlp_data_dir and NLTK's search path; they are downloaded
+    only if download_nlp_data is set, so starting a worker stays offline.
+    """
+    
+    def __init__(self, data_dir, tokenizer=None, top_k: int = 3, max_batch_size: int = 64,
+                 max_wait: float = 0.005, nlp_data_dir: Optional[str] = None, download_nlp_data: bool = False):
+        model_dir = Path(data_dir) / "topic_model"
+        if tokenizer is None:
+            tokenizer = TopicModel.load_tokenizer(model_dir)
+            if tokenizer is None:
+                logger.warning(f"No tokenizer saved with the model in {model_dir}; using the default tokenizer")
+                tokenizer = make_tokenizer("auto", legal_stoplist(nlp_data_dir=nlp_data_dir,
+                                                                  download=download_nlp_data))
+        self.model = TopicModel.load(model_dir, mmap=True, tokenizer=tokenizer)
+        self.top_k = top_k
+        self.batcher = MicroBatcher(self.model, max_batch_size=max_batch_size, max_wait=max_wait)
+        try:
+            document_topics = load_document_topics(data_dir, mmap=True)
+            self.case_matrix = document_topics['matrix']
+            self.case_index = {url: row for row, url in enumerate(document_topics['case_url'])}
+        except ValueError:
+            logger.warning("No saved document-topic matrix; case_url lookups are disabled")
+            self.case_matrix = None
+            self.case_index = {}
+    
+    def _describe(self, doc_topic: np.ndarray, top_k: int) -> List[Dict]:
+        assignment = assign_topics(doc_topic, top_k=top_k)
+        return [
+            {
+                'topic_number': int(topic),
+                'topic_strength': float(strength),
+                'topic_words': self.model.topic_words.get(int(topic), ''),
+                'topic_mixture': [
+                    {'topic_number': int(t), 'weight': float(w)} for t, w in zip(top_topics, top_weights)
+                ],
+            }
+            for topic, strength, top_topics, top_weights in zip(
+                assignment['topic_number'], assignment['topic_strength'],
+                assignment['top_topics'], assignment['top_weights'])
+        ]
+    
+    def classify(self, payload: Dict) -> Tuple[int, Dict]:
+        """
+        Handle one request body: {"text": ...}, {"texts": [...]} or {"case_url": ...},
+        with an optional "top_k". Returns (HTTP status, response body).
+        """
+        if not isinstance(payload, dict):
+            return 400, {'error': 'request body must be a JSON object'}
+        top_k = payload.get('top_k', self.top_k)
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or not 1 <= top_k <= self.model.n_topics:
+            return 400, {'error': f'"top_k" must be an integer from 1 to {self.model.n_topics}'}
+        if 'case_url' in payload:
+            if not isinstance(payload['case_url'], str):
+                return 400, {'error': '"case_url" must be a string'}
+            row = self.case_index.get(payload['case_url'])
+            if row is None:
+                return 404, {'error': f"case_url not in corpus: {payload['case_url']}"}
+            result = self._describe(np.asarray(self.case_matrix[row:row + 1]), top_k)[0]
+            return 200, {'case_url': payload['case_url'], **result}
+        
+        texts = payload.get('texts', [payload['text']] if 'text' in payload else None)
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return 400, {'error': 'expected "text", "texts" (list of strings) or "case_url"'}
+        results = self._describe(self.batcher.submit(texts).result(), top_k) if texts else []
+        return 200, results[0] if 'text' in payload else {'results': results}
+    
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'n_topics': self.model.n_topics,
+            'vocabulary_size': len(self.model.vocabulary),
+            'corpus_cases': len(self.case_index),
+            'batches': self.batcher.batches,
+            'documents': self.batcher.documents,
+        }
+
+
+class _InferenceRequestHandler(BaseHTTPRequestHandler):
+    """POST /classify and GET /health, delegating to server.service"""
+    
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': 'not found'})
+    
+    def do_POST(self):
+        if self.path != '/classify':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError as e:
+            self._send_json(400, {'error': f'invalid JSON: {e}'})
+            return
+        try:
+            self._send_json(*self.server.service.classify(payload))
+        except Exception as e:
+            logger.error(f"Classification failed: {e}")
+            self._send_json(500, {'error': str(e)})
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve_topic_model(data_dir: str = "supreme_court_data", host: str = "127.0.0.1", port: int = 8000,
+                      workers: int = 1, tokenizer=None, top_k: int = 3, max_batch_size: int = 64,
+                      max_wait_ms: float = 5.0, nlp_data_dir: Optional[str] = None, download_nlp_data: bool = False):
+    """
+    Run the topic inference HTTP service on the step 4 artifacts in data_dir
+    
+    Raw text is tokenized with the tokenizer saved with the model unless
+    tokenizer (a name from TOKENIZERS, "auto" or a callable) overrides it.
+    NLTK stopwords for a built tokenizer are only downloaded when
+    download_nlp_data is set (see TopicInferenceService).
+    With workers > 1 the listening socket is bound once and the process forks
+    (POSIX only); every worker memory-maps the same model files.
+    """
+    if tokenizer is not None and not callable(tokenizer):
+        tokenizer = make_tokenizer(tokenizer, legal_stoplist(nlp_data_dir=nlp_data_dir, download=download_nlp_data))
+    server = ThreadingHTTPServer((host, port), _InferenceRequestHandler)
+    server.daemon_threads = True
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = None
+            break
+        children.append(pid)
+    
+    # Batcher threads do not survive fork, so each worker builds its own service
+    server.service = TopicInferenceService(data_dir, tokenizer=tokenizer, top_k=top_k, max_batch_size=max_batch_size,
+                                           max_wait=max_wait_ms / 1000, nlp_data_dir=nlp_data_dir,
+                                           download_nlp_data=download_nlp_data)
+    logger.info(f"Topic inference service (pid {os.getpid()}) listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pid in children or []:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+
+
+def serve_main(argv: Optional[List[str]] = None):
+    """Command-line entry point: python pipeline.py serve [options]"""
+    arg_parser = argparse.ArgumentParser(prog="pipeline.py serve", description=serve_topic_model.__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--data-dir", default="supreme_court_data", help="directory with step 4 output")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8000)
+    arg_parser.add_argument("--workers", type=int, default=1, help="forked worker processes sharing the socket")
+    arg_parser.add_argument("--tokenizer", choices=["auto"] + sorted(TOKENIZERS),
+                            help="override the tokenizer saved with the model")
+    arg_parser.add_argument("--top-k", type=int, default=3, help="topics returned in each mixture")
+    arg_parser.add_argument("--max-batch-size", type=int, default=64, help="documents per batched transform")
+    arg_parser.add_argument("--max-wait-ms", type=float, default=5.0, help="time to wait while filling a batch")
+    arg_parser.add_argument("--nlp-data-dir", help="directory searched first for NLTK data")
+    arg_parser.add_argument("--download-nlp-data", action="store_true",
+                            help="download NLTK stopwords if they are not found locally")
+    args = arg_parser.parse_args(argv)
+    serve_topic_model(data_dir=args.data_dir, host=args.host, port=args.port, workers=args.workers,
+                      tokenizer=args.tokenizer, top_k=args.top_k, max_batch_size=args.max_batch_size,
+                      max_wait_ms=args.max_wait_ms, nlp_data_dir=args.nlp_data_dir,
+                      download_nlp_data=args.download_nlp_data)
 
 
-def main():
+def shard_main(argv: Optional[List[str]] = None):
+    """Command-line entry point: python pipeline.py shard [options] (one shard worker)"""
+    arg_parser = argparse.ArgumentParser(prog="pipeline.py shard", description=run_shard.__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--data-dir", required=True, help="directory for this shard's outputs")
+    arg_parser.add_argument("--start-year", type=int, required=True)
+    arg_parser.add_argument("--end-year", type=int, required=True)
+    arg_parser.add_argument("--shard-index", type=int, default=0, help="hash partition of the case URLs to keep")
+    arg_parser.add_argument("--shard-count", type=int, default=1, help="number of hash partitions (1: whole range)")
+    arg_parser.add_argument("--root-url", default="http://caselaw.findlaw.com/court/us-supreme-court/years/")
+    arg_parser.add_argument("--storage", default="auto", choices=["auto", "pickle", "parquet"])
+    arg_parser.add_argument("--tokenizer", default="auto", choices=["auto"] + sorted(TOKENIZERS))
+    arg_parser.add_argument("--requests-per-second", type=float, default=5.0,
+                            help="per-host request rate of this shard")
+    arg_parser.add_argument("--no-dedupe", action="store_true", help="skip near-duplicate merging within the shard")
+    arg_parser.add_argument("--streaming", action="store_true", help="overlap steps 2 and 3 (see stream_cases)")
+    args = arg_parser.parse_args(argv)
+    manifest = run_shard(args.data_dir, args.start_year, args.end_year, shard_index=args.shard_index,
+                         shard_count=args.shard_count, streaming=args.streaming, root_url=args.root_url,
+                         storage=args.storage, tokenizer=args.tokenizer,
+                         requests_per_second=args.requests_per_second, dedupe=not args.no_dedupe)
+    print(json.dumps(manifest, indent=2))
+
+
+def merge_main(argv: Optional[List[str]] = None):
+    """Command-line entry point: python pipeline.py merge [options] SHARD_DIR... (coordinator)"""
+    arg_parser = argparse.ArgumentParser(
+        prog="pipeline.py merge", description="Merge finished shards, then run steps 4 and 5 on the whole corpus")
+    arg_parser.add_argument("shard_dirs", nargs="+", help="shard directories written by pipeline.py shard")
+    arg_parser.add_argument("--data-dir", default="supreme_court_data", help="directory for the merged outputs")
+    arg_parser.add_argument("--start-year", type=int, default=1760)
+    arg_parser.add_argument("--end-year", type=int, default=2018)
+    arg_parser.add_argument("--storage", default="auto", choices=["auto", "pickle", "parquet"])
+    arg_parser.add_argument("--tokenizer", default="auto", choices=["auto"] + sorted(TOKENIZERS),
+                            help="tokenizer the shards used")
+    arg_parser.add_argument("--n-topics", type=int, default=20)
+    arg_parser.add_argument("--out-of-core", action="store_true", help="run step 4 out of core")
+    args = arg_parser.parse_args(argv)
+    modeler = SupremeCourtTopicModeler(data_dir=args.data_dir, start_year=args.start_year, end_year=args.end_year,
+                                       storage=args.storage, tokenizer=args.tokenizer)
+    modeler.run_full_pipeline(n_topics=args.n_topics, out_of_core=args.out_of_core, shard_dirs=args.shard_dirs)
+
+
+# Subcommands of python pipeline.py; without one the full pipeline runs
+COMMANDS = {
+    "serve": serve_main,
+    "shard": shard_main,
+    "merge": merge_main,
+}
+
+
+def main(argv: Optional[List[str]] = None):
     """
     Run the complete Supreme Court topic modeling pipeline
     """
-    # Initialize the pipeline with a reasonable range
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    
+    arg_parser = argparse.ArgumentParser(
+        prog="pipeline.py", description="Run the complete Supreme Court topic modeling pipeline (steps 1-5).",
+        epilog="Other commands: pipeline.py serve|shard|merge --help")
+    arg_parser.add_argument("--data-dir", default="supreme_court_data")
+    arg_parser.add_argument("--start-year", type=int, default=1950)
+    arg_parser.add_argument("--end-year", type=int, default=2020)
+    arg_parser.add_argument("--n-topics", type=int, default=20)
+    arg_parser.add_argument("--storage", default="pickle", choices=["auto", "pickle", "parquet"])
+    arg_parser.add_argument("--tokenizer", default="auto", choices=["auto"] + sorted(TOKENIZERS))
+    arg_parser.add_argument("--incremental", action="store_true", help="fetch and label only new cases")
+    arg_parser.add_argument("--out-of-core", action="store_true", help="run step 4 out of core")
+    arg_parser.add_argument("--streaming", action="store_true", help="overlap steps 2 and 3 (see stream_cases)")
+    arg_parser.add_argument("--shards", type=int, default=1, help="run steps 1-3 as this many local shards")
+    args = arg_parser.parse_args(argv)
+    
+    # Initialize the pipeline (1950-2020 is a good range for substantial analysis)
     pipeline = SupremeCourtTopicModeler(
-        data_dir="supreme_court_data",
-        start_year=1950,  # Good range for substantial analysis
-        end_year=2020
+        data_dir=args.data_dir,
+        start_year=args.start_year,
+        end_year=args.end_year,
+        storage=args.storage,
+        tokenizer=args.tokenizer,
     )
     
     logger.info("Starting complete Supreme Court topic modeling pipeline...")
-    logger.info(f"Date range: {1950}-{2020}")
+    logger.info(f"Date range: {args.start_year}-{args.end_year}")
     
     try:
         # Run the complete pipeline
-        results = pipeline.run_full_pipeline(n_topics=20)
+        results = pipeline.run_full_pipeline(n_topics=args.n_topics, incremental=args.incremental,
+                                             out_of_core=args.out_of_core, streaming=args.streaming,
+                                             shards=args.shards)
         
         logger.info("🎉 Pipeline completed successfully!")
         
@@ -719,14 +4532,15 @@ def main():
         📊 Final Results Summary:
         ==========================================
         Total cases processed: {len(final_df):,}
-        Number of topics identified: {20}
+        Number of topics identified: {args.n_topics}
         
         📁 Output files created:
-        - supreme_court_data/supcourt_yearlist.csv (case URLs)
-        - supreme_court_data/topic_modeled_cases.pickle (full results)
-        - supreme_court_data/topic_words.json (topic definitions)
-        - supreme_court_data/visualization_data.csv (D3.js ready)
-        - supreme_court_data/yearly_totals.csv (for brushing viz)
+        - {args.data_dir}/supcourt_yearlist.csv (case URLs)
+        - {pipeline.store.path("topic_modeled_cases")} (full results)
+        - {args.data_dir}/topic_words.json (topic definitions)
+        - {args.data_dir}/topic_model/ (saved model for classify_texts)
+        - {args.data_dir}/visualization_data.csv (D3.js ready)
+        - {args.data_dir}/yearly_totals.csv (for brushing viz)
         
         🏷️  Top 5 Most Common Topics:
         """)
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# pipeline.py and the benchmark fixtures are plain modules, not an installed package
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fixture_server import start_fixture_server  # noqa: E402
+from pipeline import SupremeCourtTopicModeler  # noqa: E402
+from synthetic_corpus import SyntheticCorpus  # noqa: E402
+
+
+@pytest.fixture
+def fixture_server():
+    """A small synthetic corpus served over HTTP on localhost"""
+    corpus = SyntheticCorpus(12, words_per_doc=50, n_years=2)
+    server, _ = start_fixture_server(corpus)
+    yield corpus, server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_modeler(tmp_path):
+    """
+    Factory for an offline SupremeCourtTopicModeler in tmp_path (or data_dir)
+    
+    Tokenizes with the regex tokenizer, without NLTK downloads, rate
+    limiting or dedupe; site, a (corpus, server) pair from fixture_server,
+    points the crawl at that server. Other keyword arguments override the
+    defaults.
+    """
+    def make(data_dir=None, site=None, **kwargs):
+        options = {'tokenizer': "regex", 'download_nlp_data': False, 'dedupe': False, 'requests_per_second': 0}
+        if site is not None:
+            corpus, server = site
+            options.update(start_year=corpus.start_year, end_year=corpus.end_year, root_url=server.root_url)
+        options.update(kwargs)
+        return SupremeCourtTopicModeler(data_dir=str(data_dir or tmp_path), **options)
+    return make
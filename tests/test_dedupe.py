@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from pipeline import MinHasher, lsh_clusters, shingle_hashes
+
+
+def random_words(rng, n_words):
+    return [f"w{i}" for i in rng.randint(0, 5000, size=n_words)]
+
+
+def perturbed(words, rng, fraction=0.02):
+    words = list(words)
+    for i in rng.choice(len(words), size=int(len(words) * fraction), replace=False):
+        words[i] = "changed"
+    return words
+
+
+def signatures(documents, num_perm=128):
+    hasher = MinHasher(num_perm=num_perm)
+    return np.array([hasher.signature(shingle_hashes(words)) for words in documents])
+
+
+@pytest.fixture
+def corpus():
+    """Twenty unrelated documents followed by a near-duplicate of document 4"""
+    rng = np.random.RandomState(0)
+    documents = [random_words(rng, 400) for _ in range(20)]
+    documents.append(perturbed(documents[4], rng))
+    return documents
+
+
+def test_shingles_are_stable_and_order_sensitive():
+    words = "the court affirmed the judgment below".split()
+    assert len(shingle_hashes(words, 3)) == 4
+    assert np.array_equal(shingle_hashes(words, 3), shingle_hashes(list(words), 3))
+    assert not np.array_equal(shingle_hashes(words, 3), shingle_hashes(words[::-1], 3))
+    assert len(shingle_hashes(words[:2], 5)) == 1
+    assert len(shingle_hashes([], 5)) == 0
+
+
+def test_signature_agreement_estimates_jaccard_similarity():
+    shingles = np.arange(1500, dtype=np.uint64) * np.uint64(2654435761)
+    hasher = MinHasher(num_perm=256)
+    # Two sets of 1000 shingles sharing 500: Jaccard similarity 500 / 1500
+    estimate = (hasher.signature(shingles[:1000]) == hasher.signature(shingles[500:])).mean()
+    assert abs(estimate - 500 / 1500) < 0.08
+    assert (hasher.signature(shingles) == hasher.signature(shingles[::-1])).all()
+
+
+def test_signature_does_not_depend_on_chunk_size():
+    shingles = shingle_hashes(random_words(np.random.RandomState(3), 10000))
+    expected = MinHasher(num_perm=64, chunk_size=len(shingles)).signature(shingles)
+    for chunk_size in (1, 1000, 4096):
+        assert np.array_equal(MinHasher(num_perm=64, chunk_size=chunk_size).signature(shingles), expected)
+
+
+def test_near_duplicate_pair_is_recovered(corpus):
+    representative, similarity = lsh_clusters(signatures(corpus), bands=16, threshold=0.8)
+    expected = np.arange(len(corpus))
+    expected[20] = 4
+    assert representative.tolist() == expected.tolist()
+    assert 0.8 <= similarity[20] < 1.0
+    assert (np.delete(similarity, 20) == 1.0).all()
+
+
+def test_invalid_rows_never_merge(corpus):
+    valid = np.ones(len(corpus), dtype=bool)
+    valid[20] = False
+    representative, _ = lsh_clusters(signatures(corpus), valid=valid)
+    assert representative.tolist() == list(range(len(corpus)))
+
+
+def test_new_rows_join_fixed_representatives(corpus):
+    rng = np.random.RandomState(1)
+    # Row 0 is a new near-duplicate of the already kept row 5
+    documents = [perturbed(corpus[5], rng)] + corpus[:20]
+    fixed = np.zeros(len(documents), dtype=bool)
+    fixed[1:] = True
+    representative, _ = lsh_clusters(signatures(documents), fixed=fixed)
+    expected = np.arange(len(documents))
+    expected[0] = 6
+    assert representative.tolist() == expected.tolist()
+
+
+def test_fixed_rows_are_not_merged_with_each_other(corpus):
+    fixed = np.ones(len(corpus), dtype=bool)
+    representative, _ = lsh_clusters(signatures(corpus), fixed=fixed)
+    assert representative.tolist() == list(range(len(corpus)))
+
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        lsh_clusters(np.zeros((2, 128), dtype=np.uint32), bands=10)
@@ -0,0 +1,58 @@
+import json
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+
+
+def test_interrupted_crawl_resumes_with_the_same_rows(tmp_path, fixture_server, make_modeler):
+    uninterrupted = make_modeler(tmp_path / "uninterrupted", site=fixture_server)
+    uninterrupted.step1_get_case_urls()
+    expected = uninterrupted.step2_extract_case_text()
+    
+    modeler = make_modeler(tmp_path / "resumed", site=fixture_server)
+    modeler.step1_get_case_urls()
+    fetch_case = modeler.fetch_case
+    calls = []
+    
+    def fetch_until_interrupted(url):
+        calls.append(url)
+        if len(calls) > 4:
+            raise ConnectionError("connection lost")
+        return fetch_case(url)
+    
+    modeler.fetch_case = fetch_until_interrupted
+    with pytest.raises(ConnectionError):
+        modeler.step2_extract_case_text(batch_size=4, max_workers=1)
+    fetched_before = modeler.ledger.fetched_urls()
+    assert len(fetched_before) == 4
+    modeler.ledger.close()
+    
+    resumed = make_modeler(tmp_path / "resumed", site=fixture_server)
+    assert resumed.ledger.completed_years() == uninterrupted.ledger.completed_years()
+    refetched = []
+    fetch_case = resumed.fetch_case
+    resumed.fetch_case = lambda url: refetched.append(url) or fetch_case(url)
+    result = resumed.step2_extract_case_text(batch_size=4, max_workers=1)
+    
+    assert set(refetched) == set(expected['case_url']) - fetched_before
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_failed_rescan_keeps_the_cases_found_before(tmp_path, fixture_server, make_modeler, monkeypatch):
+    corpus, server = fixture_server
+    modeler = make_modeler(site=fixture_server)
+    first = modeler.step1_get_case_urls()
+    year_count = len(corpus.cases_in_year(corpus.end_year))
+    
+    monkeypatch.setattr("pipeline.time.sleep", lambda seconds: None)
+    server.failing_paths.add(urlparse(server.root_url).path + str(corpus.end_year))
+    rescanned = modeler.step1_get_case_urls(rescan_recent_years=1)
+    
+    pd.testing.assert_frame_equal(rescanned, first)
+    pd.testing.assert_frame_equal(modeler.store.read("supcourt_yearlist"), first)
+    assert modeler.ledger.completed_years()[corpus.end_year] == year_count
+    with open(tmp_path / "supcourt_year_manifest.json") as f:
+        entry = json.load(f)['years'][-1]
+    assert entry['year'] == corpus.end_year and entry['case_count'] == year_count
+    assert entry['source'] == 'ledger' and entry['rescan_error']
@@ -0,0 +1,80 @@
+import requests
+
+from pipeline import HttpCache
+
+
+def make_response(url, body, etag=None):
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+def test_stored_response_is_served_from_cache(tmp_path):
+    cache = HttpCache(tmp_path)
+    url = "http://example.com/case.html"
+    cache.store(url, make_response(url, b"<p>opinion</p>", etag='"v1"'))
+    
+    entry = cache.lookup(url)
+    assert entry is not None and cache.is_fresh(entry)
+    assert HttpCache.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+    response = cache.load(entry)
+    assert response.content == b"<p>opinion</p>"
+    assert response.headers["ETag"] == '"v1"'
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert cache.lookup("http://example.com/other.html") is None
+
+
+def test_entries_survive_reopening(tmp_path):
+    url = "http://example.com/case.html"
+    HttpCache(tmp_path).store(url, make_response(url, b"body"))
+    cache = HttpCache(tmp_path)
+    assert cache.load(cache.lookup(url)).content == b"body"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HttpCache(tmp_path)
+    urls = [f"http://example.com/{i}.html" for i in range(4)]
+    for url in urls[:3]:
+        cache.store(url, make_response(url, url.encode() * 50))
+    entry_size = cache.total_bytes // 3
+    # Use the oldest entry so the second one is now least recently used
+    cache.load(cache.lookup(urls[0]))
+    cache.max_bytes = entry_size * 3 + entry_size // 2
+    cache.store(urls[3], make_response(urls[3], urls[3].encode() * 50))
+    
+    assert cache.lookup(urls[1]) is None
+    assert all(cache.lookup(url) is not None for url in (urls[0], urls[2], urls[3]))
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_missing_body_is_dropped_instead_of_raising(tmp_path):
+    cache = HttpCache(tmp_path)
+    url = "http://example.com/case.html"
+    cache.store(url, make_response(url, b"body"))
+    entry = cache.lookup(url)
+    cache._body_path(entry['key']).unlink()
+    
+    assert cache.load(entry) is None
+    assert cache.total_bytes == 0
+    assert cache.lookup(url) is None
+
+
+def test_stale_entries_are_revalidated(fixture_server, make_modeler):
+    corpus, server = fixture_server
+    modeler = make_modeler(site=fixture_server, cache_ttl=0)
+    url = server.root_url.split("/court/")[0] + corpus.case_path(0)
+    
+    first = modeler._fetch(url)
+    second = modeler._fetch(url)
+    
+    assert second.content == first.content
+    assert getattr(second, "from_cache", False)
+    cache = modeler.http_cache
+    assert (cache.misses, cache.revalidated, cache.hits) == (1, 1, 0)
+    assert modeler.run_counters()['http_requests'] == 2
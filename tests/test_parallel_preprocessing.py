@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from synthetic_corpus import SyntheticCorpus
+
+
+@pytest.fixture(scope="module")
+def cases():
+    return pd.concat(SyntheticCorpus(150, words_per_doc=200, seed=5).iter_frames(), ignore_index=True)
+
+
+def test_parallel_tokenization_matches_serial(cases, make_modeler):
+    modeler = make_modeler(n_jobs=1)
+    texts = cases['case_text']
+    serial = modeler._tokenize_series(texts, n_jobs=1)
+    assert modeler._tokenize_series(texts, n_jobs=2) == serial
+    with modeler._tokenizer_pool(2) as pool:
+        assert modeler._tokenize_series(texts, n_jobs=2, chunk_size=7, executor=pool) == serial
+
+
+@pytest.mark.parametrize("storage", ["pickle", "parquet"])
+def test_parallel_step3_matches_serial(tmp_path, cases, make_modeler, storage):
+    if storage == "parquet":
+        pytest.importorskip("pyarrow")
+    outputs = {}
+    for n_jobs in (1, 2):
+        modeler = make_modeler(tmp_path / f"{storage}{n_jobs}", n_jobs=n_jobs, storage=storage)
+        modeler.store.write_frames("full_proj_preproc", iter([cases]))
+        outputs[n_jobs] = (modeler.step3_preprocess_text(), modeler.load_token_corpus(mmap=False))
+    (serial, serial_corpus), (parallel, parallel_corpus) = outputs[1], outputs[2]
+    columns = ['case_url', 'docket', 'text_length', 'token_count', 'processed_text_str']
+    pd.testing.assert_frame_equal(parallel[columns], serial[columns])
+    assert parallel_corpus.vocabulary == serial_corpus.vocabulary
+    assert parallel_corpus.ids.tolist() == serial_corpus.ids.tolist()
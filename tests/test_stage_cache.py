@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from pipeline import StageCache, SupremeCourtTopicModeler
+from synthetic_corpus import SyntheticCorpus
+
+
+def test_changed_inputs_params_or_outputs_invalidate_a_stage(tmp_path):
+    cache = StageCache(tmp_path / "stage_manifest.json")
+    source = tmp_path / "input.txt"
+    output = tmp_path / "output.txt"
+    source.write_text("cases")
+    output.write_text("tokens")
+    key = cache.key("stage", [source], {'min_length': 2})
+    cache.record("stage", key, [output], {'min_length': 2})
+    
+    assert StageCache(cache.path).is_current("stage", key, [output])
+    assert not cache.is_current("stage", cache.key("stage", [source], {'min_length': 3}), [output])
+    
+    output.write_text("edited tokens")
+    assert not cache.is_current("stage", key, [output])
+    output.write_text("tokens")
+    assert cache.is_current("stage", key, [output])
+    
+    source.write_text("more cases")
+    assert not cache.is_current("stage", cache.key("stage", [source], {'min_length': 2}), [output])
+
+
+@pytest.fixture
+def cases():
+    return pd.concat(SyntheticCorpus(20, words_per_doc=80, seed=3).iter_frames(), ignore_index=True)
+
+
+def test_step3_reruns_only_when_its_parameters_change(cases, make_modeler, monkeypatch):
+    runs = []
+    preprocess_cases = SupremeCourtTopicModeler._preprocess_cases
+    
+    def counted(self, *args, **kwargs):
+        runs.append(self.tokenizer.min_length)
+        return preprocess_cases(self, *args, **kwargs)
+    
+    monkeypatch.setattr(SupremeCourtTopicModeler, "_preprocess_cases", counted)
+    
+    def step3(min_token_length):
+        return make_modeler(min_token_length=min_token_length).step3_preprocess_text()
+    
+    make_modeler().store.write_frames("full_proj_preproc", iter([cases]))
+    first = step3(2)
+    reused = step3(2)
+    assert runs == [2]
+    pd.testing.assert_frame_equal(reused, first)
+    
+    step3(3)
+    assert runs == [2, 3]
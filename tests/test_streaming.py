@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("storage", ["pickle", "parquet"])
+def test_streamed_corpus_matches_steps_2_and_3(tmp_path, fixture_server, make_modeler, storage):
+    if storage == "parquet":
+        pytest.importorskip("pyarrow")
+    outputs = {}
+    for mode in ("serial", "streamed"):
+        modeler = make_modeler(tmp_path / mode, site=fixture_server, storage=storage)
+        modeler.step1_get_case_urls()
+        if mode == "serial":
+            modeler.step2_extract_case_text()
+            modeler.step3_preprocess_text()
+        else:
+            modeler.stream_cases(batch_size=5)
+        outputs[mode] = (modeler.store.read("full_proj_preproc"), modeler.store.read("full_proj_lemmatized"),
+                         modeler.load_token_corpus(mmap=False))
+    
+    (serial_text, serial, serial_corpus), (streamed_text, streamed, streamed_corpus) = outputs.values()
+    pd.testing.assert_frame_equal(streamed_text[['case_url', 'docket', 'case_text']],
+                                  serial_text[['case_url', 'docket', 'case_text']])
+    columns = ['case_url', 'docket', 'text_length', 'token_count', 'processed_text_str']
+    pd.testing.assert_frame_equal(streamed[columns], serial[columns])
+    assert streamed_corpus.vocabulary == serial_corpus.vocabulary
+    assert streamed_corpus.offsets.tolist() == serial_corpus.offsets.tolist()
+    assert streamed_corpus.ids.tolist() == serial_corpus.ids.tolist()
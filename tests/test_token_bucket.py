@@ -0,0 +1,42 @@
+import threading
+import time
+
+from pipeline import TokenBucket
+
+
+def timed_acquires(bucket, n):
+    start = time.monotonic()
+    for _ in range(n):
+        bucket.acquire()
+    return time.monotonic() - start
+
+
+def test_burst_up_to_capacity_does_not_wait():
+    bucket = TokenBucket(rate=1, capacity=5)
+    assert timed_acquires(bucket, 5) < 0.1
+
+
+def test_acquires_beyond_capacity_are_paced_at_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    # One token is available up front; the next five arrive at 20 per second
+    assert timed_acquires(bucket, 6) >= 5 / 20 * 0.9
+
+
+def test_capacity_defaults_to_one_second_of_tokens():
+    assert TokenBucket(rate=8).capacity == 8
+    assert TokenBucket(rate=0.5).capacity == 1.0
+
+
+def test_non_positive_rate_disables_limiting():
+    assert timed_acquires(TokenBucket(rate=0), 1000) < 0.1
+
+
+def test_rate_is_shared_across_threads():
+    bucket = TokenBucket(rate=50, capacity=1)
+    threads = [threading.Thread(target=timed_acquires, args=(bucket, 5)) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 19 / 50 * 0.9
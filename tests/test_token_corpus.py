@@ -0,0 +1,110 @@
+import numpy as np
+
+from pipeline import TokenCorpus, TokenCorpusBuilder
+
+DOCUMENTS = [
+    ["court", "appeal", "court"],
+    ["jury", "verdict"],
+    [],
+    ["appeal", "jury", "jury", "remand"],
+]
+
+
+def build(documents, source=None):
+    builder = TokenCorpusBuilder()
+    builder.add_documents(documents)
+    return builder.build(source=source)
+
+
+def test_builder_assigns_ids_in_order_of_first_appearance():
+    corpus = build(DOCUMENTS)
+    assert corpus.vocabulary == ["court", "appeal", "jury", "verdict", "remand"]
+    assert corpus.n_docs == 4
+    assert corpus.offsets.tolist() == [0, 3, 5, 5, 9]
+    assert [corpus.tokens(i) for i in range(corpus.n_docs)] == DOCUMENTS
+
+
+def test_term_and_document_frequencies():
+    corpus = build(DOCUMENTS)
+    assert corpus.term_freq.tolist() == [2, 2, 3, 1, 1]
+    assert corpus.doc_freq.tolist() == [1, 2, 2, 1, 1]
+    counts = corpus.counts()
+    assert counts.shape == (4, 5)
+    assert counts[3].toarray().ravel().tolist() == [0, 1, 2, 0, 1]
+
+
+def test_builder_appends_to_an_existing_corpus_keeping_ids():
+    builder = TokenCorpusBuilder(build(DOCUMENTS[:2]))
+    builder.add_documents(DOCUMENTS[2:])
+    appended = builder.build()
+    whole = build(DOCUMENTS)
+    assert appended.vocabulary == whole.vocabulary
+    assert appended.ids.tolist() == whole.ids.tolist()
+    assert appended.doc_freq.tolist() == whole.doc_freq.tolist()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    corpus = build(DOCUMENTS, source={'sha256': 'abc'})
+    path = corpus.save(tmp_path / "token_corpus")
+    assert TokenCorpus.exists(path)
+    
+    for mmap in (True, False):
+        loaded = TokenCorpus.load(path, mmap=mmap)
+        assert loaded.vocabulary == corpus.vocabulary
+        assert loaded.source == {'sha256': 'abc'}
+        assert loaded.ids.dtype == np.int32
+        assert [loaded.tokens(i) for i in range(loaded.n_docs)] == DOCUMENTS
+        assert loaded.term_freq.tolist() == corpus.term_freq.tolist()
+        assert loaded.doc_freq.tolist() == corpus.doc_freq.tolist()
+    assert isinstance(TokenCorpus.load(path).ids, np.memmap)
+
+
+def test_feature_counts_match_counting_analyzed_tokens():
+    corpus = build(DOCUMENTS)
+    counts, features = corpus.feature_counts(lambda term: [term[:3]])
+    assert features == ["app", "cou", "jur", "rem", "ver"]
+    assert counts.toarray().tolist() == [[1, 2, 0, 0, 0], [0, 0, 1, 0, 1], [0, 0, 0, 0, 0], [1, 0, 2, 1, 0]]
+
+
+def random_documents(n_docs, seed=0):
+    rng = np.random.RandomState(seed)
+    words = [f"w{i}" for i in range(300)]
+    # Zipf-like draws so shards see overlapping and shard-specific vocabulary
+    return [[words[min(int(w), len(words)) - 1] for w in rng.zipf(1.3, size=rng.randint(0, 40))]
+            for _ in range(n_docs)]
+
+
+def test_merging_contiguous_shards_reproduces_the_single_corpus():
+    documents = random_documents(200)
+    whole = build(documents)
+    merged = TokenCorpus.merge([build(documents[:70]), build(documents[70:71]), build(documents[71:])],
+                               source={'sha256': 'merged'})
+    
+    assert merged.vocabulary == whole.vocabulary
+    assert merged.offsets.tolist() == whole.offsets.tolist()
+    assert merged.ids.tolist() == whole.ids.tolist()
+    assert merged.term_freq.tolist() == whole.term_freq.tolist()
+    assert merged.doc_freq.tolist() == whole.doc_freq.tolist()
+    assert merged.source == {'sha256': 'merged'}
+
+
+def test_merging_hash_partitioned_shards_reproduces_vocabulary_and_frequencies():
+    documents = random_documents(200, seed=1)
+    whole = build(documents)
+    shards = [[doc for i, doc in enumerate(documents) if i % 3 == shard] for shard in range(3)]
+    merged = TokenCorpus.merge(build(shard) for shard in shards)
+    
+    assert sorted(merged.vocabulary) == sorted(whole.vocabulary)
+    position = {term: i for i, term in enumerate(merged.vocabulary)}
+    order = [position[term] for term in whole.vocabulary]
+    assert merged.term_freq[order].tolist() == whole.term_freq.tolist()
+    assert merged.doc_freq[order].tolist() == whole.doc_freq.tolist()
+    assert [merged.tokens(i) for i in range(merged.n_docs)] == [doc for shard in shards for doc in shard]
+
+
+def test_merged_corpus_survives_save_and_load(tmp_path):
+    documents = random_documents(50, seed=2)
+    merged = TokenCorpus.merge([build(documents[:25]), build(documents[25:])])
+    loaded = TokenCorpus.load(merged.save(tmp_path / "merged"))
+    assert [loaded.tokens(i) for i in range(loaded.n_docs)] == documents
+    assert loaded.doc_freq.tolist() == build(documents).doc_freq.tolist()
@@ -89,39 +89,57 @@ var context = svg.append("g")
     .attr("transform", "translate(" + margin2.left + "," + margin2.top + ")");
 
 d3_queue.queue()
-    .defer(d3.csv, "year_data.csv")
-    .defer(d3.csv, "year_topic_data2.csv")
+    .defer(loadCounts, "year_topic_counts.bin")
+    .defer(d3.json, "topics.json")
+    .defer(d3.csv, "exemplars.csv")
     .awaitAll(draw);
 
+// Dense year x topic counts written by step 5 as little-endian uint32:
+// [start_year, n_years, n_topics, counts (row-major, year by topic)..., yearly totals...]
+function loadCounts(url, callback) {
+  d3.xhr(url)
+    .responseType("arraybuffer")
+    .response(function(request) { return new Uint32Array(request.response); })
+    .get(callback);
+}
+
 function draw(error, data) {
   if (error) throw error;
-  yearData = data[0];
-  topicData = data[1];
+  var header = data[0],
+      topics = data[1],
+      exemplars = d3.map(data[2], function(d) { return d.topic_number; });
 
-  yearData.forEach(function(d) {
-    d.date = format.parse(d.date);
-    d.value = +d.value;
-  });
+  var startYear = header[0],
+      nYears = header[1],
+      nTopics = header[2],
+      counts = header.subarray(3, 3 + nYears * nTopics),
+      totals = header.subarray(3 + nYears * nTopics);
 
-  topicData.forEach(function(d) {
-    d.date = format.parse(d.date);
-    d.value = +d.value;
-    d.key = d.key;
-    d.title = d.title;
-    d.leadpp = d.leadpp;
-    d.words = d.topicwords;
-    d.url = d.exampleURL;
-  });
+  var dates = d3.range(nYears).map(function(i) { return format.parse(String(startYear + i)); });
 
-  var nestStack = d3.nest()
-      .key(function(d) { return d.key; })
-      .entries(topicData);
+  var yearData = dates.map(function(date, i) {
+    return {date: date, value: totals[i]};
+  });
 
-  var layers = stack(nestStack);
+  var layers = stack(topics.map(function(topic, k) {
+    var exemplar = exemplars.get(topic.topic_number) || {};
+    return {
+      key: topic.name,
+      words: topic.words,
+      title: exemplar.title,
+      url: exemplar.url,
+      leadpp: exemplar.leadpp,
+      values: dates.map(function(date, i) {
+        return {date: date, value: counts[i * nTopics + k]};
+      })
+    };
+  }));
 
   x.domain(d3.extent(yearData.map(function(d) { return d.date; })));
   x2.domain(x.domain());
-  y.domain([0, d3.max(topicData, function(d) { return d.y0 + d.y; })]);
+  y.domain([0, d3.max(layers, function(layer) {
+    return d3.max(layer.values, function(d) { return d.y0 + d.y; });
+  })]);
   y2.domain([0, d3.max(yearData.map(function(d) { return d.value; }))]); 
 
   context.append("path")
@@ -157,10 +175,9 @@ function draw(error, data) {
    tooltip.select(".tooltip_title")
      .text(d.key)
 
-  topicData = d.values[0];
-  html = "Example Case: " + "\n" + "<i><b>" + topicData.title + "</b></i>"+ "\n";
-  html += topicData.leadpp + "..." + "<a href=" + topicData.url + " target='_blank'>" + "[READ MORE]"+ "</a>" + "\n\n\n\n"
-  html += "Topic Words: " + "\n" + topicData.topicwords + "\n";
+  html = "Example Case: " + "\n" + "<i><b>" + d.title + "</b></i>"+ "\n";
+  html += d.leadpp + "..." + "<a href=" + d.url + " target='_blank'>" + "[READ MORE]"+ "</a>" + "\n\n\n\n"
+  html += "Topic Words: " + "\n" + d.words + "\n";
   
 
    tooltip.select(".tooltip_body").html(html);